@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for github_monitor.markdown_to_html()
+
+Verifies the renderer against the golden corpus (markdown_golden.json) and measures the time per render.
+Use --against to compare with the implementation from another git revision, e.g.:
+
+  python3 benchmarks/bench_markdown.py --against HEAD~1
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+GOLDEN_FILE = os.path.join(BENCH_DIR, "markdown_golden.json")
+
+sys.path.insert(0, REPO_DIR)
+import github_monitor  # noqa: E402
+
+
+# Loads github_monitor.py from the given git revision as a separate module
+def load_revision(rev):
+    source = subprocess.check_output(["git", "show", f"{rev}:github_monitor.py"], cwd=REPO_DIR)
+    tmp_dir = tempfile.mkdtemp(prefix="github_monitor_bench_")
+    path = os.path.join(tmp_dir, "github_monitor_baseline.py")
+    with open(path, "wb") as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location("github_monitor_baseline", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Returns the number of golden cases the module renders differently
+def check_golden(module, cases):
+    mismatches = 0
+    for case in cases:
+        result = module.markdown_to_html(case["text"], case["convert_line_breaks"], case["repo_url"])
+        if result != case["html"]:
+            mismatches += 1
+            print(f"* Mismatch for {case['text'][:60]!r} (convert_line_breaks={case['convert_line_breaks']}, repo_url={case['repo_url']})")
+    return mismatches
+
+
+# Returns the best time (in microseconds) to render a single golden case, averaged over the corpus
+def bench(module, cases, number, repeat):
+    # Time the renderer itself, not the render cache in front of it
+    render = getattr(module.markdown_to_html, "__wrapped__", module.markdown_to_html)
+
+    def run():
+        for case in cases:
+            render(case["text"], case["convert_line_breaks"], case["repo_url"])
+
+    best = min(timeit.repeat(run, number=number, repeat=repeat))
+    return best / (number * len(cases)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark markdown_to_html() on the golden corpus")
+    parser.add_argument("--against", metavar="REV", help="Also benchmark the implementation from this git revision")
+    parser.add_argument("-n", "--number", type=int, default=50, help="Corpus renders per timing run (default: 50)")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Timing runs, the best one is reported (default: 5)")
+    parser.add_argument("--update-golden", action="store_true", help="Rewrite expected outputs using the current implementation")
+    args = parser.parse_args()
+
+    with open(GOLDEN_FILE, encoding="utf-8") as f:
+        cases = json.load(f)
+
+    if args.update_golden:
+        for case in cases:
+            case["html"] = github_monitor.markdown_to_html(case["text"], case["convert_line_breaks"], case["repo_url"])
+        with open(GOLDEN_FILE, "w", encoding="utf-8") as f:
+            json.dump(cases, f, ensure_ascii=False, indent=1)
+        print(f"* Golden corpus updated ({len(cases)} cases)")
+        return
+
+    mismatches = check_golden(github_monitor, cases)
+    print(f"* Golden corpus: {len(cases) - mismatches}/{len(cases)} cases match")
+
+    current = bench(github_monitor, cases, args.number, args.repeat)
+    print(f"* Current:\t{current:8.1f} us per render")
+
+    if args.against:
+        baseline = bench(load_revision(args.against), cases, args.number, args.repeat)
+        print(f"* {args.against}:\t{baseline:8.1f} us per render")
+        print(f"* Speedup:\t{baseline / current:8.2f}x")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of github_monitor against the mock GitHub API (mock_github.py)
+
+Times the startup and check cycles of github_monitor_user(), github_process_repos(), github_list_events(),
+github_print_followers_and_followings() and the event rendering paths (text / HTML of event records, markdown_to_html) and counts the API requests each one makes.
+Reports can be saved with --json and compared with --compare, or another git revision can be run alongside, e.g.:
+
+  python3 benchmarks/bench_monitor.py --size large --latency 20 --json after.json --compare before.json
+  python3 benchmarks/bench_monitor.py --against HEAD~1 -s process-repos
+
+PyGithub waits 0.25 s between consecutive requests by default, which would dominate every REST path on a local
+server; that throttling is turned off unless --pygithub-throttle is given.
+"""
+
+import argparse
+import contextlib
+import functools
+import importlib.util
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+sys.path.insert(0, BENCH_DIR)
+from mock_github import SIZES, MockGitHub, make_account  # noqa: E402
+
+SCENARIOS = ["cycle", "process-repos", "list-events", "list-followers", "render"]
+
+
+class StopBenchmark(Exception):
+    pass
+
+
+# Stands in for the time module of the benchmarked github_monitor: the sleep between check cycles marks a cycle
+# boundary (and lets the mock account change) instead of sleeping, stopping after the requested number of cycles
+class CycleClock(object):
+    def __init__(self, module, mock, cycles):
+        self.module = module
+        self.mock = mock
+        self.cycles = cycles
+        self.marks = []
+        self.requests = []
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+    def sleep(self, seconds):
+        if seconds != self.module.GITHUB_CHECK_INTERVAL:
+            time.sleep(seconds)
+            return
+        self.marks.append(time.perf_counter())
+        self.requests.append(sum(self.mock.take_requests().values()))
+        if len(self.marks) > self.cycles:
+            raise StopBenchmark()
+        self.mock.account.advance()
+
+
+# Loads github_monitor.py from the working tree or the given git revision as a separate module
+def load_module(rev=None, throttle=False):
+    if rev is None:
+        path = os.path.join(REPO_DIR, "github_monitor.py")
+        name = "github_monitor"
+    else:
+        source = subprocess.check_output(["git", "show", f"{rev}:github_monitor.py"], cwd=REPO_DIR)
+        tmp_dir = tempfile.mkdtemp(prefix="github_monitor_bench_")
+        path = os.path.join(tmp_dir, "github_monitor_baseline.py")
+        with open(path, "wb") as f:
+            f.write(source)
+        name = "github_monitor_baseline"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if hasattr(module, "load_github"):
+        module.load_github()
+    if not throttle:
+        module.Github = functools.partial(module.Github, seconds_between_requests=None, seconds_between_writes=None)
+    return module
+
+
+# Points the module at the mock server and sets a configuration suitable for unattended runs
+def configure(module, mock):
+    module.GITHUB_API_URL = mock.url
+    module.GITHUB_HTML_URL = mock.url
+    module.GITHUB_TOKEN = "mock-token"
+    module.LOCAL_TIMEZONE = "UTC"
+    module.GITHUB_CHECK_INTERVAL = 3600
+    module.TRACK_REPOS_CHANGES = True
+    module.TRACK_CONTRIB_CHANGES = True
+    module.GET_ALL_REPOS = False
+    module.REPOS_TO_MONITOR = ["ALL"]
+    module.DO_NOT_MONITOR_GITHUB_EVENTS = False
+    module.EVENTS_NUMBER = len(mock.account.events)
+    for option in ("PROFILE_NOTIFICATION", "EVENT_NOTIFICATION", "REPO_NOTIFICATION", "REPO_UPDATE_DATE_NOTIFICATION", "CONTRIB_NOTIFICATION", "ERROR_NOTIFICATION"):
+        setattr(module, option, False)
+
+
+# Runs fn with its console output discarded and returns (seconds, API requests, result)
+def timed(mock, fn, *args, **kwargs):
+    mock.take_requests()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn(*args, **kwargs)
+    seconds = time.perf_counter() - started
+    return seconds, sum(mock.take_requests().values()), result
+
+
+def bench_cycle(module, mock, cycles):
+    clock = CycleClock(module, mock, cycles)
+    module.time = clock
+    mock.take_requests()
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.github_monitor_user(mock.account.login, None)
+    except StopBenchmark:
+        pass
+    except SystemExit:
+        return {"error": "github_monitor_user() exited, check the mock server output"}
+    finally:
+        module.time = time
+    marks = [started] + clock.marks
+    durations = [b - a for a, b in zip(marks, marks[1:])]
+    return {
+        "startup_seconds": durations[0],
+        "startup_requests": clock.requests[0],
+        "cycle_seconds": sum(durations[1:]) / len(durations[1:]),
+        "cycle_requests": sum(clock.requests[1:]) / len(clock.requests[1:]),
+    }
+
+
+def bench_process_repos(module, mock, repeat):
+    github = module.Github(base_url=mock.url, auth=module.Auth.Token("mock-token"), per_page=getattr(module, "GITHUB_PER_PAGE", 30))
+    repos = list(github.get_user(mock.account.login).get_repos(type="owner"))
+    best = None
+    for _ in range(repeat):
+        seconds, requests, _ = timed(mock, module.github_process_repos, repos, show_progress=False, fetch_identity_lists=True)
+        if best is None or seconds < best[0]:
+            best = (seconds, requests)
+    return {"seconds": best[0], "requests": best[1], "repos": len(repos)}
+
+
+def bench_list_events(module, mock, repeat):
+    best = None
+    for _ in range(repeat):
+        seconds, requests, _ = timed(mock, module.github_list_events, mock.account.login, len(mock.account.events), None)
+        if best is None or seconds < best[0]:
+            best = (seconds, requests)
+    return {"seconds": best[0], "requests": best[1], "events": len(mock.account.events)}
+
+
+def bench_list_followers(module, mock, repeat):
+    best = None
+    for _ in range(repeat):
+        seconds, requests, _ = timed(mock, module.github_print_followers_and_followings, mock.account.login)
+        if best is None or seconds < best[0]:
+            best = (seconds, requests)
+    return {"seconds": best[0], "requests": best[1], "users": len(mock.account.followers) + len(mock.account.followings)}
+
+
+# Times rendering of the events already fetched from the mock: text and HTML of event records, then the markdown bodies
+def bench_render(module, mock, repeat):
+    if not hasattr(module, "EventRecord"):
+        return {"error": "no EventRecord in this revision"}
+    github = module.Github(base_url=mock.url, auth=module.Auth.Token("mock-token"))
+    events = list(github.get_user(mock.account.login).get_events())
+    with contextlib.redirect_stdout(io.StringIO()):
+        records = [module.github_print_event(event, github) for event in events]
+    render = getattr(module.markdown_to_html, "__wrapped__", module.markdown_to_html)
+    bodies = [(entry[2], record.repo_url) for record in records for entry in record.entries if entry[0] in ("body", "message", "reply")]
+
+    def run_records():
+        for record in records:
+            record.text
+            record.to_html()
+
+    def run_markdown():
+        for text, repo_url in bodies:
+            render(text, True, repo_url)
+
+    # Time the renderers themselves, not the render cache in front of them
+    cache = getattr(module, "render_cache", None)
+    cache_size = cache.maxsize if cache else 0
+    if cache:
+        cache.maxsize = 0
+
+    result = {"events": len(records)}
+    try:
+        for name, fn in (("records", run_records), ("markdown", run_markdown)):
+            best = None
+            for _ in range(max(repeat, 5)):
+                started = time.perf_counter()
+                fn()
+                seconds = time.perf_counter() - started
+                best = seconds if best is None else min(best, seconds)
+            result[f"{name}_ms"] = best * 1000
+    finally:
+        if cache:
+            cache.maxsize = cache_size
+    return result
+
+
+# Runs the selected scenarios against a fresh mock account and returns the report
+def run(module, args, scenarios):
+    report = {}
+    for name in scenarios:
+        account = make_account(args.size, **{option: getattr(args, option) for option in SIZES["small"]})
+        mock = MockGitHub(account, latency=args.latency / 1000, max_page_size=args.max_page_size, compress=args.gzip).start()
+        configure(module, mock)
+        try:
+            if name == "cycle":
+                report[name] = bench_cycle(module, mock, args.cycles)
+            elif name == "process-repos":
+                report[name] = bench_process_repos(module, mock, args.repeat)
+            elif name == "list-events":
+                report[name] = bench_list_events(module, mock, args.repeat)
+            elif name == "list-followers":
+                report[name] = bench_list_followers(module, mock, args.repeat)
+            elif name == "render":
+                report[name] = bench_render(module, mock, args.repeat)
+        finally:
+            mock.stop()
+    return report
+
+
+# Returns the report values worth comparing, as (label, key path, unit)
+def report_rows(report):
+    for scenario, values in report.items():
+        for key, value in values.items():
+            if isinstance(value, (int, float)):
+                yield f"{scenario}: {key}", (scenario, key), value
+
+
+def print_report(title, report, baseline=None, baseline_title=None):
+    print(f"* {title}" + (f" vs {baseline_title}" if baseline else ""))
+    for scenario, values in report.items():
+        if "error" in values:
+            print(f"  {scenario}: {values['error']}")
+    for label, (scenario, key), value in report_rows(report):
+        line = f"  {label:<34}{value:12.3f}"
+        base_value = (baseline or {}).get(scenario, {}).get(key)
+        if isinstance(base_value, (int, float)):
+            line += f"{base_value:12.3f}"
+            if value and (key.endswith("seconds") or key.endswith("_ms") or key.endswith("requests")):
+                line += f"{base_value / value:9.2f}x"
+        print(line)
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark github_monitor against a local mock GitHub API")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small", help="Account size preset (default: small)")
+    for name in SIZES["small"]:
+        parser.add_argument(f"--{name}", type=int, help=f"Override the number of {name} of the preset")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latency of every mock request, in milliseconds (default: 0)")
+    parser.add_argument("--max-page-size", type=int, default=100, help="Largest page size the mock honors (default: 100)")
+    parser.add_argument("--gzip", action="store_true", help="Let the mock gzip response bodies over 1 KB, as GitHub does")
+    parser.add_argument("-s", "--scenario", choices=SCENARIOS, action="append", help="Scenario to run (default: all)")
+    parser.add_argument("-c", "--cycles", type=int, default=2, help="Check cycles timed after the startup (default: 2)")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="Runs of the other scenarios, the fastest one is reported (default: 1)")
+    parser.add_argument("--pygithub-throttle", action="store_true", help="Keep PyGithub's default 0.25 s pause between requests")
+    parser.add_argument("--against", metavar="REV", help="Also benchmark github_monitor.py from this git revision")
+    parser.add_argument("--json", metavar="FILE", help="Save the report as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="Compare with a report saved earlier with --json")
+    args = parser.parse_args()
+
+    scenarios = args.scenario or SCENARIOS
+    report = run(load_module(throttle=args.pygithub_throttle), args, scenarios)
+
+    baseline, baseline_title = None, None
+    if args.against:
+        baseline, baseline_title = run(load_module(args.against, args.pygithub_throttle), args, scenarios), args.against
+    elif args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline, baseline_title = json.load(f)["report"], args.compare
+
+    print_report("Current", report, baseline, baseline_title)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"settings": {key: value for key, value in vars(args).items() if key not in ("json", "compare", "against")}, "report": report}, f, indent=1)
+        print(f"* Report saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
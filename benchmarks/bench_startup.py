@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for github_monitor
+
+Runs short-lived commands in fresh interpreters with -X importtime and reports the import time (sum of the top-level
+imports not done by the bare interpreter), the best wall time and the heaviest modules.
+Use --against to compare with another git revision, e.g.:
+
+  python3 benchmarks/bench_startup.py --against v2.5.1
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+# Scenario name -> code run in a fresh interpreter; "github" covers what -r / -s / -l / -f load before the first request
+SCENARIOS = {
+    "import": "import github_monitor",
+    "generate-config": (
+        "import sys\n"
+        "sys.argv = ['github_monitor', '--generate-config']\n"
+        "import github_monitor\n"
+        "try:\n"
+        "    github_monitor.main()\n"
+        "except SystemExit:\n"
+        "    pass\n"
+    ),
+    "github": "import github_monitor\ngetattr(github_monitor, 'load_github', lambda: None)()",
+}
+
+
+# Writes github_monitor.py from the given git revision to a temporary directory and returns its path
+def checkout_revision(rev):
+    source = subprocess.check_output(["git", "show", f"{rev}:github_monitor.py"], cwd=REPO_DIR)
+    tmp_dir = tempfile.mkdtemp(prefix="github_monitor_startup_")
+    with open(os.path.join(tmp_dir, "github_monitor.py"), "wb") as f:
+        f.write(source)
+    return tmp_dir
+
+
+# Runs the code once with -X importtime and returns (wall time in ms, {module: (nesting level, cumulative import time in us)})
+def run_once(module_dir, code):
+    env = dict(os.environ, PYTHONPATH=module_dir)
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=module_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        # Top-level imports are indented by one space, every nesting level adds two more
+        name = parts[2].rstrip()
+        level = (len(name) - len(name.lstrip())) // 2
+        if level <= 1:
+            imports.setdefault(name.strip(), (level, int(parts[1])))
+    return wall_ms, imports
+
+
+# Returns the best wall time, the import time of the best run and that run's top-level imports
+# Modules imported by the bare interpreter (site, encodings, ...) are left out
+def bench(module_dir, code, repeat):
+    _, startup_imports = run_once(module_dir, "pass")
+    run_once(module_dir, code)  # warm up, so the bytecode cache is in place
+    best = None
+    for _ in range(repeat):
+        wall_ms, imports = run_once(module_dir, code)
+        if best is None or wall_ms < best[0]:
+            best = (wall_ms, imports)
+    wall_ms, imports = best
+    imports = {name: value for name, value in imports.items() if name not in startup_imports}
+    return wall_ms, sum(us for level, us in imports.values() if level == 0) / 1000, imports
+
+
+# Prints the heaviest top-level imports and imports done directly by github_monitor
+def print_top_imports(imports, top):
+    heaviest = sorted(((us, name) for name, (level, us) in imports.items() if name != "github_monitor"), reverse=True)[:top]
+    for us, name in heaviest:
+        print(f"    {us / 1000:8.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark github_monitor startup (import time) in fresh interpreters")
+    parser.add_argument("--against", metavar="REV", help="Also benchmark github_monitor.py from this git revision")
+    parser.add_argument("-r", "--repeat", type=int, default=10, help="Runs per scenario, the fastest one is reported (default: 10)")
+    parser.add_argument("-s", "--scenario", choices=sorted(SCENARIOS), action="append", help="Scenario to run (default: all)")
+    parser.add_argument("--top", type=int, default=5, help="Number of heaviest imports to list per scenario (default: 5)")
+    args = parser.parse_args()
+
+    baseline_dir = checkout_revision(args.against) if args.against else None
+
+    for name in args.scenario or SCENARIOS:
+        code = SCENARIOS[name]
+        wall_ms, import_ms, imports = bench(REPO_DIR, code, args.repeat)
+        print(f"* {name}")
+        print(f"  Current:\t{import_ms:8.1f} ms imports\t{wall_ms:8.1f} ms wall")
+        print_top_imports(imports, args.top)
+
+        if baseline_dir:
+            base_wall_ms, base_import_ms, base_imports = bench(baseline_dir, code, args.repeat)
+            print(f"  {args.against}:\t{base_import_ms:8.1f} ms imports\t{base_wall_ms:8.1f} ms wall")
+            print_top_imports(base_imports, args.top)
+            print(f"  Speedup:\t{base_import_ms / import_ms:8.2f}x imports\t{base_wall_ms / wall_ms:8.2f}x wall")
+        print()
+
+
+if __name__ == "__main__":
+    main()
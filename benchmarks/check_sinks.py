@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Offline check of the github_monitor notification sinks (webhook and jsonl) and of NOTIFY_ROUTES
+
+Runs a local HTTP server receiving webhook requests and a temporary file as the jsonl target, sends notifications of
+every change type through notify() and verifies that:
+
+  - the webhook sink POSTs batches of WEBHOOK_BATCH_SIZE records as JSON arrays over a single reused connection
+  - the jsonl sink writes one JSON object (NOTIFY_RECORD_FIELDS) per line
+  - NOTIFY_ROUTES sends each change type only to the sinks it is routed to
+
+  python3 benchmarks/check_sinks.py
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+sys.path.insert(0, REPO_DIR)
+import github_monitor  # noqa: E402
+
+ROUTES = {"event": ["webhook"], "profile": ["jsonl"], "error": ["webhook", "jsonl"]}
+
+
+# Local webhook receiver keeping the JSON body, headers and client address of every request
+class WebhookServer(object):
+    def __init__(self, host="127.0.0.1", port=0):
+        self.requests = []
+        self.lock = threading.Lock()
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with receiver.lock:
+                    receiver.requests.append({"path": self.path, "headers": dict(self.headers), "client": self.client_address, "body": json.loads(body)})
+                self.send_response(204)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_address[1]}/hook"
+        self.thread = threading.Thread(target=self.server.serve_forever, name="webhook-receiver", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # Returns and resets the requests received so far
+    def take_requests(self):
+        with self.lock:
+            requests, self.requests = self.requests, []
+        return requests
+
+
+# Points the module's sinks at the webhook receiver and the jsonl file; notifications are delivered inline
+def configure(module, webhook_url, jsonl_path, batch_size):
+    module.load_github()
+    module.history_user = "octo-check"
+    module.WEBHOOK_URL = webhook_url
+    module.WEBHOOK_BATCH_SIZE = batch_size
+    module.WEBHOOK_HEADERS = {"Authorization": "Bearer check-token"}
+    module.NOTIFY_JSONL_TARGET = jsonl_path
+    module.NOTIFY_ROUTES = ROUTES
+    module.notification_queue = None
+    return module.init_notification_sinks(False)
+
+
+# Reads and truncates the jsonl file, returns its lines
+def take_lines(path):
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines(keepends=True)
+    open(path, "w").close()
+    return lines
+
+
+# Returns the list of failed checks
+def check_sinks(module, receiver, jsonl_path, batch_size, count):
+    failures = []
+
+    def expect(condition, message):
+        if not condition:
+            failures.append(message)
+            print(f"* FAIL: {message}")
+
+    # Webhook batching over the reused session
+    for i in range(count):
+        module.notify(f"Event {i}", f"Body of event {i}", "<html></html>", False, "event")
+    batched = receiver.take_requests()
+    module.flush_notification_sinks()
+    flushed = receiver.take_requests()
+    requests = batched + flushed
+
+    expected_sizes = [batch_size] * (count // batch_size) + ([count % batch_size] if count % batch_size else [])
+    expect([len(request["body"]) for request in requests] == expected_sizes, f"webhook batch sizes {[len(request['body']) for request in requests]}, expected {expected_sizes}")
+    expect(len(batched) == count // batch_size, f"{len(batched)} webhook requests sent before the flush, expected {count // batch_size}")
+    expect(all(isinstance(request["body"], list) for request in requests), "webhook body is not a JSON array")
+    records = [record for request in requests for record in request["body"]]
+    expect([record.get("subject") for record in records] == [f"Event {i}" for i in range(count)], "webhook records are missing or out of order")
+    expect(all(list(record) == list(module.NOTIFY_RECORD_FIELDS) for record in records), f"webhook record fields differ from {module.NOTIFY_RECORD_FIELDS}")
+    expect(all(request["headers"].get("Authorization") == "Bearer check-token" for request in requests), "WEBHOOK_HEADERS not sent")
+    expect(len({request["client"] for request in requests}) == 1, f"webhook requests came over {len({request['client'] for request in requests})} connections, expected 1")
+
+    # JSON lines format
+    module.notify("Zmiana profilu ✓", "Line 1\nLine 2", "<html></html>", False, "profile")
+    lines = take_lines(jsonl_path)
+    expect(len(lines) == 1, f"{len(lines)} jsonl lines written for one notification")
+    if lines:
+        expect(lines[0].endswith("\n") and "\n" not in lines[0][:-1], "jsonl record is not a single line")
+        expect("✓" in lines[0], "jsonl line is not written as UTF-8 text")
+        record = json.loads(lines[0])
+        expect(list(record) == list(module.NOTIFY_RECORD_FIELDS), f"jsonl fields {list(record)}, expected {list(module.NOTIFY_RECORD_FIELDS)}")
+        expect(record["type"] == "profile" and record["user"] == "octo-check" and record["body"] == "Line 1\nLine 2", "jsonl record values differ from the notification")
+
+    # NOTIFY_ROUTES
+    for change_type in module.NOTIFY_CHANGE_TYPES:
+        module.notify(f"Route {change_type}", "", "", False, change_type)
+        sent_now = receiver.take_requests()
+        module.flush_notification_sinks()
+        webhook_types = [record["type"] for request in sent_now + receiver.take_requests() for record in request["body"]]
+        jsonl_types = [json.loads(line)["type"] for line in take_lines(jsonl_path)]
+        routed = ROUTES.get(change_type, [])
+        expect(webhook_types == ([change_type] if "webhook" in routed else []), f"'{change_type}' sent to webhook: {webhook_types}, routes: {routed}")
+        expect(jsonl_types == ([change_type] if "jsonl" in routed else []), f"'{change_type}' written to jsonl: {jsonl_types}, routes: {routed}")
+        if change_type == "error":
+            expect(len(sent_now) == 1, "error notification was not sent to the webhook before the flush")
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the webhook and jsonl notification sinks and NOTIFY_ROUTES against a local receiver")
+    parser.add_argument("-b", "--batch-size", type=int, default=3, help="WEBHOOK_BATCH_SIZE used for the check (default: 3)")
+    parser.add_argument("-n", "--count", type=int, default=8, help="Notifications sent to check webhook batching (default: 8)")
+    args = parser.parse_args()
+
+    receiver = WebhookServer().start()
+    tmp_dir = tempfile.mkdtemp(prefix="github_monitor_sinks_")
+    jsonl_path = os.path.join(tmp_dir, "notifications.jsonl")
+    open(jsonl_path, "w").close()
+    try:
+        sinks = configure(github_monitor, receiver.url, jsonl_path, args.batch_size)
+        print(f"* Sinks: {', '.join(sinks)}, webhook receiver at {receiver.url}")
+        failures = check_sinks(github_monitor, receiver, jsonl_path, args.batch_size, args.count)
+    finally:
+        receiver.stop()
+
+    print(f"* {'All checks passed' if not failures else f'{len(failures)} check(s) failed'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
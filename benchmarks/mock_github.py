@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+"""
+Offline mock of the GitHub REST and GraphQL APIs used by github_monitor
+
+Serves a synthetic account (deterministic for the given sizes) or recorded fixtures, with configurable latency and
+page sizes, so the tool can be benchmarked without burning real API quota. Point GITHUB_API_URL and GITHUB_HTML_URL
+at the printed URL, e.g.:
+
+  python3 benchmarks/mock_github.py --size large --latency 50
+  python3 benchmarks/mock_github.py --record fixtures.json --upstream https://api.github.com
+  python3 benchmarks/mock_github.py --fixtures fixtures.json
+
+In record mode requests not found in the fixtures are forwarded to the upstream API (using GITHUB_TOKEN from the
+environment) and their responses are saved to the fixtures file on exit.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Account size presets; "large" matches a busy account: 10k followers, 500 repos and the 300 events GitHub keeps
+SIZES = {
+    "small": {"followers": 300, "followings": 100, "repos": 20, "starred": 100, "events": 30, "stargazers": 50},
+    "medium": {"followers": 2000, "followings": 500, "repos": 100, "starred": 500, "events": 100, "stargazers": 200},
+    "large": {"followers": 10000, "followings": 2000, "repos": 500, "starred": 2000, "events": 300, "stargazers": 1000},
+}
+
+EVENT_TYPES = ["PushEvent", "WatchEvent", "IssuesEvent", "IssueCommentEvent", "PullRequestEvent", "CreateEvent", "ReleaseEvent", "ForkEvent"]
+
+MARKDOWN_BODY = """Thanks for the **report**! I could reproduce it with `--list-events` on {repo}.
+
+Steps:
+
+1. Run the tool with `-l`
+2. Wait for the *second* check
+3. See [the docs](https://github.com/{repo}#readme) for details
+
+```python
+for event in events:
+    print(event.id)
+```
+
+> Quoted reply from @{login} with a ~~strikethrough~~ and a link to #{number}
+"""
+
+COMMIT_MESSAGE = "Fix event rendering for {repo}\n\nLonger description of the change, wrapped\nover a few lines to look like a real commit.\n\nSigned-off-by: {login} <{login}@users.noreply.github.com>"
+
+# Top-level path segments served as API endpoints; any other single segment path is a profile web page
+API_ROOTS = {"user", "users", "orgs", "repos", "graphql", "rate_limit", "search"}
+
+repo_path_re = re.compile(r'^/repos/([^/]+)/([^/]+)(/.*)?$')
+graphql_repository_re = re.compile(r'(\w+)\s*:\s*repository\(\s*owner:\s*\$(\w+)\s*,\s*name:\s*\$(\w+)\s*\)')
+user_path_re = re.compile(r'^/users/([^/]+)(/.*)?$')
+
+
+# Returns an ISO 8601 UTC timestamp, as used by the GitHub API
+def iso(ts):
+    return ts.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# Returns a stable fake commit SHA for the given seed string
+def sha_for(seed):
+    return hashlib.sha1(seed.encode("utf-8")).hexdigest()
+
+
+# Synthetic GitHub account: the monitored user with followers, followings, repos (with stargazers, watchers, forks,
+# issues and pull requests), starred repos and recent events; all lists are generated from counts and a seed
+class Account(object):
+    def __init__(self, login="octo-bench", viewer="octo-viewer", followers=300, followings=100, repos=20, starred=100, events=30, stargazers=50, seed=1):
+        self.login = login
+        self.viewer = viewer
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.started = self.now
+        self.rand = random.Random(seed)
+        self.followers = [f"follower-{i}" for i in range(followers)]
+        self.followings = [f"followee-{i}" for i in range(followings)]
+        self.starred = [f"maker-{i % 97}/starred-{i}" for i in range(starred)]
+        self.repos = []
+        for i in range(repos):
+            self.repos.append({
+                "name": f"repo-{i:04d}",
+                "id": 100000 + i,
+                "stargazers": self.rand.randint(0, stargazers),
+                "subscribers": self.rand.randint(0, max(1, stargazers // 10)),
+                "forks": self.rand.randint(0, max(1, stargazers // 20)),
+                "issues": self.rand.randint(0, 15),
+                "pulls": self.rand.randint(0, 5),
+                "issues_updated": {},
+                "issues_closed": set(),
+                "created": self.now - timedelta(days=1000 - i),
+                "updated": self.now - timedelta(hours=i),
+            })
+        self.repos_by_name = {repo["name"]: repo for repo in self.repos}
+        self.next_event_id = 40000000000
+        self.events = []
+        for i in range(events):
+            self.events.insert(0, self.make_event(self.now - timedelta(minutes=10 * (events - i))))
+        self.lock = threading.Lock()
+
+    # Builds an event of a type picked in rotation, touching one of the user's repos
+    def make_event(self, created):
+        self.next_event_id += 1
+        number = self.next_event_id
+        event_type = EVENT_TYPES[number % len(EVENT_TYPES)]
+        repo = self.repos[number % len(self.repos)] if self.repos else {"name": "missing", "id": 1}
+        full_name = f"{self.login}/{repo['name']}"
+        body = MARKDOWN_BODY.format(repo=full_name, login=self.login, number=number % 1000)
+        payload = {}
+        if event_type == "PushEvent":
+            payload = {"ref": "refs/heads/main", "before": sha_for(f"{number}-before"), "head": sha_for(f"{number}-head"), "size": 3}
+        elif event_type == "WatchEvent":
+            payload = {"action": "started"}
+        elif event_type == "CreateEvent":
+            payload = {"ref": f"feature-{number % 1000}", "ref_type": "branch", "description": "Synthetic branch"}
+        elif event_type == "IssuesEvent":
+            payload = {"action": "opened", "issue": {"number": number % 1000, "title": f"Issue {number % 1000}", "body": body, "created_at": iso(created)}}
+        elif event_type == "IssueCommentEvent":
+            payload = {"action": "created", "issue": {"number": number % 1000, "title": f"Issue {number % 1000}", "created_at": iso(created - timedelta(days=1))},
+                       "comment": {"id": number, "body": body, "created_at": iso(created)}}
+        elif event_type == "PullRequestEvent":
+            payload = {"action": "opened", "number": number % 1000, "pull_request": {"number": number % 1000}}
+        elif event_type == "ReleaseEvent":
+            payload = {"action": "published", "release": {"name": f"v1.{number % 100}", "tag_name": f"v1.{number % 100}", "body": body, "published_at": iso(created),
+                                                          "target_commitish": "main", "draft": False, "prerelease": False,
+                                                          "assets": [{"name": "dist.tar.gz", "size": 123456, "browser_download_url": "https://example.com/dist.tar.gz"}]}}
+        elif event_type == "ForkEvent":
+            payload = {"forkee": {"full_name": f"forker-{number % 50}/{repo['name']}"}}
+        return {"id": str(number), "type": event_type, "repo_name": full_name, "repo_id": repo["id"], "payload": payload, "created": created}
+
+    # Returns the numbers of the repo's issues (1, 2, ...) and pull requests (1000, 1001, ...) that are still open
+    def open_issues(self, repo):
+        numbers = list(range(1, repo["issues"] + 1)) + [1000 + i for i in range(repo["pulls"])]
+        return [number for number in numbers if number not in repo["issues_closed"]]
+
+    # Simulates activity between two check cycles: a new follower, a new event, a new stargazer and fork, a new issue and a closed one
+    def advance(self):
+        with self.lock:
+            self.followers.append(f"follower-{len(self.followers)}")
+            self.now = datetime.now(timezone.utc).replace(microsecond=0)
+            self.events.insert(0, self.make_event(self.now))
+            self.events = self.events[:300]
+            if self.repos:
+                self.repos[len(self.events) % len(self.repos)]["stargazers"] += 1
+                self.repos[len(self.followers) % len(self.repos)]["forks"] += 1
+                repo = self.repos[len(self.followers) % len(self.repos)]
+                repo["issues"] += 1
+                repo["issues_updated"][repo["issues"]] = self.now
+                repo = self.repos[(len(self.followers) + 7) % len(self.repos)]
+                open_numbers = self.open_issues(repo)
+                if open_numbers:
+                    repo["issues_closed"].add(open_numbers[0])
+                    repo["issues_updated"][open_numbers[0]] = self.now
+
+
+# Builds GitHub API JSON objects for the account, with URLs pointing at the given base URL
+class Fixtures(object):
+    def __init__(self, account, base):
+        self.account = account
+        self.base = base
+
+    def user(self, login, full=False):
+        data = {"login": login, "id": int(sha_for(login)[:8], 16), "type": "User", "site_admin": False,
+                "url": f"{self.base}/users/{login}", "html_url": f"{self.base}/{login}", "avatar_url": f"{self.base}/avatars/{login}"}
+        if full:
+            account = self.account
+            is_user = login == account.login
+            data.update({
+                "name": f"{login.replace('-', ' ').title()}", "company": "Bench Corp" if is_user else None, "blog": "https://example.com",
+                "location": "Warsaw", "email": None, "bio": "Synthetic account used by the github_monitor benchmarks" if is_user else None,
+                "public_repos": len(account.repos) if is_user else 3, "public_gists": 0,
+                "followers": len(account.followers) if is_user else 10, "following": len(account.followings) if is_user else 5,
+                "created_at": iso(account.now - timedelta(days=3000)), "updated_at": iso(account.now - timedelta(days=2)),
+            })
+        return data
+
+    def repo(self, owner, name, full=False):
+        info = self.account.repos_by_name.get(name) if owner == self.account.login else None
+        if info is None:
+            info = {"name": name, "id": int(sha_for(f"{owner}/{name}")[:8], 16), "stargazers": 42, "subscribers": 3, "forks": 2, "issues": 0, "pulls": 0,
+                    "issues_updated": {}, "issues_closed": set(), "created": self.account.now - timedelta(days=500), "updated": self.account.now - timedelta(days=5)}
+        url = f"{self.base}/repos/{owner}/{name}"
+        data = {"id": info["id"], "name": name, "full_name": f"{owner}/{name}", "owner": self.user(owner), "private": False,
+                "html_url": f"{self.base}/{owner}/{name}", "url": url, "description": f"Synthetic repository {name} used by the benchmarks",
+                "fork": False, "language": "Python", "created_at": iso(info["created"]), "updated_at": iso(info["updated"]), "pushed_at": iso(info["updated"]),
+                "stargazers_count": info["stargazers"], "watchers_count": info["stargazers"], "forks_count": info["forks"],
+                "open_issues_count": len(self.account.open_issues(info)), "default_branch": "main"}
+        if full:
+            data["subscribers_count"] = info["subscribers"]
+            data["network_count"] = info["forks"]
+        return data
+
+    # Issues are numbered in creation order; numbers at or above 1000 are pull requests
+    def issue(self, owner, name, number, is_pull=False):
+        info = self.account.repos_by_name.get(name) if owner == self.account.login else None
+        created = self.account.started - timedelta(days=60) + timedelta(minutes=number)
+        updated = info["issues_updated"].get(number, created + timedelta(hours=5)) if info else created + timedelta(hours=5)
+        closed = bool(info) and number in info["issues_closed"]
+        data = {"id": 500000 + number, "number": number, "title": f"{'Pull request' if is_pull else 'Issue'} {number} in {name}", "state": "closed" if closed else "open",
+                "user": self.user(f"contributor-{number % 40}"), "body": MARKDOWN_BODY.format(repo=f"{owner}/{name}", login=owner, number=number),
+                "labels": [{"name": "bug"}, {"name": "help wanted"}], "assignees": [], "comments": 2, "reactions": {"+1": 3, "heart": 1},
+                "created_at": iso(created), "updated_at": iso(updated), "closed_at": iso(updated) if closed else None,
+                "html_url": f"{self.base}/{owner}/{name}/{'pull' if is_pull else 'issues'}/{number}", "url": f"{self.base}/repos/{owner}/{name}/issues/{number}"}
+        if is_pull:
+            data["pull_request"] = {"url": f"{self.base}/repos/{owner}/{name}/pulls/{number}", "html_url": data["html_url"]}
+        return data
+
+    def pull(self, owner, name, number):
+        data = self.issue(owner, name, number, is_pull=True)
+        data.pop("pull_request")
+        data.update({"url": f"{self.base}/repos/{owner}/{name}/pulls/{number}", "merged": False, "merged_at": None, "closed_at": None, "merged_by": None,
+                     "mergeable_state": "clean", "head": {"ref": f"feature-{number}", "sha": sha_for(f"head-{number}")}, "base": {"ref": "main", "sha": sha_for(f"base-{number}")},
+                     "commits": 3, "review_comments": 1, "additions": 120, "deletions": 30, "changed_files": 4,
+                     "requested_reviewers": [self.user("reviewer-1")]})
+        return data
+
+    def comment(self, owner, name, number, index):
+        created = self.account.now - timedelta(days=number % 30 + 1) + timedelta(hours=index + 1)
+        return {"id": 700000 + number * 10 + index, "user": self.user(f"commenter-{index}"), "body": MARKDOWN_BODY.format(repo=f"{owner}/{name}", login=owner, number=number),
+                "created_at": iso(created), "updated_at": iso(created), "html_url": f"{self.base}/{owner}/{name}/issues/{number}#issuecomment-{index}"}
+
+    def commit(self, owner, name, sha):
+        created = self.account.now - timedelta(hours=int(sha[:2], 16))
+        return {"sha": sha, "url": f"{self.base}/repos/{owner}/{name}/commits/{sha}", "html_url": f"{self.base}/{owner}/{name}/commit/{sha}",
+                "author": self.user(owner), "committer": self.user(owner),
+                "commit": {"message": COMMIT_MESSAGE.format(repo=f"{owner}/{name}", login=owner),
+                           "author": {"name": owner, "email": f"{owner}@users.noreply.github.com", "date": iso(created)},
+                           "committer": {"name": owner, "email": f"{owner}@users.noreply.github.com", "date": iso(created)}},
+                "stats": {"additions": 40, "deletions": 12, "total": 52},
+                "files": [{"filename": f"src/module_{i}.py", "status": "modified", "additions": 10, "deletions": 3, "changes": 13} for i in range(4)]}
+
+    def event(self, event):
+        owner, name = event["repo_name"].split("/", 1)
+        payload = json.loads(json.dumps(event["payload"]))
+        if "issue" in payload:
+            payload["issue"].update({"user": self.user("contributor-1"), "html_url": f"{self.base}/{owner}/{name}/issues/{payload['issue']['number']}", "state": "open",
+                                     "comments": 2, "labels": [{"name": "bug"}], "reactions": {"+1": 2}})
+        if "comment" in payload:
+            payload["comment"].update({"user": self.user(self.account.login), "html_url": f"{self.base}/{owner}/{name}/issues/{payload['issue']['number']}#issuecomment-{payload['comment']['id']}"})
+        if "release" in payload:
+            payload["release"].update({"author": self.user(self.account.login), "html_url": f"{self.base}/{owner}/{name}/releases/tag/{payload['release']['tag_name']}"})
+        if "forkee" in payload:
+            payload["forkee"]["html_url"] = f"{self.base}/{payload['forkee']['full_name']}"
+        return {"id": event["id"], "type": event["type"], "public": True, "created_at": iso(event["created"]), "payload": payload,
+                "actor": {"id": 1, "login": self.account.login, "display_login": self.account.login, "url": f"{self.base}/users/{self.account.login}", "avatar_url": ""},
+                "repo": {"id": event["repo_id"], "name": event["repo_name"], "url": f"{self.base}/repos/{event['repo_name']}"}}
+
+
+# Mock GitHub API server; serves the synthetic account, recorded fixtures, or records fixtures from an upstream API
+class MockGitHub(object):
+    def __init__(self, account=None, host="127.0.0.1", port=0, latency=0.0, default_page_size=30, max_page_size=100, fixtures=None, record=None, upstream=None, compress=False):
+        self.account = account or Account()
+        self.latency = latency
+        self.compress = compress
+        self.default_page_size = default_page_size
+        self.max_page_size = max_page_size
+        self.fixtures_file = fixtures or record
+        self.record = bool(record)
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.recorded = {}
+        if fixtures or (record and os.path.exists(record)):
+            with open(self.fixtures_file, encoding="utf-8") as f:
+                self.recorded = json.load(f)
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.rate_limit = 5000
+        self.quota = {}
+
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, delayed ACKs add ~40 ms to every keep-alive request
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                mock.handle(self, "GET")
+
+            def do_POST(self):
+                mock.handle(self, "POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+
+        self.server = Server((host, port), Handler)
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self.fixtures = Fixtures(self.account, self.url)
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="mock-github", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.record:
+            self.save_fixtures()
+
+    def save_fixtures(self):
+        with open(self.fixtures_file, "w", encoding="utf-8") as f:
+            json.dump(self.recorded, f, indent=1)
+
+    # Returns and resets the number of requests served per route (e.g. 'GET /repos/{owner}/{repo}/stargazers')
+    def take_requests(self):
+        with self.lock:
+            requests, self.requests = self.requests, {}
+        return requests
+
+    def count(self, route):
+        with self.lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+    def handle(self, handler, method):
+        if self.latency:
+            time.sleep(self.latency)
+        parts = urlsplit(handler.path)
+        path = parts.path.rstrip("/") or "/"
+        query = dict(parse_qsl(parts.query))
+        body = None
+        length = int(handler.headers.get("Content-Length") or 0)
+        if length:
+            body = handler.rfile.read(length)
+
+        segments = path.strip("/").split("/")
+        handler.resource = "graphql" if path == "/graphql" else ("core" if segments[0] in API_ROOTS else None)
+
+        key = f"{method} {handler.path}"
+        if key in self.recorded or f"{method} {path}" in self.recorded:
+            self.count(f"{method} fixture")
+            self.send_recorded(handler, self.recorded.get(key) or self.recorded[f"{method} {path}"])
+            return
+        if self.record and self.upstream:
+            self.count(f"{method} upstream")
+            self.send_recorded(handler, self.fetch_upstream(handler, method, body, key))
+            return
+
+        try:
+            status, data, headers = self.route(method, path, query, body)
+        except KeyError:
+            status, data, headers = 404, {"message": "Not Found", "documentation_url": "https://docs.github.com/rest"}, {}
+        self.send(handler, status, data, headers)
+
+    # Forwards the request to the upstream API and records its response
+    def fetch_upstream(self, handler, method, body, key):
+        request = urllib.request.Request(self.upstream + handler.path, data=body, method=method)
+        for header in ("Accept", "Content-Type", "Time-Zone"):
+            if handler.headers.get(header):
+                request.add_header(header, handler.headers[header])
+        token = os.environ.get("GITHUB_TOKEN")
+        if token:
+            request.add_header("Authorization", f"Bearer {token}")
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                status, raw, headers = response.status, response.read(), response.headers
+        except urllib.error.HTTPError as e:
+            status, raw, headers = e.code, e.read(), e.headers
+        kept = {name: headers[name] for name in ("Link", "Content-Type", "ETag") if headers.get(name)}
+        record = {"status": status, "headers": kept, "body": raw.decode("utf-8", "replace"), "upstream": self.upstream}
+        with self.lock:
+            self.recorded[key] = record
+        return record
+
+    def send_recorded(self, handler, record):
+        raw = record["body"]
+        headers = dict(record.get("headers", {}))
+        upstream = record.get("upstream")
+        if upstream:
+            raw = raw.replace(upstream, self.url)
+            if "Link" in headers:
+                headers["Link"] = headers["Link"].replace(upstream, self.url)
+        self.send_raw(handler, record["status"], raw.encode("utf-8"), headers)
+
+    def send(self, handler, status, data, headers):
+        if isinstance(data, str):
+            headers.setdefault("Content-Type", "text/html; charset=utf-8")
+            raw = data.encode("utf-8")
+        else:
+            headers.setdefault("Content-Type", "application/json; charset=utf-8")
+            raw = json.dumps(data).encode("utf-8")
+        self.send_raw(handler, status, raw, headers)
+
+    # Charges one point of the resource's quota; an exhausted quota starts a new window instead of rejecting requests
+    def charge(self, resource):
+        with self.lock:
+            remaining, reset = self.quota.get(resource, (self.rate_limit, int(time.time()) + 3600))
+            if remaining <= 0:
+                remaining, reset = self.rate_limit, int(time.time()) + 3600
+            self.quota[resource] = (remaining - 1, reset)
+        return remaining - 1, reset
+
+    def send_raw(self, handler, status, raw, headers):
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        resource = getattr(handler, "resource", None)
+        if resource:
+            remaining, reset = self.charge(resource)
+            handler.send_header("X-RateLimit-Limit", str(self.rate_limit))
+            handler.send_header("X-RateLimit-Remaining", str(remaining))
+            handler.send_header("X-RateLimit-Reset", str(reset))
+            handler.send_header("X-RateLimit-Resource", resource)
+        # Like GitHub, compress bodies over 1 KB for clients accepting gzip
+        if self.compress and len(raw) > 1024 and "gzip" in handler.headers.get("Accept-Encoding", ""):
+            raw = gzip.compress(raw, compresslevel=6)
+            handler.send_header("Content-Encoding", "gzip")
+        handler.send_header("Content-Length", str(len(raw)))
+        handler.end_headers()
+        handler.wfile.write(raw)
+
+    # Returns a page of items and the Link header pointing at the next and last pages; if build is given, items are
+    # the sources of the list items and only the ones on the page are built
+    def paginate(self, path, query, items, build=None):
+        per_page = min(int(query.get("per_page", self.default_page_size)), self.max_page_size)
+        page = max(1, int(query.get("page", 1)))
+        last = max(1, -(-len(items) // per_page))
+        links = []
+        for rel, number in (("next", page + 1), ("last", last)):
+            if page < last:
+                link_query = dict(query, per_page=per_page, page=number)
+                links.append(f'<{self.url}{path}?{urlencode(link_query)}>; rel="{rel}"')
+        headers = {"Link": ", ".join(links)} if links else {}
+        items = items[(page - 1) * per_page:page * per_page]
+        return [build(item) for item in items] if build else items, headers
+
+    def route(self, method, path, query, body):
+        fixtures = self.fixtures
+        account = self.account
+        if method == "POST":
+            if path == "/graphql":
+                self.count("POST /graphql")
+                return 200, self.graphql(json.loads(body or b"{}")), {}
+            raise KeyError(path)
+
+        if path == "/user":
+            self.count("GET /user")
+            return 200, fixtures.user(account.viewer, full=True), {}
+        if path == "/rate_limit":
+            self.count("GET /rate_limit")
+            remaining, reset = self.quota.get("core", (self.rate_limit, int(time.time()) + 3600))
+            return 200, {"resources": {"core": {"limit": self.rate_limit, "remaining": remaining, "reset": reset}}}, {}
+
+        match = user_path_re.match(path)
+        if match:
+            login, rest = match.group(1), match.group(2) or ""
+            self.count(f"GET /users/{{user}}{rest}")
+            if not rest:
+                return 200, fixtures.user(login, full=True), {}
+            if login != account.login:
+                return (200, *self.paginate(path, query, [])) if rest in ("/followers", "/following", "/repos", "/starred", "/events") else (404, {"message": "Not Found"}, {})
+            with account.lock:
+                if rest == "/followers":
+                    return (200, *self.paginate(path, query, account.followers, fixtures.user))
+                elif rest == "/following":
+                    return (200, *self.paginate(path, query, account.followings, fixtures.user))
+                elif rest == "/repos":
+                    return (200, *self.paginate(path, query, account.repos, lambda repo: fixtures.repo(account.login, repo["name"])))
+                elif rest == "/starred":
+                    return (200, *self.paginate(path, query, account.starred, lambda full_name: fixtures.repo(*full_name.split("/", 1))))
+                elif rest in ("/events", "/events/public"):
+                    return (200, *self.paginate(path, query, account.events, fixtures.event))
+                raise KeyError(path)
+
+        match = repo_path_re.match(path)
+        if match:
+            return self.route_repo(match.group(1), match.group(2), match.group(3) or "", path, query)
+
+        segments = path.strip("/").split("/")
+        if len(segments) in (1, 2) and segments[0] and segments[0] not in API_ROOTS:
+            self.count("GET (web page)")
+            return 200, f"<html><body><h1>{segments[-1]}</h1><p>Synthetic profile page</p></body></html>", {}
+        raise KeyError(path)
+
+    def route_repo(self, owner, name, rest, path, query):
+        fixtures = self.fixtures
+        info = self.account.repos_by_name.get(name) if owner == self.account.login else None
+        route = re.sub(r'/[0-9a-f]{40}(?:\.\.\.[0-9a-f]{40})?', "/{sha}", rest)
+        route = re.sub(r'/\d+', "/{id}", route)
+        self.count(f"GET /repos/{{owner}}/{{repo}}{route}")
+
+        if not rest:
+            return 200, fixtures.repo(owner, name, full=True), {}
+        if rest == "/stargazers":
+            return (200, *self.paginate(path, query, range(info["stargazers"] if info else 0), lambda i: fixtures.user(f"stargazer-{i}")))
+        if rest == "/subscribers":
+            return (200, *self.paginate(path, query, range(info["subscribers"] if info else 0), lambda i: fixtures.user(f"watcher-{i}")))
+        if rest == "/forks":
+            forks = [fixtures.repo(f"forker-{i}", name) for i in range(info["forks"] if info else 0)]
+            return (200, *self.paginate(path, query, forks[::-1] if query.get("sort", "newest") == "newest" else forks))
+        if rest == "/issues":
+            numbers = list(range(1, info["issues"] + 1)) + [1000 + i for i in range(info["pulls"])] if info else []
+            issues = [fixtures.issue(owner, name, number, is_pull=number >= 1000) for number in numbers]
+            state = query.get("state", "open")
+            if state != "all":
+                issues = [issue for issue in issues if issue["state"] == state]
+            if "since" in query:
+                issues = [issue for issue in issues if issue["updated_at"] >= query["since"]]
+            sort_key = "updated_at" if query.get("sort") == "updated" else "created_at"
+            issues.sort(key=lambda issue: (issue[sort_key], issue["number"]), reverse=query.get("direction", "desc") == "desc")
+            return (200, *self.paginate(path, query, issues))
+        if rest == "/pulls":
+            numbers = [number for number in self.account.open_issues(info) if number >= 1000] if info else []
+            return (200, *self.paginate(path, query, [fixtures.pull(owner, name, number) for number in reversed(numbers)]))
+
+        match = re.match(r'^/(issues|pulls)/(\d+)(/comments)?$', rest)
+        if match:
+            number = int(match.group(2))
+            if match.group(3):
+                return (200, *self.paginate(path, query, [fixtures.comment(owner, name, number, i) for i in range(2)]))
+            return 200, fixtures.pull(owner, name, number) if match.group(1) == "pulls" else fixtures.issue(owner, name, number), {}
+
+        match = re.match(r'^/commits/([0-9a-f]{40})(/comments)?$', rest)
+        if match:
+            if match.group(2):
+                return (200, *self.paginate(path, query, []))
+            return 200, fixtures.commit(owner, name, match.group(1)), {}
+
+        match = re.match(r'^/compare/([0-9a-f]{40})\.\.\.([0-9a-f]{40})$', rest)
+        if match:
+            commits = [fixtures.commit(owner, name, sha_for(f"{match.group(2)}-{i}")) for i in range(3)]
+            return 200, {"status": "ahead", "ahead_by": len(commits), "behind_by": 0, "total_commits": len(commits), "commits": commits,
+                         "html_url": f"{self.url}/{owner}/{name}/compare/{match.group(1)}...{match.group(2)}", "files": []}, {}
+        if rest == "/releases":
+            return (200, *self.paginate(path, query, []))
+        raise KeyError(path)
+
+    # Answers the GraphQL queries used by the tool: contributions calendar, starred count, block check, follower lists
+    # and aliased repository lookups (watchers counts)
+    def graphql(self, payload):
+        query = payload.get("query", "")
+        variables = payload.get("variables") or {}
+        account = self.account
+
+        repositories = graphql_repository_re.findall(query)
+        if repositories:
+            data = {}
+            for alias, owner_var, name_var in repositories:
+                owner, name = variables[owner_var], variables[name_var]
+                info = account.repos_by_name.get(name) if owner == account.login else None
+                data[alias] = {"nameWithOwner": f"{owner}/{name}", "watchers": {"totalCount": info["subscribers"] if info else 3}}
+            return {"data": data}
+        login = variables.get("login", account.login)
+        user = {}
+
+        if "contributionsCollection" in query:
+            start = datetime.fromisoformat(variables["from"]).date()
+            end = datetime.fromisoformat(variables["to"]).date()
+            days = []
+            day = start
+            while day <= end:
+                days.append({"date": day.isoformat(), "contributionCount": (day.toordinal() * 7) % 13})
+                day += timedelta(days=1)
+            user["contributionsCollection"] = {"contributionCalendar": {"weeks": [{"contributionDays": days[i:i + 7]} for i in range(0, len(days), 7)]}}
+        if "starredRepositories" in query:
+            user["starredRepositories"] = {"totalCount": len(account.starred) if login == account.login else 0}
+        if "viewerCanFollow" in query:
+            user["viewerCanFollow"] = True
+
+        for field, logins in (("followers", account.followers), ("following", account.followings)):
+            if re.search(rf'\b{field}\s*\(', query):
+                logins = logins if login == account.login else []
+                first = min(int(variables.get("first", 100)), 100)
+                offset = int(variables["after"]) if variables.get("after") else 0
+                page = logins[offset:offset + first]
+                user[field] = {
+                    "totalCount": len(logins),
+                    "pageInfo": {"hasNextPage": offset + first < len(logins), "endCursor": str(offset + len(page))},
+                    "nodes": [{"login": node, "name": node.replace("-", " ").title(), "url": f"{self.url}/{node}"} for node in page],
+                }
+
+        if not user:
+            return {"errors": [{"message": "Query not supported by the mock server"}]}
+        return {"data": {"user": user}}
+
+
+# Returns an Account built from a size preset with the given overrides (None values keep the preset)
+def make_account(size="small", seed=1, **overrides):
+    params = dict(SIZES[size])
+    params.update({name: value for name, value in overrides.items() if value is not None})
+    return Account(seed=seed, **params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a mock GitHub REST and GraphQL API for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--size", choices=sorted(SIZES), default="small", help="Account size preset (default: small)")
+    for name in SIZES["small"]:
+        parser.add_argument(f"--{name}", type=int, help=f"Override the number of {name} of the preset")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latency added to every request, in milliseconds (default: 0)")
+    parser.add_argument("--page-size", type=int, default=30, help="Page size used when per_page is not given (default: 30)")
+    parser.add_argument("--max-page-size", type=int, default=100, help="Largest page size honored (default: 100)")
+    parser.add_argument("--gzip", action="store_true", help="Gzip response bodies over 1 KB, as GitHub does")
+    parser.add_argument("--fixtures", metavar="FILE", help="Serve recorded responses from this file, falling back to the synthetic account")
+    parser.add_argument("--record", metavar="FILE", help="Forward unknown requests to --upstream and record the responses to this file")
+    parser.add_argument("--upstream", metavar="URL", default="https://api.github.com", help="API recorded from in --record mode (default: https://api.github.com)")
+    args = parser.parse_args()
+
+    account = make_account(args.size, **{name: getattr(args, name) for name in SIZES["small"]})
+    mock = MockGitHub(account, args.host, args.port, args.latency / 1000, args.page_size, args.max_page_size, args.fixtures, args.record, args.upstream if args.record else None, args.gzip)
+    print(f"* Mock GitHub API:\t{mock.url}")
+    print(f"* Monitored user:\t{account.login} (token owner: {account.viewer})")
+    print("* Use GITHUB_API_URL and GITHUB_HTML_URL set to the URL above; Ctrl+C to stop")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        mock.server.server_close()
+        if mock.record:
+            mock.save_fixtures()
+            print(f"* Fixtures saved to {mock.fixtures_file} ({len(mock.recorded)} responses)")
+
+
+if __name__ == "__main__":
+    main()
@@ -66,6 +66,49 @@ SMTP_SSL = True
 SENDER_EMAIL = "your_sender_email"
 RECEIVER_EMAIL = "your_receiver_email"
 
+# How long an idle SMTP connection is kept open for reuse by subsequent notifications; in seconds
+# Connections are health-checked with NOOP before reuse and re-established if the server dropped them
+# Set to 0 to open a new connection for every email
+SMTP_IDLE_TIMEOUT = 300
+
+# Whether to deliver email notifications from a background thread, so a slow or unreachable SMTP server
+# does not stall monitoring; set to False to send emails inline
+NOTIFY_QUEUE = True
+
+# Maximum number of notifications waiting for delivery; when the queue is full new ones are dead-lettered
+NOTIFY_QUEUE_SIZE = 100
+
+# Number of delivery attempts per notification and the delay before the first retry (in seconds, doubled after each failure)
+NOTIFY_RETRIES = 3
+NOTIFY_RETRY_BACKOFF = 30
+
+# File where notifications that could not be delivered are appended as JSON lines
+# Set to empty string to discard them
+NOTIFY_DEAD_LETTER_FILE = "github_monitor_undelivered.jsonl"
+
+# Besides email, notifications can be sent to these sinks:
+#   webhook - POSTs notifications as a JSON array to WEBHOOK_URL in batches, reusing the HTTP connection
+#   jsonl   - writes every notification as a JSON line to NOTIFY_JSONL_TARGET
+# Webhook URL; can also be set using the --webhook-url flag
+WEBHOOK_URL = ""
+
+# Extra HTTP headers sent with webhook requests, e.g. {"Authorization": "Bearer <token>"}
+WEBHOOK_HEADERS = {}
+
+# Max number of notifications per webhook request; pending ones are also sent at the end of every check cycle
+WEBHOOK_BATCH_SIZE = 50
+
+# Target of the jsonl sink: 'unix:/path/to/socket' for a Unix stream socket or a path to a file / named pipe
+# (standard output is not supported as the console output goes there); can also be set using the --notify-jsonl flag
+NOTIFY_JSONL_TARGET = ""
+
+# Routes change types to notification sinks (email, webhook, jsonl)
+# Change types: profile, event, repo, repo_update_date, contrib, error ('default' applies to types not listed)
+# Configured sinks not mentioned here receive all change types; example:
+#   NOTIFY_ROUTES = {"event": ["webhook"], "error": ["email", "webhook"], "default": ["email"]}
+# Notifications are still enabled per change type with the flags above (-p, -s, -q, -u, -y, -e)
+NOTIFY_ROUTES = {}
+
 # Whether to send an email when user's profile changes
 # Can also be enabled via the -p flag
 PROFILE_NOTIFICATION = False
@@ -89,6 +132,15 @@ REPO_UPDATE_DATE_NOTIFICATION = False
 # Can also be enabled via the -y flag
 CONTRIB_NOTIFICATION = False
 
+# Whether to combine all notifications produced during a check cycle into a single digest email
+# Error notifications are always sent immediately
+# Can also be enabled via the --digest flag
+DIGEST_MODE = False
+
+# Minimum time between digest emails; in seconds
+# Changes are collected until it elapses (0 = send a digest after every check cycle with changes)
+DIGEST_INTERVAL = 0
+
 # Whether to send an email on errors
 # Can also be disabled via the -e flag
 ERROR_NOTIFICATION = True
@@ -176,6 +228,30 @@ CHECK_INTERNET_TIMEOUT = 5
 # Can also be set using the -b flag
 CSV_FILE = ""
 
+# Number of CSV rows buffered in memory before they are written to CSV_FILE
+# Buffered rows are also written at the end of every check cycle and on exit
+CSV_FLUSH_ROWS = 500
+
+# Whether to fsync CSV_FILE after every write of buffered rows (slower, but survives power loss)
+CSV_FSYNC = False
+
+# Directory for the optional compressed change history, richer than the CSV file
+# (typed timestamps, event IDs, repo IDs, actors and numeric counts)
+# Files are partitioned by user and day: <HISTORY_DIR>/user=<login>/date=<YYYY-MM-DD>/
+# Use --history-stats to get a summary of the recorded changes
+# Leave empty to disable; can also be set using the --history-dir flag
+HISTORY_DIR = ""
+
+# Format of the history files:
+#   'jsonl'   - gzip-compressed newline-delimited JSON (no extra dependencies)
+#   'parquet' - zstd-compressed Parquet files (requires pyarrow)
+HISTORY_FORMAT = "jsonl"
+
+# SQLite database file for the optional indexed change log (profile fields, list adds/removes,
+# repo counters, events and contributions); use --query to search it
+# Leave empty to disable; can also be set using the --sqlite-db flag
+SQLITE_DB = ""
+
 # Location of the optional dotenv file which can keep secrets
 # If not specified it will try to auto-search for .env files
 # To disable auto-search, set this to the literal string "none"
@@ -190,6 +266,47 @@ GITHUB_LOGFILE = "github_monitor"
 # Can also be disabled via the -d flag
 DISABLE_LOGGING = False
 
+# Log output is written to the log file by a background thread; how often it is flushed to disk, in seconds
+LOG_FLUSH_INTERVAL = 1
+
+# Maximum size of the log file in bytes before it is rotated (e.g. 10485760 for 10 MB)
+# Set to 0 to disable size-based rotation
+LOG_ROTATE_SIZE = 0
+
+# How often the log file is rotated regardless of its size, in seconds (e.g. 86400 for daily)
+# Set to 0 to disable time-based rotation
+LOG_ROTATE_INTERVAL = 0
+
+# Number of rotated log files to keep (github_monitor_<username>.log.1, .2 etc.)
+LOG_ROTATE_BACKUPS = 5
+
+# Whether to gzip rotated log files (github_monitor_<username>.log.1.gz etc.)
+LOG_ROTATE_COMPRESS = False
+
+# Local address (host:port, e.g. '127.0.0.1:9108') of the optional HTTP endpoint exposing Prometheus / OpenMetrics
+# metrics at /metrics while monitoring: cycle and phase durations, GitHub API requests by endpoint and status,
+# rate limit, retries, emails sent / failed, queue depths and process memory
+# Leave empty to disable; can also be set using the --metrics-listen flag
+METRICS_LISTEN = ""
+
+# Whether to print a summary line after each check cycle with its duration, plus time and GitHub API calls per phase
+# Can also be enabled using the --cycle-summary flag
+CYCLE_SUMMARY = False
+
+# Number of most expensive repos and API endpoints listed in the statistics of the last check cycle,
+# dumped as JSON when the TTIN signal is received (see CYCLE_STATS_FILE)
+CYCLE_STATS_TOP_N = 10
+
+# File the TTIN signal writes the JSON statistics of the last check cycle to
+# Leave empty to print them to the console / log file instead
+CYCLE_STATS_FILE = ""
+
+# Whether to trace every GitHub API request with its caller (function and line in github_monitor.py), endpoint,
+# latency, response size, rate limit cost and whether it was a hidden PyGithub lazy completion
+# The CYCLE_STATS_TOP_N most expensive callers are reported on exit and when the TTIN signal is received
+# Can also be enabled using the --trace-requests flag
+TRACE_REQUESTS = False
+
 # Width of main horizontal line
 HORIZONTAL_LINE1 = 105
 
@@ -205,6 +322,10 @@ NET_MAX_RETRIES = 5
 # Base number of seconds to wait before each retry, multiplied by the attempt count
 NET_BASE_BACKOFF_SEC = 5
 
+# Number of core rate limit requests kept in reserve when fetching pages of long lists concurrently; if fewer than
+# that would be left afterwards, the pages are fetched one by one instead
+PAGE_FETCH_RATE_RESERVE = 100
+
 # Value used by signal handlers increasing/decreasing profile/user activity check (GITHUB_CHECK_INTERVAL); in seconds
 GITHUB_CHECK_SIGNAL_VALUE = 60  # 1 minute
 """
@@ -225,11 +346,24 @@ SMTP_PASSWORD = ""
 SMTP_SSL = False
 SENDER_EMAIL = ""
 RECEIVER_EMAIL = ""
+SMTP_IDLE_TIMEOUT = 0
+NOTIFY_QUEUE = False
+NOTIFY_QUEUE_SIZE = 0
+NOTIFY_RETRIES = 0
+NOTIFY_RETRY_BACKOFF = 0
+NOTIFY_DEAD_LETTER_FILE = ""
+WEBHOOK_URL = ""
+WEBHOOK_HEADERS = {}
+WEBHOOK_BATCH_SIZE = 0
+NOTIFY_JSONL_TARGET = ""
+NOTIFY_ROUTES = {}
 PROFILE_NOTIFICATION = False
 EVENT_NOTIFICATION = False
 REPO_NOTIFICATION = False
 REPO_UPDATE_DATE_NOTIFICATION = False
 CONTRIB_NOTIFICATION = False
+DIGEST_MODE = False
+DIGEST_INTERVAL = 0
 ERROR_NOTIFICATION = False
 GITHUB_CHECK_INTERVAL = 0
 LOCAL_TIMEZONE = ""
@@ -245,14 +379,30 @@ LIVENESS_CHECK_INTERVAL = 0
 CHECK_INTERNET_URL = ""
 CHECK_INTERNET_TIMEOUT = 0
 CSV_FILE = ""
+CSV_FLUSH_ROWS = 0
+CSV_FSYNC = False
+HISTORY_DIR = ""
+HISTORY_FORMAT = ""
+SQLITE_DB = ""
 DOTENV_FILE = ""
 GITHUB_LOGFILE = ""
 DISABLE_LOGGING = False
+LOG_FLUSH_INTERVAL = 0
+LOG_ROTATE_SIZE = 0
+LOG_ROTATE_INTERVAL = 0
+LOG_ROTATE_BACKUPS = 0
+LOG_ROTATE_COMPRESS = False
+METRICS_LISTEN = ""
+CYCLE_SUMMARY = False
+CYCLE_STATS_TOP_N = 0
+CYCLE_STATS_FILE = ""
+TRACE_REQUESTS = False
 HORIZONTAL_LINE1 = 0
 HORIZONTAL_LINE2 = 0
 CLEAR_SCREEN = False
 NET_MAX_RETRIES = 0
 NET_BASE_BACKOFF_SEC = 0
+PAGE_FETCH_RATE_RESERVE = 0
 GITHUB_CHECK_SIGNAL_VALUE = 0
 
 exec(CONFIG_BLOCK, globals())
@@ -268,8 +418,58 @@ LIVENESS_CHECK_COUNTER = LIVENESS_CHECK_INTERVAL / GITHUB_CHECK_INTERVAL
 stdout_bck = None
 csvfieldnames = ['Date', 'Type', 'Name', 'Old', 'New']
 
+# Open CSV sinks keyed by file name (see CSVWriter)
+csv_writers = {}
+
+# Change history sinks for the monitored user (see HistoryWriter, SQLiteWriter)
+history_writer = None
+sqlite_writer = None
+history_user = None
+notification_queue = None
+
 CLI_CONFIG_PATH = None
 
+# Reused SMTP connections idle for longer than this (in seconds) are health-checked with NOOP before sending
+SMTP_NOOP_AFTER = 10
+
+# How long queued notifications are still given to be delivered on exit; in seconds
+NOTIFY_DRAIN_TIMEOUT = 30
+
+# Max number of rendered markdown_to_html() HTML blobs kept in the render cache; 0 disables it
+RENDER_CACHE_SIZE = 512
+
+# How long actor profiles (name and URL) shown in event details are cached, so events of the same actor cost one
+# user request; in seconds, 0 disables it
+ACTOR_CACHE_TTL = 3600
+
+# Open issues and PRs of monitored repos are tracked incrementally (only items updated since the last check are listed);
+# how often they are all listed again to reconcile the index anyway; in seconds
+ISSUES_RESYNC_INTERVAL = 86400
+
+# Forks of monitored repos are listed newest first only until a known fork shows up; how often they are all listed
+# again anyway (they are also listed again whenever the repo's forks count goes down); in seconds
+FORKS_RESYNC_INTERVAL = 86400
+
+# Page size of GitHub REST API lists (100 is the max GitHub allows)
+GITHUB_PER_PAGE = 100
+
+# Max number of pages of long lists (followers, followings, starred repos, stargazers, watchers) fetched concurrently
+# when their length is known up front; 1 fetches them one by one
+PAGE_FETCH_WORKERS = 4
+
+# Decode GitHub API responses with orjson when it is installed (much faster on large pages), json module otherwise
+FAST_JSON_DECODER = True
+
+# Timeout for webhook requests; in seconds
+WEBHOOK_TIMEOUT = 10
+
+# Change types notifications can be routed by (see NOTIFY_ROUTES) and fields sent to webhook / jsonl sinks
+NOTIFY_CHANGE_TYPES = ("profile", "event", "repo", "repo_update_date", "contrib", "error")
+NOTIFY_RECORD_FIELDS = ("ts", "user", "type", "subject", "body")
+
+# Maximum number of log messages waiting for the background log writer (see Logger)
+LOG_QUEUE_SIZE = 10000
+
 # Maximum length for event body text (issue bodies, comment bodies, etc.) before truncation
 # Text longer than this will be truncated with safe HTML tag closing
 MAX_EVENT_BODY_LENGTH = 3500
@@ -288,76 +488,268 @@ import time
 import string
 import os
 from datetime import datetime, timezone, date
-from dateutil import relativedelta
-from dateutil.parser import isoparse
 import calendar
-import requests as req
 import signal
-import smtplib
-import ssl
-from email.header import Header
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
 import argparse
 import csv
+import io
+import json
+import gzip
+import atexit
+import threading
+import hashlib
+import functools
+from collections import OrderedDict
+import queue
 try:
-    import pytz
-except ModuleNotFoundError:
-    raise SystemExit("Error: Couldn't find the pytz library !\n\nTo install it, run:\n    pip3 install pytz\n\nOnce installed, re-run this tool")
-try:
-    from tzlocal import get_localzone
+    import fcntl
 except ImportError:
-    get_localzone = None
-import platform
+    fcntl = None
 import re
 import ipaddress
 import html
-try:
-    from github import Github, Auth, GithubException, UnknownObjectException
-    from github.GithubException import RateLimitExceededException
-    from github.GithubException import BadCredentialsException
-except ModuleNotFoundError:
-    raise SystemExit("Error: Couldn't find the PyGitHub library !\n\nTo install it, run:\n    pip3 install PyGithub\n\nOnce installed, re-run this tool. For more help, visit:\nhttps://github.com/PyGithub/PyGithub")
 from itertools import islice
 import textwrap
-import urllib3
 import socket
 from typing import Any, Callable
 import shutil
 from pathlib import Path
 from typing import Optional
 import datetime as dt
-import requests
 
-NET_ERRORS = (
-    req.exceptions.RequestException,
-    urllib3.exceptions.HTTPError,
-    socket.gaierror,
-    GithubException,
-)
+# Modules used only by some commands are imported where they are needed (smtplib, ssl & email when sending emails,
+# sqlite3 for --sqlite-db / --query, dateutil, tzlocal and platform in the functions using them)
+
+# pytz is imported by load_pytz() from the time zone helpers, so modes not printing any dates never load it
+pytz = None
+
+# PyGithub, requests and urllib3 account for most of the startup time, so they are imported by load_github()
+# right before the first network access; --generate-config, --history-stats and --query never load them
+Github = Auth = GithubException = UnknownObjectException = RateLimitExceededException = BadCredentialsException = None
+req = urllib3 = None
+NET_ERRORS = ()
+
+
+# Imports PyGithub, requests and urllib3 on first use and hooks API request accounting into requests (see install_api_hooks())
+def load_github():
+    global Github, Auth, GithubException, UnknownObjectException, RateLimitExceededException, BadCredentialsException, req, urllib3, NET_ERRORS
+
+    if Github is not None:
+        return
+
+    try:
+        from github import Github, Auth, GithubException, UnknownObjectException
+        from github.GithubException import RateLimitExceededException
+        from github.GithubException import BadCredentialsException
+    except ModuleNotFoundError:
+        raise SystemExit("Error: Couldn't find the PyGitHub library !\n\nTo install it, run:\n    pip3 install PyGithub\n\nOnce installed, re-run this tool. For more help, visit:\nhttps://github.com/PyGithub/PyGithub")
+    import requests as req
+    import urllib3
+
+    NET_ERRORS = (
+        req.exceptions.RequestException,
+        urllib3.exceptions.HTTPError,
+        socket.gaierror,
+        GithubException,
+    )
+
+    install_api_hooks()
+    install_fast_json_decoder()
+
+
+# Imports pytz on first use and checks the configured LOCAL_TIMEZONE against its time zone database
+def load_pytz():
+    global pytz
+
+    if pytz is not None:
+        return
+
+    try:
+        import pytz
+    except ModuleNotFoundError:
+        raise SystemExit("Error: Couldn't find the pytz library !\n\nTo install it, run:\n    pip3 install pytz\n\nOnce installed, re-run this tool")
+
+    if LOCAL_TIMEZONE not in pytz.all_timezones:
+        raise SystemExit(f"* Error: Configured LOCAL_TIMEZONE '{LOCAL_TIMEZONE}' is not valid. Please use a valid pytz timezone name.")
+
+
+# Decoder of GitHub API response bodies (str or bytes), switched to orjson by install_fast_json_decoder()
+json_loads = json.loads
+
+
+# Makes PyGithub and the direct API requests decode responses with orjson if it is installed (see FAST_JSON_DECODER)
+# Anything orjson rejects is handed over to the json module, which raises the usual errors for invalid JSON
+def install_fast_json_decoder():
+    global json_loads
+
+    if not FAST_JSON_DECODER or json_loads is not json.loads:
+        return
+    try:
+        import orjson
+    except ImportError:
+        return
+    import github.Requester
+
+    def fast_loads(data, *args, **kwargs):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data, *args, **kwargs)
+
+    # PyGithub's Requester uses its module's json for loads() and dumps() only
+    class FastJson(object):
+        loads = staticmethod(fast_loads)
+
+        def __getattr__(self, name):
+            return getattr(json, name)
+
+    github.Requester.json = FastJson()
+    json_loads = fast_loads
 
 
 # Logger class to output messages to stdout and log file
+# The log file is written by a background thread fed through a bounded queue (in order), flushed
+# every LOG_FLUSH_INTERVAL seconds and rotated by size / time (see LOG_ROTATE_* options)
 class Logger(object):
-    def __init__(self, filename):
+    def __init__(self, filename, flush_interval=1, rotate_size=0, rotate_interval=0, backups=5, compress=False):
         self.terminal = sys.stdout
-        self.logfile = open(filename, "a", buffering=1, encoding="utf-8")
-
+        self.filename = filename
+        self.flush_interval = max(0.1, float(flush_interval or 1))
+        self.rotate_size = rotate_size
+        self.rotate_interval = rotate_interval
+        self.backups = max(1, int(backups or 1))
+        self.compress = compress
+        self.logfile = open(filename, "a", encoding="utf-8")
+        self.size = self.logfile.tell()
+        self.opened_at = time.time()
+        self.queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self.dropped = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+        log_writers.append(self)
+
+    # The terminal is flushed at line ends only, partial writes are left to its own buffering
     def write(self, message):
         self.terminal.write(message)
-        # Expand tabs in file output so aligned columns render consistently across viewers
-        self.logfile.write(message.expandtabs(8))
-        self.terminal.flush()
-        self.logfile.flush()
+        if message.endswith("\n"):
+            self.terminal.flush()
+        self.write_log(message)
+
+    # Writes the message to the log file only; never blocks, messages not fitting in the queue (writer behind on a slow
+    # disk or a rotation) are dropped and their number is logged with the next accepted message
+    def write_log(self, message):
+        if not message or self.closed:
+            return
+        try:
+            if self.dropped:
+                self.queue.put_nowait(f"* Log writer fell behind, {self.dropped} log messages dropped\n")
+                self.dropped = 0
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
 
     def flush(self):
         pass
 
+    # Drains the queue and closes the log file (at exit, see close_log_writers())
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join(timeout=10)
+
+    def _run(self):
+        last_flush = time.monotonic()
+        running = True
+
+        while running:
+            batch = []
+            try:
+                batch.append(self.queue.get(timeout=self.flush_interval))
+                while len(batch) < 1000:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            if None in batch:
+                batch = batch[:batch.index(None)]
+                running = False
+
+            try:
+                for message in batch:
+                    # Expand tabs in file output so aligned columns render consistently across viewers
+                    message = message.expandtabs(8)
+                    self.logfile.write(message)
+                    # Rotation size is in bytes of the UTF-8 encoded file, emojis take up to 4 of them
+                    self.size += len(message) if message.isascii() else len(message.encode("utf-8"))
+                    if message.endswith("\n") and self._should_rotate():
+                        try:
+                            self._rotate()
+                        except Exception as e:
+                            self.terminal.write(f"* Error rotating log file '{self.filename}': {e}\n")
+
+                if not running or time.monotonic() - last_flush >= self.flush_interval:
+                    self.logfile.flush()
+                    last_flush = time.monotonic()
+            except Exception as e:
+                self.terminal.write(f"* Error writing to log file '{self.filename}': {e}\n")
+
+        self.logfile.close()
+
+    def _should_rotate(self):
+        if self.rotate_size and self.size >= self.rotate_size:
+            return True
+        return bool(self.rotate_interval) and time.time() - self.opened_at >= self.rotate_interval
+
+    # Shifts github_monitor_<username>.log.N files and starts a new log file
+    # The log file is reopened even if shifting fails, so logging goes on (appending to the current file) and the
+    # rotation is retried after another rotate_size bytes / rotate_interval
+    def _rotate(self):
+        self.logfile.close()
+        suffix = ".gz" if self.compress else ""
+
+        try:
+            oldest = f"{self.filename}.{self.backups}{suffix}"
+            if os.path.exists(oldest):
+                os.remove(oldest)
+            for i in range(self.backups - 1, 0, -1):
+                src = f"{self.filename}.{i}{suffix}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.filename}.{i + 1}{suffix}")
+
+            if self.compress:
+                with open(self.filename, "rb") as f_in, gzip.open(f"{self.filename}.1.gz", "wb") as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+                os.remove(self.filename)
+            else:
+                os.replace(self.filename, f"{self.filename}.1")
+        finally:
+            self.logfile = open(self.filename, "a", encoding="utf-8")
+            self.size = 0
+            self.opened_at = time.time()
+
+
+# Loggers writing log files, closed when the tool exits
+log_writers = []
+
+
+# Closes the log files; registered with atexit before any other exit handler, so it runs last (atexit runs handlers
+# in reverse order) and the messages printed by the others (CSV, history, SMTP, notifications) still reach the log
+def close_log_writers():
+    while log_writers:
+        log_writers.pop().close()
+
+
+atexit.register(close_log_writers)
+
 
 # Signal handler when user presses Ctrl+C
+# The message goes to the terminal only, sys.stdout stays as is so output of the exit handlers (e.g. the request trace
+# report) is still logged
 def signal_handler(sig, frame):
-    sys.stdout = stdout_bck
-    print('\n* You pressed Ctrl+C, tool is terminated.')
+    print('\n* You pressed Ctrl+C, tool is terminated.', file=stdout_bck if stdout_bck is not None else sys.stdout)
     sys.exit(0)
 
 
@@ -376,6 +768,7 @@ def clear_screen(enabled=True):
     if not enabled:
         return
     try:
+        import platform
         if platform.system() == 'Windows':
             os.system('cls')
         else:
@@ -412,12 +805,14 @@ def display_time(seconds, granularity=2):
 
 # Calculates time span between two timestamps, accepts timestamp integers, floats and datetime objects
 def calculate_timespan(timestamp1, timestamp2, show_weeks=True, show_hours=True, show_minutes=True, show_seconds=True, granularity=3):
+    load_pytz()
     result = []
     intervals = ['years', 'months', 'weeks', 'days', 'hours', 'minutes', 'seconds']
     ts1 = timestamp1
     ts2 = timestamp2
 
     if isinstance(timestamp1, str):
+        from dateutil.parser import isoparse
         try:
             timestamp1 = isoparse(timestamp1)
         except Exception:
@@ -439,6 +834,7 @@ def calculate_timespan(timestamp1, timestamp2, show_weeks=True, show_hours=True,
         return ""
 
     if isinstance(timestamp2, str):
+        from dateutil.parser import isoparse
         try:
             timestamp2 = isoparse(timestamp2)
         except Exception:
@@ -466,6 +862,7 @@ def calculate_timespan(timestamp1, timestamp2, show_weeks=True, show_hours=True,
         dt1, dt2 = dt2, dt1
 
     if ts_diff > 0:
+        from dateutil import relativedelta
         date_diff = relativedelta.relativedelta(dt1, dt2)
         years = date_diff.years
         months = date_diff.months
@@ -636,6 +1033,11 @@ def sanitize_and_preserve_html(text, convert_line_breaks=True, repo_url=None):
     return sanitized
 
 
+# Pattern to match HTML tags including multiline (use [\s\S]*? to match any char including newlines) and their attributes
+sanitize_tag_re = re.compile(r'<(/)?([a-z][a-z0-9]*)([\s\S]*?)>', re.IGNORECASE)
+sanitize_attr_re = re.compile(r'\s*(\w+)=["\']([^"\']*)["\']')
+
+
 # Sanitizes a single HTML tag
 def sanitize_single_html_tag(html_tag):
     safe_tags = {
@@ -661,9 +1063,7 @@ def sanitize_single_html_tag(html_tag):
         'hr': [],
     }
 
-    # Pattern to match HTML tags including multiline (use [\s\S]*? to match any char including newlines)
-    tag_pattern = r'<(/)?([a-z][a-z0-9]*)([\s\S]*?)>'
-    match = re.match(tag_pattern, html_tag, re.IGNORECASE)
+    match = sanitize_tag_re.match(html_tag)
     if not match:
         return html.escape(html_tag)
 
@@ -682,9 +1082,8 @@ def sanitize_single_html_tag(html_tag):
         return f'<{tag_name}>'
 
     # Extract attributes, handling whitespace/newlines before attribute names
-    attr_pattern = r'\s*(\w+)=["\']([^"\']*)["\']'
     safe_attrs = []
-    for attr_match in re.finditer(attr_pattern, attrs_str):
+    for attr_match in sanitize_attr_re.finditer(attrs_str):
         attr_name = attr_match.group(1).lower()
         attr_value = attr_match.group(2)
 
@@ -701,378 +1100,391 @@ def sanitize_single_html_tag(html_tag):
         return f'<{tag_name}>'
 
 
+# Bounded LRU cache of rendered HTML, keyed by a hash of the renderer name and its arguments (text, flags, repo_url)
+class RenderCache(object):
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_or_render(self, func, args, kwargs):
+        if self.maxsize <= 0:
+            return func(*args, **kwargs)
+
+        key = hashlib.blake2b(repr((func.__name__, args, sorted(kwargs.items()))).encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with self.lock:
+            result = self.entries.get(key)
+            if result is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        # Render outside of the lock, so a slow render does not block other threads
+        result = func(*args, **kwargs)
+        with self.lock:
+            self.entries[key] = result
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return result
+
+    def stats(self):
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hit rate), {len(self.entries)}/{self.maxsize} entries"
+
+
+render_cache = RenderCache(RENDER_CACHE_SIZE)
+
+
+# TTL cache of event actor profiles keyed by actor ID, shared across events and check cycles; actors in event payloads
+# are partial objects, so reading their name or URL costs a user request per event without it
+class ActorCache(object):
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    # Stores the profile of a fully fetched user (e.g. the monitored one), so its events need no extra request
+    def put(self, user):
+        if self.ttl <= 0 or not getattr(user, "id", None):
+            return
+        self.store(user.id, user.name, user.html_url)
+
+    def store(self, actor_id, name, html_url):
+        now = time.monotonic()
+        with self.lock:
+            self.entries[actor_id] = (now + self.ttl, name, html_url)
+            if len(self.entries) > 1000:
+                self.entries = {key: entry for key, entry in self.entries.items() if entry[0] > now}
+
+    # Returns (name, html_url) of the event actor, fetching its profile only if not cached or expired
+    def get(self, actor):
+        actor_id = getattr(actor, "id", None)
+        if self.ttl <= 0 or not actor_id:
+            return getattr(actor, "name", None), getattr(actor, "html_url", None)
+
+        with self.lock:
+            entry = self.entries.get(actor_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1], entry[2]
+            self.misses += 1
+
+        name, html_url = getattr(actor, "name", None), getattr(actor, "html_url", None)
+        self.store(actor_id, name, html_url)
+        return name, html_url
+
+    def stats(self):
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hit rate), {len(self.entries)} entries"
+
+
+actor_cache = ActorCache(ACTOR_CACHE_TTL)
+
+
+# Decorator memoizing HTML renderer results in render_cache (the uncached renderer is available as __wrapped__)
+def cached_render(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return render_cache.get_or_render(func, args, kwargs)
+    return wrapper
+
+
+# Markdown patterns used by markdown_to_html() and its helpers, compiled once at import time
+md_html_tag_re = re.compile(r'</?[a-z][a-z0-9]*(?:[\s\S]*?)>', re.IGNORECASE)
+md_code_block_re = re.compile(r'```([\s\S]*?)```')
+md_image_link_re = re.compile(r'\[!\[([^\]]*)\]\(([^\)]+)\)\]\(([^\)]+)\)')
+md_image_re = re.compile(r'!\[([^\]]*)\]\(([^\)]+)\)')
+md_link_re = re.compile(r'\[([^\]]+)\]\(([^\)]+)\)')
+md_code_placeholder_re = re.compile(r'__CODE_BLOCK_(\d+)__')
+md_pattern_placeholder_re = re.compile(r'__MARKDOWN_PATTERN_(\d+)__')
+md_html_placeholder_re = re.compile(r'PROTECTEDHTMLTAG(\d+)PROTECTED')
+md_attr_placeholder_re = re.compile(r'ATTRPATTERN(\d+)ATTR')
+md_attr_url_placeholder_re = re.compile(r'__ATTR_URL_(\d+)__')
+md_hr_re = re.compile(r'^[-*_]{3,}$')
+md_header_re = re.compile(r'^(#{1,6})\s+(.+)$')
+md_ul_re = re.compile(r'^(\s*)([-*])\s+(.+)$')
+md_ol_re = re.compile(r'^(\s*)(\d+)\.\s+(.+)$')
+md_label_end_re = re.compile(r':\s*$')
+md_label_re = re.compile(r'^[A-Z][a-zA-Z\s]+:\s+\S')
+md_strike_re = re.compile(r'~~([^~]+)~~')
+md_bold_stars_re = re.compile(r'\*\*([^*]+)\*\*')
+md_bold_underscores_re = re.compile(r'__([^_]+)__')
+md_italic_stars_re = re.compile(r'(?<!\*)\*([^*]+)\*(?!\*)')
+md_italic_underscores_re = re.compile(r'(?<![a-zA-Z0-9])_([^_]+)_(?![a-zA-Z0-9])')
+md_inline_code_re = re.compile(r'`([^`]+)`')
+md_attr_re = re.compile(r'(href|src|alt|title)=["\']([^"\']+)["\']', re.IGNORECASE)
+md_attr_url_re = re.compile(r'(href|src|alt|title)=["\'](https?://[^"\']+)["\']', re.IGNORECASE)
+md_block_tag_re = re.compile(r'<\s*/?\s*([a-zA-Z0-9]+)')
+
+MD_IMAGE_URL_SCHEMES = ('http://', 'https://', 'data:', '#')
+MD_LINK_URL_SCHEMES = ('http://', 'https://', 'mailto:', '#')
+
+
+# Makes relative markdown URL absolute (blob/HEAD of repo_url, GitHub requires branch in path)
+def md_resolve_url(url, repo_url, absolute_schemes):
+    if not repo_url or not url or url.startswith(absolute_schemes):
+        return url
+    if url.startswith('/'):
+        return repo_url.rstrip('/') + '/blob/HEAD' + url
+    return repo_url.rstrip('/') + '/blob/HEAD/' + url
+
+
+# Renders markdown image link / image / link protected by markdown_to_html() before HTML escaping
+def md_render_protected_pattern(original_pattern, repo_url):
+    image_link_match = md_image_link_re.match(original_pattern)
+    if image_link_match:
+        alt_text, image_url, link_url = image_link_match.groups()
+        image_url = md_resolve_url(image_url, repo_url, MD_IMAGE_URL_SCHEMES)
+        link_url = md_resolve_url(link_url, repo_url, MD_LINK_URL_SCHEMES)
+        return f'<a href="{html.escape(link_url)}"><img src="{html.escape(image_url)}" alt="{html.escape(alt_text)}"></a>'
+
+    image_match = md_image_re.match(original_pattern)
+    if image_match:
+        alt_text, image_url = image_match.groups()
+        image_url = md_resolve_url(image_url, repo_url, MD_IMAGE_URL_SCHEMES)
+        return f'<img src="{html.escape(image_url)}" alt="{html.escape(alt_text)}">'
+
+    link_match = md_link_re.match(original_pattern)
+    if link_match:
+        link_text, link_url = link_match.groups()
+        link_url = md_resolve_url(link_url, repo_url, MD_LINK_URL_SCHEMES)
+        return f'<a href="{html.escape(link_url)}">{html.escape(link_text)}</a>'
+
+    return None
+
+
+# Replaces numbered placeholders in a single pass; render(idx, placeholder) returns None to keep the placeholder
+def md_restore_placeholders(text, placeholder_re, count, render):
+    if not count:
+        return text
+
+    def replace(match):
+        idx = int(match.group(1))
+        if idx >= count:
+            return match.group(0)
+        replacement = render(idx, match.group(0))
+        return match.group(0) if replacement is None else replacement
+
+    return placeholder_re.sub(replace, text)
+
+
 # Converts markdown text to HTML
+# Every pass is skipped unless its trigger characters occur in the text and placeholders are restored in a single scan
+@cached_render
 def markdown_to_html(text, convert_line_breaks=True, repo_url=None):
     if not text:
         return ""
 
-    # Pattern to match HTML tags (both opening and closing), including those that span multiple lines
-    # Matches: <tagname...> or </tagname> with attributes that may span lines
-    html_tag_pattern = r'</?[a-z][a-z0-9]*(?:[\s\S]*?)>'
-    has_html = bool(re.search(html_tag_pattern, text, re.IGNORECASE))
-
     # Protect code blocks first
     code_blocks = []
-    code_block_pattern = r'```([\s\S]*?)```'
-    code_block_counter = 0
+    if '```' in text:
+        def replace_code_block(match):
+            code_blocks.append('<pre><code>' + html.escape(match.group(1)) + '</code></pre>')
+            return f"__CODE_BLOCK_{len(code_blocks) - 1}__"
 
-    def replace_code_block(match):
-        nonlocal code_block_counter
-        code_content = match.group(1)
-        placeholder = f"__CODE_BLOCK_{code_block_counter}__"
-        code_blocks.append(('<pre><code>' + html.escape(code_content) + '</code></pre>', placeholder))
-        code_block_counter += 1
-        return placeholder
-
-    text = re.sub(code_block_pattern, replace_code_block, text)
+        text = md_code_block_re.sub(replace_code_block, text)
 
-    # If HTML is present, protect HTML tags during markdown processing, then sanitize them
+    # If HTML is present, protect HTML tags (including those spanning multiple lines) during markdown processing,
+    # then sanitize them; the placeholder won't be processed by markdown (no underscores, asterisks, etc.)
     html_tags = []
-    if has_html:
-        html_tag_counter = 0
-
+    if '<' in text:
         def protect_html_tag(match):
-            nonlocal html_tag_counter
             html_tags.append(match.group(0))
-            # Use a placeholder that won't be processed by markdown (no underscores, asterisks, etc.)
-            result = f"PROTECTEDHTMLTAG{html_tag_counter}PROTECTED"
-            html_tag_counter += 1
-            return result
-
-        text = re.sub(html_tag_pattern, protect_html_tag, text, flags=re.IGNORECASE)
-
-    # Protect markdown link/image patterns from HTML escaping and italic processing
-    markdown_pattern_placeholders = []
-    markdown_pattern_counter = 0
-
-    def protect_markdown_pattern(match):
-        nonlocal markdown_pattern_counter
-        markdown_pattern_placeholders.append(match.group(0))
-        result = f"__MARKDOWN_PATTERN_{markdown_pattern_counter}__"
-        markdown_pattern_counter += 1
-        return result
+            return f"PROTECTEDHTMLTAG{len(html_tags) - 1}PROTECTED"
+
+        text = md_html_tag_re.sub(protect_html_tag, text)
 
-    # Protect image links, images, and links before HTML escaping
-    text = re.sub(r'\[!\[([^\]]*)\]\(([^\)]+)\)\]\(([^\)]+)\)', protect_markdown_pattern, text)
-    text = re.sub(r'!\[([^\]]*)\]\(([^\)]+)\)', protect_markdown_pattern, text)
-    text = re.sub(r'\[([^\]]+)\]\(([^\)]+)\)', protect_markdown_pattern, text)
+    # Protect image links, images, and links from HTML escaping and italic processing
+    markdown_patterns = []
+    if '](' in text:
+        def protect_markdown_pattern(match):
+            markdown_patterns.append(match.group(0))
+            return f"__MARKDOWN_PATTERN_{len(markdown_patterns) - 1}__"
+
+        text = md_image_link_re.sub(protect_markdown_pattern, text)
+        text = md_image_re.sub(protect_markdown_pattern, text)
+        text = md_link_re.sub(protect_markdown_pattern, text)
 
     # Escape HTML (but code blocks, protected HTML tags, and markdown patterns are already protected)
     html_text = html.escape(text)
 
     # Restore code blocks
-    for code_html, placeholder in code_blocks:
-        html_text = html_text.replace(placeholder, code_html)
+    html_text = md_restore_placeholders(html_text, md_code_placeholder_re, len(code_blocks), lambda idx, _: code_blocks[idx])
 
     # Process block-level elements line by line
-    lines = html_text.split('\n')
     processed_lines = []
-    in_list = False
-    list_type = None  # 'ul' or 'ol'
+    list_type = None  # 'ul' or 'ol', None when not in a list
     list_items = []
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    for line in html_text.split('\n'):
         stripped = line.strip()
 
-        # Skip empty lines for now (we'll add them back later)
+        # Empty lines close the current list and are kept (line breaks are handled later)
         if not stripped:
-            if in_list:
-                # Close current list
-                if list_type == 'ul':
-                    processed_lines.append('<ul>' + ''.join(list_items) + '</ul>')
-                else:
-                    processed_lines.append('<ol>' + ''.join(list_items) + '</ol>')
-                in_list = False
+            if list_type:
+                processed_lines.append(f'<{list_type}>' + ''.join(list_items) + f'</{list_type}>')
                 list_type = None
                 list_items = []
             processed_lines.append('')
-            i += 1
             continue
 
+        first_char = stripped[0]
+
         # Horizontal rules (must be at least 3 dashes/asterisks)
-        if re.match(r'^[-*_]{3,}$', stripped):
+        if first_char in '-*_' and md_hr_re.match(stripped):
             processed_lines.append('<hr>')
-            i += 1
             continue
 
         # Headers (# ## ### etc.)
-        header_match = re.match(r'^(#{1,6})\s+(.+)$', stripped)
-        if header_match:
-            level = len(header_match.group(1))
-            header_text = header_match.group(2)
-            processed_lines.append(f'<h{level}>{header_text}</h{level}>')
-            i += 1
-            continue
+        if first_char == '#':
+            header_match = md_header_re.match(stripped)
+            if header_match:
+                level = len(header_match.group(1))
+                processed_lines.append(f'<h{level}>{header_match.group(2)}</h{level}>')
+                continue
 
         # Blockquotes (>)
-        if stripped.startswith('>'):
-            quote_text = stripped[1:].strip()
-            processed_lines.append(f'<blockquote>{quote_text}</blockquote>')
-            i += 1
+        if first_char == '>':
+            processed_lines.append(f'<blockquote>{stripped[1:].strip()}</blockquote>')
             continue
 
         # Lists - be careful not to match "- label:" patterns
         # Check for unordered list (- or *)
-        list_match = re.match(r'^(\s*)([-*])\s+(.+)$', line)
-        if list_match:
-            list_content = list_match.group(3)
-            # Don't treat as list if it looks like a label pattern:
-            # - Ends with just a colon (with optional whitespace), OR
-            # - Matches pattern like "Word:" or "Words:" followed by tabs/spaces (typical label format)
-            is_label = (re.search(r':\s*$', list_content) or re.match(r'^[A-Z][a-zA-Z\s]+:\s+\S', list_content))
-            if not is_label:
-                if not in_list or list_type != 'ul':
-                    if in_list:
-                        # Close previous list
-                        if list_type == 'ol':
+        if first_char in '-*':
+            list_match = md_ul_re.match(line)
+            if list_match:
+                list_content = list_match.group(3)
+                # Don't treat as list if it looks like a label pattern:
+                # - Ends with just a colon (with optional whitespace), OR
+                # - Matches pattern like "Word:" or "Words:" followed by tabs/spaces (typical label format)
+                if not (md_label_end_re.search(list_content) or md_label_re.match(list_content)):
+                    if list_type != 'ul':
+                        if list_type:
                             processed_lines.append('<ol>' + ''.join(list_items) + '</ol>')
-                        list_items = []
-                    in_list = True
-                    list_type = 'ul'
-
-                list_items.append(f'<li>{list_content}</li>')
-                i += 1
-                continue
+                            list_items = []
+                        list_type = 'ul'
+                    list_items.append(f'<li>{list_content}</li>')
+                    continue
 
         # Check for ordered list (1. 2. etc.)
-        ordered_match = re.match(r'^(\s*)(\d+)\.\s+(.+)$', line)
-        if ordered_match:
-            list_content = ordered_match.group(3)
-
-            if not in_list or list_type != 'ol':
-                if in_list:
-                    # Close previous list
-                    if list_type == 'ul':
+        if first_char.isdigit():
+            ordered_match = md_ol_re.match(line)
+            if ordered_match:
+                if list_type != 'ol':
+                    if list_type:
                         processed_lines.append('<ul>' + ''.join(list_items) + '</ul>')
-                    list_items = []
-                in_list = True
-                list_type = 'ol'
-
-            list_items.append(f'<li>{list_content}</li>')
-            i += 1
-            continue
+                        list_items = []
+                    list_type = 'ol'
+                list_items.append(f'<li>{ordered_match.group(3)}</li>')
+                continue
 
         # Not a list item, so close any open list
-        if in_list:
-            if list_type == 'ul':
-                processed_lines.append('<ul>' + ''.join(list_items) + '</ul>')
-            else:
-                processed_lines.append('<ol>' + ''.join(list_items) + '</ol>')
-            in_list = False
+        if list_type:
+            processed_lines.append(f'<{list_type}>' + ''.join(list_items) + f'</{list_type}>')
             list_type = None
             list_items = []
 
         # Regular line
         processed_lines.append(line)
-        i += 1
 
     # Close any remaining open list
-    if in_list:
-        if list_type == 'ul':
-            processed_lines.append('<ul>' + ''.join(list_items) + '</ul>')
-        else:
-            processed_lines.append('<ol>' + ''.join(list_items) + '</ol>')
+    if list_type:
+        processed_lines.append(f'<{list_type}>' + ''.join(list_items) + f'</{list_type}>')
 
     html_text = '\n'.join(processed_lines)
 
-    # Process inline elements (but skip code blocks)
-    # First, restore and process protected markdown patterns
-    for idx, original_pattern in enumerate(markdown_pattern_placeholders):
-        placeholder = f"__MARKDOWN_PATTERN_{idx}__"
-        escaped_placeholder = html.escape(placeholder)
-        # Check both escaped and unescaped placeholders
-        if placeholder in html_text or escaped_placeholder in html_text:
-            # Process the original pattern (unescaped)
-            # Image links
-            image_link_match = re.match(r'\[!\[([^\]]*)\]\(([^\)]+)\)\]\(([^\)]+)\)', original_pattern)
-            if image_link_match:
-                alt_text = image_link_match.group(1)
-                image_url = image_link_match.group(2)
-                link_url = image_link_match.group(3)
-                if repo_url:
-                    if image_url and not image_url.startswith(('http://', 'https://', 'data:', '#')):
-                        if image_url.startswith('/'):
-                            image_url = repo_url.rstrip('/') + '/blob/HEAD' + image_url
-                        else:
-                            image_url = repo_url.rstrip('/') + '/blob/HEAD/' + image_url
-                    if link_url and not link_url.startswith(('http://', 'https://', 'mailto:', '#')):
-                        if link_url.startswith('/'):
-                            link_url = repo_url.rstrip('/') + '/blob/HEAD' + link_url
-                        else:
-                            link_url = repo_url.rstrip('/') + '/blob/HEAD/' + link_url
-                replacement = f'<a href="{html.escape(link_url)}"><img src="{html.escape(image_url)}" alt="{html.escape(alt_text)}"></a>'
-                html_text = html_text.replace(placeholder, replacement)
-                html_text = html_text.replace(escaped_placeholder, replacement)
-                continue
-
-            # Images
-            image_match = re.match(r'!\[([^\]]*)\]\(([^\)]+)\)', original_pattern)
-            if image_match:
-                alt_text = image_match.group(1)
-                image_url = image_match.group(2)
-                if repo_url and image_url and not image_url.startswith(('http://', 'https://', 'data:', '#')):
-                    if image_url.startswith('/'):
-                        absolute_url = repo_url.rstrip('/') + '/blob/HEAD' + image_url
-                    else:
-                        absolute_url = repo_url.rstrip('/') + '/blob/HEAD/' + image_url
-                    replacement = f'<img src="{html.escape(absolute_url)}" alt="{html.escape(alt_text)}">'
-                else:
-                    replacement = f'<img src="{html.escape(image_url)}" alt="{html.escape(alt_text)}">'
-                html_text = html_text.replace(placeholder, replacement)
-                html_text = html_text.replace(escaped_placeholder, replacement)
-                continue
-
-            # Links
-            link_match = re.match(r'\[([^\]]+)\]\(([^\)]+)\)', original_pattern)
-            if link_match:
-                link_text = link_match.group(1)
-                link_url = link_match.group(2)
-                if repo_url and link_url and not link_url.startswith(('http://', 'https://', 'mailto:', '#')):
-                    if link_url.startswith('/'):
-                        absolute_url = repo_url.rstrip('/') + '/blob/HEAD' + link_url
-                    else:
-                        absolute_url = repo_url.rstrip('/') + '/blob/HEAD/' + link_url
-                    replacement = f'<a href="{html.escape(absolute_url)}">{html.escape(link_text)}</a>'
-                else:
-                    replacement = f'<a href="{html.escape(link_url)}">{html.escape(link_text)}</a>'
-                html_text = html_text.replace(placeholder, replacement)
-                html_text = html_text.replace(escaped_placeholder, replacement)
-                continue
+    # Process inline elements, starting with protected markdown patterns
+    html_text = md_restore_placeholders(html_text, md_pattern_placeholder_re, len(markdown_patterns), lambda idx, _: md_render_protected_pattern(markdown_patterns[idx], repo_url))
 
     # Process remaining markdown patterns that weren't protected (shouldn't happen, but for safety)
-    image_link_pattern = r'\[!\[([^\]]*)\]\(([^\)]+)\)\]\(([^\)]+)\)'
-
-    def convert_image_link(match):
-        alt_text = html.unescape(match.group(1))
-        image_url = html.unescape(match.group(2))
-        link_url = html.unescape(match.group(3))
-        if repo_url:
-            if image_url and not image_url.startswith(('http://', 'https://', 'data:', '#')):
-                if image_url.startswith('/'):
-                    image_url = repo_url.rstrip('/') + '/blob/HEAD' + image_url
-                else:
-                    image_url = repo_url.rstrip('/') + '/blob/HEAD/' + image_url
-            if link_url and not link_url.startswith(('http://', 'https://', 'mailto:', '#')):
-                if link_url.startswith('/'):
-                    link_url = repo_url.rstrip('/') + '/blob/HEAD' + link_url
-                else:
-                    link_url = repo_url.rstrip('/') + '/blob/HEAD/' + link_url
-        return f'<a href="{html.escape(link_url)}"><img src="{html.escape(image_url)}" alt="{html.escape(alt_text)}"></a>'
-    html_text = re.sub(image_link_pattern, convert_image_link, html_text)
-
-    # Images
-    image_pattern = r'!\[([^\]]*)\]\(([^\)]+)\)'
-
-    def convert_image(match):
-        alt_text = html.unescape(match.group(1))
-        image_url = html.unescape(match.group(2))
-        # Convert relative image URLs to absolute if repo_url is provided
-        if repo_url and image_url and not image_url.startswith(('http://', 'https://', 'data:', '#')):
-            # Use blob/HEAD/ for relative image URLs (GitHub requires branch in path)
-            if image_url.startswith('/'):
-                absolute_url = repo_url.rstrip('/') + '/blob/HEAD' + image_url
-            else:
-                absolute_url = repo_url.rstrip('/') + '/blob/HEAD/' + image_url
-            return f'<img src="{html.escape(absolute_url)}" alt="{html.escape(alt_text)}">'
-        return f'<img src="{html.escape(image_url)}" alt="{html.escape(alt_text)}">'
-    html_text = re.sub(image_pattern, convert_image, html_text)
-
-    # Links
-    link_pattern = r'\[([^\]]+)\]\(([^\)]+)\)'
-
-    def convert_link(match):
-        link_text = html.unescape(match.group(1))
-        link_url = html.unescape(match.group(2))
-        # Convert relative links to absolute if repo_url is provided
-        if repo_url and link_url and not link_url.startswith(('http://', 'https://', 'mailto:', '#')):
-            # Use blob/HEAD/ for relative links (GitHub requires branch in path)
-            if link_url.startswith('/'):
-                absolute_url = repo_url.rstrip('/') + '/blob/HEAD' + link_url
-            else:
-                absolute_url = repo_url.rstrip('/') + '/blob/HEAD/' + link_url
-            return f'<a href="{html.escape(absolute_url)}">{link_text}</a>'
-        return f'<a href="{html.escape(link_url)}">{link_text}</a>'
-    html_text = re.sub(link_pattern, convert_link, html_text)
+    if '](' in html_text:
+        def convert_image_link(match):
+            alt_text, image_url, link_url = (html.unescape(group) for group in match.groups())
+            image_url = md_resolve_url(image_url, repo_url, MD_IMAGE_URL_SCHEMES)
+            link_url = md_resolve_url(link_url, repo_url, MD_LINK_URL_SCHEMES)
+            return f'<a href="{html.escape(link_url)}"><img src="{html.escape(image_url)}" alt="{html.escape(alt_text)}"></a>'
+
+        def convert_image(match):
+            alt_text, image_url = (html.unescape(group) for group in match.groups())
+            image_url = md_resolve_url(image_url, repo_url, MD_IMAGE_URL_SCHEMES)
+            return f'<img src="{html.escape(image_url)}" alt="{html.escape(alt_text)}">'
+
+        def convert_link(match):
+            link_text, link_url = (html.unescape(group) for group in match.groups())
+            link_url = md_resolve_url(link_url, repo_url, MD_LINK_URL_SCHEMES)
+            return f'<a href="{html.escape(link_url)}">{link_text}</a>'
+
+        html_text = md_image_link_re.sub(convert_image_link, html_text)
+        html_text = md_image_re.sub(convert_image, html_text)
+        html_text = md_link_re.sub(convert_link, html_text)
 
     # Strikethrough
-    html_text = re.sub(r'~~([^~]+)~~', r'<s>\1</s>', html_text)
+    if '~~' in html_text:
+        html_text = md_strike_re.sub(r'<s>\1</s>', html_text)
 
     # Bold
-    html_text = re.sub(r'\*\*([^*]+)\*\*', r'<b>\1</b>', html_text)
-    html_text = re.sub(r'__([^_]+)__', r'<b>\1</b>', html_text)
+    if '**' in html_text:
+        html_text = md_bold_stars_re.sub(r'<b>\1</b>', html_text)
+    if '__' in html_text:
+        html_text = md_bold_underscores_re.sub(r'<b>\1</b>', html_text)
 
     # Italic (must not be part of bold, and not inside HTML attributes)
-    # Protect HTML attributes from italic processing
-    attr_pattern_placeholders = []
-    attr_pattern_counter = 0
-
-    def protect_attr_pattern(match):
-        nonlocal attr_pattern_counter
-        attr_pattern_placeholders.append(match.group(0))
-        # Use placeholder without underscores to avoid italic processing
-        result = f"ATTRPATTERN{attr_pattern_counter}ATTR"
-        attr_pattern_counter += 1
-        return result
+    has_stars = '*' in html_text
+    has_underscores = '_' in html_text
+    if has_stars or has_underscores:
+        # Protect URLs in HTML attributes (href="...", src="...", alt="...", title="...") from italic processing
+        attr_patterns = []
+
+        def protect_attr_pattern(match):
+            attr_patterns.append(match.group(0))
+            # Use placeholder without underscores to avoid italic processing
+            return f"ATTRPATTERN{len(attr_patterns) - 1}ATTR"
 
-    # Protect URLs in HTML attributes (href="...", src="...", alt="...", title="...")
-    # This prevents italic processing from affecting URLs inside HTML attributes
-    html_text = re.sub(r'(href|src|alt|title)=["\']([^"\']+)["\']', protect_attr_pattern, html_text, flags=re.IGNORECASE)
+        html_text = md_attr_re.sub(protect_attr_pattern, html_text)
 
-    html_text = re.sub(r'(?<!\*)\*([^*]+)\*(?!\*)', r'<i>\1</i>', html_text)
-    # Only match italic underscores when they're clearly markdown (word boundaries or spaces/punctuation)
-    html_text = re.sub(r'(?<![a-zA-Z0-9])_([^_]+)_(?![a-zA-Z0-9])', r'<i>\1</i>', html_text)
+        if has_stars:
+            html_text = md_italic_stars_re.sub(r'<i>\1</i>', html_text)
+        # Only match italic underscores when they're clearly markdown (word boundaries or spaces/punctuation)
+        if has_underscores:
+            html_text = md_italic_underscores_re.sub(r'<i>\1</i>', html_text)
 
-    # Restore protected patterns
-    for idx, pattern in enumerate(attr_pattern_placeholders):
-        html_text = html_text.replace(f"ATTRPATTERN{idx}ATTR", pattern)
+        html_text = md_restore_placeholders(html_text, md_attr_placeholder_re, len(attr_patterns), lambda idx, _: attr_patterns[idx])
 
     # Inline code (but not inside code blocks)
-    html_text = re.sub(r'`([^`]+)`', r'<code>\1</code>', html_text)
+    if '`' in html_text:
+        html_text = md_inline_code_re.sub(r'<code>\1</code>', html_text)
 
     # Protect URLs inside HTML attributes before converting plain URLs to links
     # This prevents convert_urls_to_links from converting URLs that are already in href/src/alt attributes
-    attr_url_placeholders = []
-    attr_url_counter = 0
-
-    def protect_attr_url(match):
-        nonlocal attr_url_counter
-        full_match = match.group(0)
-        attr_url_placeholders.append(full_match)
-        result = f"__ATTR_URL_{attr_url_counter}__"
-        attr_url_counter += 1
-        return result
+    attr_urls = []
+    if 'http' in html_text:
+        def protect_attr_url(match):
+            attr_urls.append(match.group(0))
+            return f"__ATTR_URL_{len(attr_urls) - 1}__"
 
-    # Match URLs inside HTML attributes (href="...", src="...", alt="...", title="...")
-    attr_url_pattern = r'(href|src|alt|title)=["\'](https?://[^"\']+)["\']'
-    html_text = re.sub(attr_url_pattern, protect_attr_url, html_text, flags=re.IGNORECASE)
+        html_text = md_attr_url_re.sub(protect_attr_url, html_text)
 
-    # Convert plain URLs to links (avoid double-converting URLs already in <a> tags)
-    html_text = convert_urls_to_links(html_text)
+        # Convert plain URLs to links (avoid double-converting URLs already in <a> tags)
+        html_text = convert_urls_to_links(html_text)
 
     # Convert commit hashes to links if repo_url is provided
     if repo_url:
         html_text = convert_commit_hashes_to_links(html_text, repo_url)
 
     # Restore protected attribute URLs
-    for idx, attr_url in enumerate(attr_url_placeholders):
-        html_text = html_text.replace(f"__ATTR_URL_{idx}__", attr_url)
+    html_text = md_restore_placeholders(html_text, md_attr_url_placeholder_re, len(attr_urls), lambda idx, _: attr_urls[idx])
 
     # If HTML was detected, restore and sanitize the protected HTML tags BEFORE line break conversion
     # This allows the line break logic to properly detect HTML block elements
-    if has_html and html_tags:
-        for idx, original_html_tag in enumerate(html_tags):
-            # Use the same placeholder format that was used during protection
-            placeholder = f"PROTECTEDHTMLTAG{idx}PROTECTED"
-            if placeholder in html_text:
-                sanitized_tag = sanitize_single_html_tag(original_html_tag)
-                # Only replace if sanitization returned a valid tag (not empty string)
-                if sanitized_tag:
-                    html_text = html_text.replace(placeholder, sanitized_tag)
-                else:
-                    # If tag was filtered out, escape the original tag instead
-                    html_text = html_text.replace(placeholder, html.escape(original_html_tag))
+    # If a tag is filtered out by sanitization, the original tag is escaped instead
+    html_text = md_restore_placeholders(html_text, md_html_placeholder_re, len(html_tags), lambda idx, _: sanitize_single_html_tag(html_tags[idx]) or html.escape(html_tags[idx]))
 
     if convert_line_breaks:
         # Line-break handling that respects both text paragraphs and HTML blocks.
@@ -1081,15 +1493,13 @@ def markdown_to_html(text, convert_line_breaks=True, repo_url=None):
         # - text -> blank -> HTML block  => <br><br> (extra space before big block like <details>)
         # - HTML -> blank -> text        => one <br>
         # - HTML -> blank -> HTML block  => no extra <br>
-        lines = html_text.split('\n')
         result_lines = []
         prev_type = None  # 'text' or 'html'
         prev_html_tag = None  # last HTML tag name (e.g., 'ul', 'details', 'a')
         prev_html_had_image = False  # whether previous HTML line contained an <img>
-        prev_text_line = None  # stripped previous text line
         pending_blank = False
 
-        for line in lines:
+        for line in html_text.split('\n'):
             stripped = line.strip()
 
             if not stripped:
@@ -1097,79 +1507,69 @@ def markdown_to_html(text, convert_line_breaks=True, repo_url=None):
                 pending_blank = True
                 continue
 
-            is_html = stripped.startswith('<')
-
-            if is_html:
+            if stripped[0] == '<':
                 # Detect tag name for smarter spacing rules
-                tag_match = re.match(r'<\s*/?\s*([a-zA-Z0-9]+)', stripped)
+                tag_match = md_block_tag_re.match(stripped)
                 tag_name = tag_match.group(1).lower() if tag_match else None
 
                 if prev_type == 'text' and pending_blank:
                     # Text paragraph followed by blank line then HTML block
                     # Only use double break before certain heavy blocks like <details>
-                    if tag_name == 'details':
-                        result_lines.append('<br><br>')
-                    else:
-                        result_lines.append('<br>')
+                    result_lines.append('<br><br>' if tag_name == 'details' else '<br>')
 
                 # Always keep HTML lines as-is
                 result_lines.append(line)
                 prev_type = 'html'
                 prev_html_tag = tag_name
                 prev_html_had_image = ('<img' in stripped.lower())
-                pending_blank = False
             else:
                 # Text line (may contain inline HTML like <b>, <a>, etc.)
                 if prev_type == 'text':
-                    # Consecutive text paragraphs
-                    if pending_blank:
-                        # Blank line between text paragraphs -> full empty line
-                        result_lines.append('<br><br>')
-                    else:
-                        result_lines.append('<br>')
+                    # Consecutive text paragraphs; blank line between them -> full empty line
+                    result_lines.append('<br><br>' if pending_blank else '<br>')
                 elif prev_type == 'html' and pending_blank:
                     # HTML block followed by blank line then text
                     # Avoid extra break after lists (<ul>/<ol>) which already have spacing
+                    # If previous HTML line contained an image (e.g., badge), use double break
                     if prev_html_tag not in ('ul', 'ol'):
-                        # If previous HTML line contained an image (e.g., badge), use double break
-                        if prev_html_had_image:
-                            result_lines.append('<br><br>')
-                        else:
-                            result_lines.append('<br>')
+                        result_lines.append('<br><br>' if prev_html_had_image else '<br>')
                 result_lines.append(line)
                 prev_type = 'text'
-                prev_text_line = stripped
-                pending_blank = False
+            pending_blank = False
 
         html_text = ''.join(result_lines)
 
     return html_text
 
 
+url_bracket_re = re.compile(r'\[\s*(https?://[^\s\]]+)\s*\]')
+
+# Match URLs but not those inside HTML attributes (href="...", src="...", etc.)
+# This pattern avoids matching URLs that are already inside quotes after = (attribute values)
+url_plain_re = re.compile(r'(?<!href=")(?<!src=")(?<!alt=")(?<!title=")(?<!">)(?<!<a href=")(?<!<img src=")(https?://[^\s<>"]+)')
+
+
 # Converts URLs in HTML-escaped text to clickable links
 def convert_urls_to_links(text):
-    if not text:
+    if not text or 'http' not in text:
         return text
 
-    bracket_pattern = r'\[\s*(https?://[^\s\]]+)\s*\]'
-    text = re.sub(bracket_pattern, r'<a href="\1">\1</a>', text)
-
-    # Match URLs but not those inside HTML attributes (href="...", src="...", etc.)
-    # This pattern avoids matching URLs that are already inside quotes after = (attribute values)
-    url_pattern = r'(?<!href=")(?<!src=")(?<!alt=")(?<!title=")(?<!">)(?<!<a href=")(?<!<img src=")(https?://[^\s<>"]+)'
-    text = re.sub(url_pattern, r'<a href="\1">\1</a>', text)
+    text = url_bracket_re.sub(r'<a href="\1">\1</a>', text)
+    text = url_plain_re.sub(r'<a href="\1">\1</a>', text)
 
     return text
 
 
+# Regex for commit hashes: 7 to 40 hex characters, exclude purely numeric strings of length 7-15 which are likely Event IDs
+commit_hash_re = re.compile(r'(?<![a-zA-Z0-9])(?![0-9]{7,15}(?![a-zA-Z0-9]))([a-f0-9]{7,40})(?![a-zA-Z0-9])')
+html_tag_split_re = re.compile(r'(<[^>]+>)')
+
+
 # Converts commit hashes (7-40 hex chars) to clickable GitHub links
 def convert_commit_hashes_to_links(text, repo_url=None):
-    if not text or not repo_url:
+    if not text or not repo_url or not commit_hash_re.search(text):
         return text
 
-    # Regex for commit hashes: 7 to 40 hex characters, exclude purely numeric strings of length 7-15 which are likely Event IDs
-    commit_pattern = r'(?<![a-zA-Z0-9])(?![0-9]{7,15}(?![a-zA-Z0-9]))([a-f0-9]{7,40})(?![a-zA-Z0-9])'
-
     def replace_hash(match):
         commit_hash = match.group(1)
         # Construct commit URL
@@ -1177,7 +1577,7 @@ def convert_commit_hashes_to_links(text, repo_url=None):
         return f'<a href="{commit_url}">{commit_hash}</a>'
 
     # To avoid matching hashes inside tags (like <a href="...">hash</a>) or attributes, we split by tags and only process the non-tag parts
-    parts = re.split(r'(<[^>]+>)', text)
+    parts = html_tag_split_re.split(text)
     in_anchor = False
     for i in range(len(parts)):
         part = parts[i]
@@ -1191,7 +1591,7 @@ def convert_commit_hashes_to_links(text, repo_url=None):
         else:
             # If it's not a tag and we're not inside an anchor, process it
             if not in_anchor:
-                parts[i] = re.sub(commit_pattern, replace_hash, part)
+                parts[i] = commit_hash_re.sub(replace_hash, part)
 
     return ''.join(parts)
 
@@ -1267,487 +1667,1136 @@ def format_email_body_html(body_text, bold_keys=None, repo_url=None):
     return html_text
 
 
-# Converts event text to HTML, handling markdown in specific fields
-def event_text_to_html(event_text, event_type=None, event_payload=None):
-    if not event_text:
+event_kv_re = re.compile(r'^(.+?):\s+(.+)$')
+event_quoted_re = re.compile(r"'([^']+)'")
+event_after_re = re.compile(r'\(after\s+([^:]+):\s+([^)]+)\)')
+event_header_hr_re = re.compile(r'</b><br><hr')
+event_hr_header_re = re.compile(r'(<hr[^>]*>)<br><b>===')
+event_hr_next_re = re.compile(r'(<hr[^>]*>)<br>\s*(<b>|</b>|<span)')
+
+EVENT_SECTION_HEADERS = (
+    'Changed files list:', 'Removed files:', 'Added files:', 'Modified files:',
+    'Closed issues:', 'Opened issues:', 'Reopened issues:',
+    'Closed pull requests:', 'Opened pull requests:',
+    'Created tags:', 'Deleted tags:', 'Created branches:', 'Deleted branches:',
+    'Assets:',
+)
+
+EVENT_DATE_STYLE = "background-color: #f0f0f0; padding: 2px 4px; border-radius: 3px; font-family: monospace; font-size: 1.00em;"
+EVENT_COMMIT_MESSAGE_STYLE = "background-color: #f8f8f8; padding: 3px 3px; border-radius: 4px; font-size: 1.00em;"
+EVENT_HR = '<hr style="border: none; border-top: 1px dotted #ccc; margin: 5px 0;">'
+
+
+# Structured record of a GitHub event; every entry is printed to the console as it is added, while the plain text,
+# HTML and CSV representations are all rendered from the same typed entries (kinds: blank, separator, field, heading,
+# pr_heading, message, body, reply, note)
+class EventRecord(object):
+    def __init__(self, event):
+        self.event_id = event.id
+        self.event_type = event.type
+        self.event_date = event.created_at
+        self.repo_id = event.repo.id
+        self.actor = getattr(event.actor, "login", None)
+        self.repo_name = ""
+        self.repo_url = ""
+        self.entries = []
+        self.lines = []
+
+    def _add(self, entry, text):
+        self.entries.append(entry)
+        self.lines.append(print_v(text))
+
+    def blank(self):
+        self._add(("blank",), "")
+
+    def separator(self):
+        self._add(("separator",), "." * HORIZONTAL_LINE1)
+
+    # kind: "text" (markdown), "date" (highlighted timestamp) or "identifier" (escaped as is)
+    def field(self, label, value, kind="text"):
+        tabs = "\t" * max(1, 4 - len(label + ":") // 8)
+        self._add(("field", label, str(value), kind), f"{label}:{tabs}{value}")
+
+    def heading(self, text):
+        self._add(("heading", text), text)
+
+    def pr_heading(self, number, title):
+        self._add(("pr_heading", number, title), f"=== PR #{number}: {title} ===")
+
+    # One-line commit message shown in quotes next to its label
+    def message(self, label, text):
+        tabs = "\t" * max(1, 4 - len(label + ":") // 8)
+        self._add(("message", label, text), f"{label}:{tabs}'{text}'")
+
+    # Multi-line quoted body below its label; style="commit" highlights commit messages, indented bodies use format_body_block()
+    def body(self, label, text, style="plain", indented=False):
+        quoted = format_body_block(text) if indented else f"\n'{text}'"
+        self._add(("body", label, text, style), f"{label}:\n{quoted}")
+
+    # Quoted body of the comment the event replies to
+    def reply(self, header, text):
+        self._add(("reply", header, text), f"Previous comment:\n\n{header}\n{format_body_block(text)}")
+
+    def note(self, text):
+        self._add(("note", text), text)
+
+    @property
+    def text(self):
+        return "".join(self.lines)
+
+    def to_html(self):
+        repo_url = self.repo_url or None
+        html_lines = []
+        skip_blank = False
+
+        for entry in self.entries:
+            kind = entry[0]
+            if skip_blank and kind == "blank":
+                skip_blank = False
+                continue
+            skip_blank = False
+
+            if kind == "blank":
+                html_lines.append('')
+            elif kind == "separator":
+                html_lines.append(EVENT_HR)
+                # Avoid double line break after the separator
+                skip_blank = True
+            elif kind == "field":
+                html_lines.append(event_field_html(entry[1].strip(), entry[2].strip(), entry[3], repo_url))
+            elif kind == "heading":
+                html_lines.append(f'<b>{html.escape(entry[1])}</b>')
+            elif kind == "pr_heading":
+                html_lines.append(f'=== PR #{entry[1]}: <b>{markdown_to_html(str(entry[2]), convert_line_breaks=False, repo_url=repo_url)}</b> ===')
+            elif kind == "message":
+                label = entry[1]
+                message_html = markdown_to_html(entry[2], convert_line_breaks=True, repo_url=repo_url)
+                leading = label[:len(label) - len(label.lstrip())]
+                html_lines.append(f'{html.escape(leading)}<b>{html.escape(label.strip())}:</b> {event_commit_message_html(message_html)}')
+            elif kind == "body":
+                body_html = markdown_to_html(entry[2], convert_line_breaks=True, repo_url=repo_url)
+                if entry[3] == "commit":
+                    body_html = event_commit_message_html(body_html)
+                html_lines.append(f"<b>{html.escape(entry[1].strip())}:</b><br><br>'{body_html}'")
+            elif kind == "reply":
+                body_html = markdown_to_html(entry[2], convert_line_breaks=True, repo_url=repo_url)
+                html_lines.append(f"<b>Previous comment:</b><br><br>{html.escape(entry[1])}<br><br>'{body_html}'")
+            else:
+                html_lines.append(event_note_html(entry[1], repo_url))
+
+        # Join with <br> (ending with one, like the trailing newline of the text), then remove <br> between commit headers and separators
+        if not skip_blank:
+            html_lines.append('')
+        result = '<br>'.join(html_lines)
+        result = event_header_hr_re.sub(r'</b><hr', result)
+        result = event_hr_header_re.sub(r'\1<b>===', result)
+        result = event_hr_next_re.sub(r'\1\2', result)
+        return result
+
+    # Writes the event to the CSV file and history
+    def record(self, csv_file_name):
+        record_change(csv_file_name, convert_to_local_naive(self.event_date), str(self.event_type), str(self.repo_name), "", "", event_id=self.event_id, repo_id=self.repo_id, actor=self.actor)
+
+
+# Wraps already rendered commit message HTML in a highlighted span
+def event_commit_message_html(message_html):
+    if not message_html:
         return ""
+    return f'<span style="{EVENT_COMMIT_MESSAGE_STYLE}">{message_html}</span>'
+
+
+# Renders a labelled event field to HTML according to its kind
+def event_field_html(label, value, kind, repo_url=None):
+    if not value:
+        return event_note_html(f"{label}:", repo_url)
+
+    label_html = f"<b>{html.escape(label)}:</b>"
+
+    if value.startswith('http://') or value.startswith('https://'):
+        escaped_url = html.escape(value)
+        return f"{label_html} <a href=\"{escaped_url}\">{escaped_url}</a>"
+
+    if kind == "date":
+        # Values like "Merged at: ... by username" keep the user part outside of the highlight
+        if ' by ' in value:
+            date_part, by_part = value.split(' by ', 1)
+            suffix = html.escape(' by ' + by_part)
+        else:
+            date_part, suffix = value, ''
+        # Bold only the time duration part (e.g. "2 hours, 27 minutes"), not "after"
+        value_html = event_after_re.sub(r'(after <b>\1</b>: \2)', html.escape(date_part))
+        value_html = f'<span style="{EVENT_DATE_STYLE}">{value_html}</span>{suffix}'
+    elif kind == "identifier":
+        value_html = html.escape(value)
+    else:
+        if label == "Description" and value.startswith("'") and value.endswith("'"):
+            value = value[1:-1]
+        value_html = markdown_to_html(value, convert_line_breaks=False, repo_url=repo_url)
+        value_html = convert_urls_to_links(value_html)
 
-    # Extract repo URL from event text if available
-    repo_url = None
-    for line in event_text.split('\n'):
-        if 'Repo URL:' in line:
-            # Extract URL from line like "Repo URL: https://github.com/user/repo"
-            match = re.search(r'Repo URL:\s*(https?://[^\s]+)', line)
-            if match:
-                repo_url = match.group(1)
+    return f"{label_html} {value_html}"
+
+
+# Renders a free-form event line (status messages, file lists, errors) to HTML
+def event_note_html(text, repo_url=None):
+    stripped = text.replace('\t', ' ').strip()
+    if not stripped:
+        return ''
+
+    match = event_kv_re.match(stripped)
+    if match:
+        return event_field_html(match.group(1), match.group(2), "text", repo_url)
+
+    if stripped.startswith('===') and stripped.endswith('==='):
+        return f'<b>{html.escape(stripped)}</b>'
+
+    # Protect quoted text (file names, strings) from markdown conversion
+    line = stripped
+    quoted_strings = event_quoted_re.findall(line)
+    for idx, quoted_str in enumerate(quoted_strings):
+        line = line.replace(f"'{quoted_str}'", f"__QUOTED_{idx}__", 1)
+
+    line_html = markdown_to_html(line, convert_line_breaks=False, repo_url=repo_url)
+    line_html = convert_urls_to_links(line_html)
+
+    for idx, quoted_str in enumerate(quoted_strings):
+        line_html = line_html.replace(f"__QUOTED_{idx}__", f"'<i>{html.escape(quoted_str)}</i>'")
+
+    for header in EVENT_SECTION_HEADERS:
+        if header in stripped:
+            escaped_header = html.escape(header)
+            line_html = line_html.replace(escaped_header, f'<b>{escaped_header}</b>')
+            break
+
+    return line_html
+
+
+fqdn_re = re.compile(r'(?=^.{4,253}$)(^((?!-)[a-zA-Z0-9-]{1,63}(?<!-)\.)+[a-zA-Z]{2,63}\.?$)')
+email_re = re.compile(r'[^@]+@[^@]+\.[^@]+')
+
+# Result of the last SMTP settings validation (None = not validated yet, "" = valid)
+smtp_settings_error = None
+
+
+# Validates SMTP settings once (at startup and after secrets reload) and returns the error description ("" if valid)
+def validate_smtp_settings():
+    global smtp_settings_error
+
+    error = ""
+    try:
+        ipaddress.ip_address(str(SMTP_HOST))
+    except ValueError:
+        if not fqdn_re.search(str(SMTP_HOST)):
+            error = "invalid IP address/FQDN in SMTP_HOST"
+
+    if not error:
+        try:
+            port = int(SMTP_PORT)
+            if not (1 <= port <= 65535):
+                raise ValueError
+        except ValueError:
+            error = "invalid port number in SMTP_PORT"
+
+    if not error and (not email_re.search(str(SENDER_EMAIL)) or not email_re.search(str(RECEIVER_EMAIL))):
+        error = "invalid email in SENDER_EMAIL or RECEIVER_EMAIL"
+
+    if not error and (not SMTP_USER or not isinstance(SMTP_USER, str) or SMTP_USER == "your_smtp_user" or not SMTP_PASSWORD or not isinstance(SMTP_PASSWORD, str) or SMTP_PASSWORD == "your_smtp_password"):
+        error = "check SMTP_USER & SMTP_PASSWORD variables"
+
+    smtp_settings_error = error
+    return error
+
+
+# Reusable SMTP connection, health-checked with NOOP and re-established when the server drops it
+class SMTPSession(object):
+    def __init__(self):
+        self.conn = None
+        self.use_ssl = None
+        self.last_used = 0.0
+        self.lock = threading.Lock()
+
+    def send(self, message, use_ssl, timeout):
+        with self.lock:
+            if self.conn is not None and (self.use_ssl != use_ssl or not self._is_alive()):
+                self._close()
+
+            if self.conn is None:
+                self._connect(use_ssl, timeout)
+
+            import smtplib
+            try:
+                self.conn.sendmail(SENDER_EMAIL, RECEIVER_EMAIL, message)
+            except smtplib.SMTPServerDisconnected:
+                self._close()
+                self._connect(use_ssl, timeout)
+                self.conn.sendmail(SENDER_EMAIL, RECEIVER_EMAIL, message)
+
+            self.last_used = time.monotonic()
+
+    # Closes the connection if it would sit idle for longer than idle_timeout (expected_idle = time until next use)
+    def close_idle(self, idle_timeout, expected_idle=0):
+        with self.lock:
+            if self.conn is not None and time.monotonic() - self.last_used + expected_idle >= idle_timeout:
+                self._close()
+
+    def close(self):
+        with self.lock:
+            self._close()
+
+    def _connect(self, use_ssl, timeout):
+        import smtplib
+        import ssl
+        conn = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=timeout)
+        try:
+            if use_ssl:
+                conn.starttls(context=ssl.create_default_context())
+            conn.login(SMTP_USER, SMTP_PASSWORD)
+        except Exception:
+            conn.close()
+            raise
+        self.conn = conn
+        self.use_ssl = use_ssl
+        self.last_used = time.monotonic()
+
+    def _is_alive(self):
+        if time.monotonic() - self.last_used < SMTP_NOOP_AFTER:
+            return True
+        try:
+            return self.conn.noop()[0] == 250
+        except Exception:
+            return False
+
+    def _close(self):
+        if self.conn is None:
+            return
+        try:
+            self.conn.quit()
+        except Exception:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+        self.conn = None
+
+
+smtp_session = SMTPSession()
+atexit.register(smtp_session.close)
+
+
+# Sends email notification
+def send_email(subject, body, body_html, use_ssl, smtp_timeout=15):
+    settings_error = smtp_settings_error if smtp_settings_error is not None else validate_smtp_settings()
+    if settings_error:
+        print(f"Error sending email - SMTP settings are incorrect ({settings_error})")
+        return 1
+
+    if not subject or not isinstance(subject, str):
+        print("Error sending email - SMTP settings are incorrect (subject is not a string or is empty)")
+        return 1
+
+    if not body and not body_html:
+        print("Error sending email - SMTP settings are incorrect (body and body_html cannot be empty at the same time)")
+        return 1
+
+    from email.header import Header
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
+    try:
+        email_msg = MIMEMultipart('alternative')
+        email_msg["From"] = SENDER_EMAIL
+        email_msg["To"] = RECEIVER_EMAIL
+        email_msg["Subject"] = str(Header(subject, 'utf-8'))
+
+        if body:
+            part1 = MIMEText(body.encode('utf-8'), 'plain', _charset='utf-8')
+            email_msg.attach(part1)
+
+        if body_html:
+            part2 = MIMEText(body_html.encode('utf-8'), 'html', _charset='utf-8')
+            email_msg.attach(part2)
+
+        smtp_session.send(email_msg.as_string(), use_ssl, smtp_timeout)
+        if not SMTP_IDLE_TIMEOUT:
+            smtp_session.close()
+    except Exception as e:
+        smtp_session.close()
+        print(f"Error sending email: {e}")
+        return 1
+    return 0
+
+
+# Background delivery of notifications (email, webhook) with retries, exponential backoff and dead-lettering
+class NotificationQueue(object):
+    def __init__(self, max_pending, retries, backoff, dead_letter_file):
+        self.queue = queue.Queue(maxsize=max(1, max_pending))
+        self.retries = max(1, retries)
+        self.backoff = backoff
+        self.dead_letter_file = dead_letter_file
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name="notify-worker", daemon=True)
+        self.thread.start()
+
+    def submit(self, item):
+        item.setdefault("ts", datetime.now(timezone.utc).isoformat())
+        if self.stopping.is_set():
+            self._dead_letter(item)
+            return
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            print(f"* Warning: notification queue is full ({self.queue.maxsize} pending), not sending '{item['subject']}'")
+            self._dead_letter(item)
+
+    # Gives pending notifications up to timeout seconds to be delivered, dead-letters the rest
+    def close(self, timeout=NOTIFY_DRAIN_TIMEOUT):
+        if self.stopping.is_set():
+            return
+        self.stopping.set()
+        self.thread.join(timeout)
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
                 break
+            self._dead_letter(item)
+
+    def _run(self):
+        while True:
+            try:
+                item = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                if self.stopping.is_set():
+                    return
+                continue
+            self._deliver(item)
+
+    def _deliver(self, item):
+        delay = self.backoff
+        for attempt in range(1, self.retries + 1):
+            delivered = deliver_notification(item)
+            if delivered:
+                return
+            # None means retrying cannot help (e.g. invalid SMTP settings)
+            if delivered is None or attempt == self.retries or self.stopping.is_set():
+                break
+            if self.stopping.wait(delay):
+                break
+            delay *= 2
+        self._dead_letter(item)
+
+    def _dead_letter(self, item):
+        metrics.inc("github_monitor_notifications_dead_lettered_total")
+        if not self.dead_letter_file:
+            print(f"* Notification '{item['subject']}' could not be delivered and was discarded")
+            return
+        try:
+            with self.lock:
+                with open(self.dead_letter_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            print(f"* Notification '{item['subject']}' could not be delivered, saved to {self.dead_letter_file}")
+        except Exception as e:
+            print(f"* Error: cannot write undelivered notification to {self.dead_letter_file}: {e}")
+
+
+# Delivers a single notification item through the sink it belongs to, returns True on success, False on a failure
+# worth retrying and None on a permanent one
+def deliver_notification(item):
+    sink = notification_sinks.get(item.get("sink", "email"))
+    if sink is None:
+        print(f"* Error: notification sink '{item.get('sink')}' is not configured")
+        return None
+    return sink.deliver(item)
+
+
+# Hands notification item over to the background queue (delivers it inline if the notification queue is disabled)
+def dispatch_notification(item):
+    if notification_queue is not None:
+        notification_queue.submit(item)
+    else:
+        deliver_notification(item)
+
+
+# Notifications collected for the next digest email (see flush_digest)
+digest_entries = []
+digest_lock = threading.Lock()
+digest_last_sent = int(time.time())
+
+
+# Email sink; in digest mode notifications are collected for the next digest email (errors are always sent right away)
+class EmailSink(object):
+    def __init__(self):
+        self.settings_error_reported = False
+
+    def emit(self, record):
+        if DIGEST_MODE and record["type"] != "error":
+            with digest_lock:
+                digest_entries.append((record["subject"], record["body"], record["body_html"]))
+                pending = len(digest_entries)
+            print(f"Email notification queued for digest ({pending} pending)")
+            return
+        print(f"Sending email notification to {RECEIVER_EMAIL}")
+        self.send(record["subject"], record["body"], record["body_html"], record["use_ssl"])
+
+    def send(self, subject, body, body_html, use_ssl):
+        dispatch_notification({"sink": "email", "subject": subject, "body": body, "body_html": body_html, "use_ssl": use_ssl})
+
+    # Invalid SMTP settings never fix themselves, so such emails are not retried and the error is reported only once
+    def deliver(self, item):
+        settings_error = smtp_settings_error if smtp_settings_error is not None else validate_smtp_settings()
+        if settings_error:
+            metrics.inc("github_monitor_emails_failed_total")
+            if not self.settings_error_reported:
+                print(f"Error sending email - SMTP settings are incorrect ({settings_error}), emails are not sent")
+                self.settings_error_reported = True
+            return None
+        sent = send_email(item["subject"], item["body"], item["body_html"], item["use_ssl"]) == 0
+        metrics.inc("github_monitor_emails_sent_total" if sent else "github_monitor_emails_failed_total")
+        return sent
+
+    def flush(self, force=False):
+        flush_digest(history_user, force)
+
+
+# HTTP webhook sink; notifications are POSTed as a JSON array in batches over a reused connection (errors are sent
+# right away with whatever is pending, as the check cycle they come from may not get to the end-of-cycle flush)
+class WebhookSink(object):
+    def __init__(self, url, batch_size=50, headers=None, timeout=WEBHOOK_TIMEOUT):
+        self.url = url
+        self.batch_size = max(1, int(batch_size or 1))
+        self.timeout = timeout
+        self.session = req.Session()
+        self.session.headers.update(headers or {})
+        self.pending = []
+        self.lock = threading.Lock()
+
+    def emit(self, record):
+        with self.lock:
+            self.pending.append({field: record[field] for field in NOTIFY_RECORD_FIELDS})
+            send_now = len(self.pending) >= self.batch_size or record["type"] == "error"
+        if send_now:
+            self.flush()
+
+    def flush(self, force=False):
+        with self.lock:
+            batch, self.pending = self.pending, []
+        if batch:
+            dispatch_notification({"sink": "webhook", "subject": f"webhook batch of {len(batch)} notification(s)", "records": batch})
+
+    def deliver(self, item):
+        try:
+            response = self.session.post(self.url, json=item["records"], timeout=self.timeout)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Error sending webhook notification: {e}")
+            return False
+        return True
 
-    lines = event_text.split('\n')
-    html_lines = []
 
-    commit_message_style = (
-        "background-color: #f8f8f8; padding: 3px 3px; border-radius: 4px; font-size: 1.00em;"
+# JSON lines sink writing every notification to a Unix stream socket ('unix:/path') or a file / named pipe
+class JSONLinesSink(object):
+    def __init__(self, target):
+        self.target = target
+        self.sock = None
+        self.lock = threading.Lock()
+
+    def emit(self, record):
+        line = json.dumps({field: record[field] for field in NOTIFY_RECORD_FIELDS}, ensure_ascii=False) + "\n"
+        with self.lock:
+            try:
+                self._write(line)
+            except OSError:
+                # The socket reader might have been restarted, reconnect once
+                self._close_socket()
+                try:
+                    self._write(line)
+                except Exception as e:
+                    self._close_socket()
+                    print(f"* Error: cannot write notification to {self.target}: {e}")
+            except Exception as e:
+                print(f"* Error: cannot write notification to {self.target}: {e}")
+
+    def flush(self, force=False):
+        if force:
+            with self.lock:
+                self._close_socket()
+
+    def _write(self, line):
+        if self.target.startswith("unix:"):
+            if self.sock is None:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(5)
+                sock.connect(self.target[5:])
+                self.sock = sock
+            self.sock.sendall(line.encode("utf-8"))
+        else:
+            with open(self.target, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def _close_socket(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except Exception:
+                pass
+            self.sock = None
+
+
+notification_sinks = {}
+notification_routes = {}
+
+
+# Creates configured notification sinks and resolves NOTIFY_ROUTES per change type, returns names of active sinks
+def init_notification_sinks(email_enabled):
+    global notification_sinks, notification_routes
+
+    sinks = {}
+    if email_enabled:
+        sinks["email"] = EmailSink()
+    if WEBHOOK_URL:
+        sinks["webhook"] = WebhookSink(WEBHOOK_URL, WEBHOOK_BATCH_SIZE, WEBHOOK_HEADERS)
+    if NOTIFY_JSONL_TARGET:
+        if NOTIFY_JSONL_TARGET in ("-", "/dev/stdout"):
+            raise RuntimeError("NOTIFY_JSONL_TARGET cannot be standard output as the console output goes there, use a file, named pipe or 'unix:/path' socket")
+        sinks["jsonl"] = JSONLinesSink(NOTIFY_JSONL_TARGET)
+
+    referenced = set()
+    for change_type, names in NOTIFY_ROUTES.items():
+        if change_type != "default" and change_type not in NOTIFY_CHANGE_TYPES:
+            raise RuntimeError(f"Unknown change type '{change_type}' in NOTIFY_ROUTES (valid: default, {', '.join(NOTIFY_CHANGE_TYPES)})")
+        for name in names:
+            if name not in ("email", "webhook", "jsonl"):
+                raise RuntimeError(f"Unknown notification sink '{name}' in NOTIFY_ROUTES (valid: email, webhook, jsonl)")
+            if name == "webhook" and not WEBHOOK_URL:
+                raise RuntimeError("NOTIFY_ROUTES uses the webhook sink, but WEBHOOK_URL is not set")
+            if name == "jsonl" and not NOTIFY_JSONL_TARGET:
+                raise RuntimeError("NOTIFY_ROUTES uses the jsonl sink, but NOTIFY_JSONL_TARGET is not set")
+        referenced.update(names)
+
+    # Sinks not mentioned in NOTIFY_ROUTES receive all change types
+    unrouted = [name for name in sinks if name not in referenced]
+
+    routes = {}
+    for change_type in NOTIFY_CHANGE_TYPES:
+        names = list(NOTIFY_ROUTES.get(change_type, NOTIFY_ROUTES.get("default", []))) + unrouted
+        routes[change_type] = [sinks[name] for name in dict.fromkeys(names) if name in sinks]
+
+    notification_sinks = sinks
+    notification_routes = routes
+    return list(sinks)
+
+
+# Sends notification of the given change type (see NOTIFY_CHANGE_TYPES) to all sinks it is routed to
+def notify(subject, body, body_html, use_ssl, change_type):
+    record = {"ts": datetime.now(timezone.utc).isoformat(), "user": history_user, "type": change_type, "subject": subject, "body": body, "body_html": body_html, "use_ssl": use_ssl}
+    for sink in notification_routes.get(change_type, []):
+        sink.emit(record)
+
+
+# Flushes batched notifications of all sinks (force=True also sends a pending digest regardless of DIGEST_INTERVAL)
+def flush_notification_sinks(force=False):
+    for sink in list(notification_sinks.values()):
+        try:
+            sink.flush(force)
+        except Exception as e:
+            print(f"* Error flushing notifications: {e}")
+
+
+# Renders collected notifications as a single digest email, returns (subject, body, body_html)
+def render_digest(user, entries, since_ts):
+    count = len(entries)
+    subject = f"GitHub user {user}: {count} change{'s' if count != 1 else ''}"
+    period = get_range_of_dates_from_tss(since_ts, int(time.time()), short=True)
+
+    body = f"{count} notification{'s' if count != 1 else ''} for GitHub user {user} ({period}):\n\n"
+    body += "".join(f"- {entry_subject}\n" for entry_subject, _, _ in entries)
+
+    body_html = (
+        f"<html><head></head><body>"
+        f"<b>{count}</b> notification{'s' if count != 1 else ''} for GitHub user <b>{html.escape(user)}</b> ({html.escape(period)}):<br><ul>"
+        + "".join(f"<li>{html.escape(entry_subject)}</li>" for entry_subject, _, _ in entries)
+        + "</ul>"
     )
 
-    def style_commit_html(message_html):
-        if not message_html:
-            return ""
-        return f'<span style="{commit_message_style}">{message_html}</span>'
-
-    def remove_closing_quote(text):
-        idx = text.rfind("'")
-        if idx == -1:
-            return text
-        return text[:idx] + text[idx + 1:]
-
-    def extract_quoted_message(start_index, initial_fragment):
-        fragments = []
-
-        fragment = initial_fragment
-        if fragment:
-            fragment_stripped = fragment.rstrip()
-            if fragment_stripped.endswith("'"):
-                fragments.append(remove_closing_quote(fragment))
-                return '\n'.join(fragments), start_index + 1
-            fragments.append(fragment)
-        idx = start_index + 1
-
-        while idx < len(lines):
-            current_line = lines[idx]
-            stripped = current_line.strip()
-            if stripped.endswith("'") and (stripped == "'" or not stripped.startswith("'")):
-                fragments.append(remove_closing_quote(current_line))
-                idx += 1
-                break
-            else:
-                fragments.append(current_line)
-                idx += 1
-
-        return '\n'.join(fragments), idx
-
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-
-        if "Release notes:" in line:
-            if event_payload and event_payload.get("release"):
-                release_body = event_payload["release"].get("body", "")
-                if release_body:
-                    release_html = markdown_to_html(release_body, convert_line_breaks=True, repo_url=repo_url)
-                    prefix = line.split("Release notes:")[0].replace('\t', ' ')
-                    html_lines.append(f"{html.escape(prefix)}<b>Release notes:</b><br><br>'{release_html}'")
-                    i += 1
-                    # Skip all lines until we find the closing quote (end of release notes in plaintext)
-                    while i < len(lines):
-                        if lines[i].strip().endswith("'") and not lines[i].strip().startswith("'"):
-                            i += 1
-                            break
-                        i += 1
-                    continue
+    for entry_subject, entry_body, entry_body_html in entries:
+        body += f"\n{'─' * HORIZONTAL_LINE2}\n{entry_subject}\n\n{entry_body.strip()}\n"
+        if entry_body_html:
+            match = re.search(r'<body>(.*)</body>', entry_body_html, re.DOTALL)
+            entry_html = match.group(1) if match else entry_body_html
+        else:
+            entry_html = html.escape(entry_body.strip()).replace("\n", "<br>")
+        body_html += f"<hr><b>{html.escape(entry_subject)}</b><br><br>{entry_html}"
 
-        if "Commit message:" in line or "- Commit message:" in line or "Commit full message:" in line or "- Commit full message:" in line:
-            if ("Commit full message:" in line or "- Commit full message:" in line) and "'" not in line:
-                prefix = line.replace('\t', ' ').strip()
-                is_dash_variant = "- Commit full message:" in prefix
-                if is_dash_variant:
-                    prefix_clean = prefix.split("- Commit full message:")[0]
-                    label_html = "<b>- Commit full message:</b>"
-                else:
-                    prefix_clean = prefix.split("Commit full message:")[0]
-                    label_html = "<b>Commit full message:</b>"
-                i += 1
-
-                while i < len(lines) and not lines[i].strip():
-                    i += 1
-
-                if i < len(lines) and "'" in lines[i]:
-                    message_line = lines[i]
-                    parts = message_line.split("'", 1)
-                    if len(parts) > 1:
-                        message_text, next_index = extract_quoted_message(i, parts[1])
-                        message_html = markdown_to_html(message_text, convert_line_breaks=True, repo_url=repo_url)
-                        styled_message = style_commit_html(message_html)
-                        html_lines.append(f"{html.escape(prefix_clean)}{label_html}<br><br>'{styled_message}'")
-                        i = next_index
-                        continue
-            elif "'" in line:
-                parts = line.split("'", 1)
-                if len(parts) > 1:
-                    prefix = parts[0].replace('\t', ' ')
-                    message_text, next_index = extract_quoted_message(i, parts[1])
-                    message_html = markdown_to_html(message_text, convert_line_breaks=True, repo_url=repo_url)
-                    styled_message = style_commit_html(message_html)
-
-                    if "- Commit full message:" in prefix:
-                        prefix_clean = prefix.split("- Commit full message:")[0]
-                        html_lines.append(f"{html.escape(prefix_clean)}<b>- Commit full message:</b><br><br>'{styled_message}'")
-                    elif "Commit full message:" in prefix:
-                        prefix_clean = prefix.split("Commit full message:")[0]
-                        html_lines.append(f"{html.escape(prefix_clean)}<b>Commit full message:</b><br><br>'{styled_message}'")
-                    elif "- Commit message:" in prefix:
-                        prefix_clean = prefix.split("- Commit message:")[0]
-                        html_lines.append(f"{html.escape(prefix_clean)}<b>- Commit message:</b> {styled_message}")
-                    else:
-                        prefix_clean = prefix.split("Commit message:")[0]
-                        html_lines.append(f"{html.escape(prefix_clean)}<b>Commit message:</b> {styled_message}")
-                    i = next_index
-                    continue
-        if "PR description:" in line:
-            # Case 1: label and description on the same line
-            if "'" in line:
-                parts = line.split("'", 1)
-                if len(parts) > 1:
-                    prefix = parts[0].replace('\t', ' ')
-                    description = parts[1]
-                    if description.endswith("'"):
-                        description = description.rstrip("'")
-                        description_html = markdown_to_html(description, convert_line_breaks=True, repo_url=repo_url)
-                        html_lines.append(f"{html.escape(prefix)}<b>PR description:</b> '{description_html}'")
-                    else:
-                        description_lines = [description]
-                        i += 1
-                        while i < len(lines) and not lines[i].strip().endswith("'"):
-                            description_lines.append(lines[i])
-                            i += 1
-                        if i < len(lines):
-                            description_lines.append(lines[i].rstrip("'"))
-                        description = '\n'.join(description_lines)
-                        description_html = markdown_to_html(description, convert_line_breaks=True, repo_url=repo_url)
-                        html_lines.append(f"{html.escape(prefix)}<b>PR description:</b> '{description_html}'")
-                    i += 1
-                    continue
-            else:
-                # Case 2: label on its own line, description in following quoted block
-                prefix = line.split("PR description:")[0].replace('\t', ' ')
-                i += 1
-                # Skip empty lines
-                while i < len(lines) and not lines[i].strip():
-                    i += 1
-                if i < len(lines) and "'" in lines[i]:
-                    first = lines[i]
-                    parts = first.split("'", 1)
-                    if len(parts) > 1:
-                        description_text, next_index = extract_quoted_message(i, parts[1])
-                        description_html = markdown_to_html(description_text, convert_line_breaks=True, repo_url=repo_url)
-                        html_lines.append(f"{html.escape(prefix)}<b>PR description:</b><br><br>'{description_html}'")
-                        i = next_index
-                        continue
+    body += get_cur_ts(nl_ch + "Timestamp: ")
+    body_html += f"<hr>{get_cur_ts('Timestamp: ')}</body></html>"
+    return subject, body, body_html
 
-        # Handle body-like blocks, bolding the label and interpreting markdown inside the quoted body
-        body_keyword_matched = False
-
-        # Special handling for "Previous comment:" which has an intermediate "↳ In reply to..." line
-        if "Previous comment:" in line:
-            line_stripped = line.strip()
-            if line_stripped == "Previous comment:" or line_stripped.startswith("Previous comment:"):
-                prefix = line.split("Previous comment:")[0].replace('\t', ' ')
-                i += 1
-
-                # Skip blank lines
-                while i < len(lines) and not lines[i].strip():
-                    i += 1
-
-                # Collect all non-empty lines until we hit the quoted body
-                reply_lines = []
-                while i < len(lines) and not (lines[i].strip().startswith("'") or (lines[i] and lines[i][0] in [' ', '\t'] and "'" in lines[i])):
-                    if lines[i].strip():  # Only collect non-empty lines
-                        reply_lines.append(lines[i].strip())
-                    i += 1
-
-                # Skip blank lines before body
-                while i < len(lines) and not lines[i].strip():
-                    i += 1
-
-                # Now look for the quoted body
-                if i < len(lines) and "'" in lines[i]:
-                    first = lines[i]
-                    parts = first.split("'", 1)
-                    if len(parts) > 1:
-                        body_text, next_index = extract_quoted_message(i, parts[1])
-                        body_html = markdown_to_html(body_text, convert_line_breaks=True, repo_url=repo_url)
-                        # Build the output with reply lines if present
-                        if reply_lines:
-                            reply_html = "<br>".join(html.escape(rl) for rl in reply_lines)
-                            html_lines.append(f"{html.escape(prefix)}<b>Previous comment:</b><br><br>{reply_html}<br><br>'{body_html}'")
-                        else:
-                            html_lines.append(f"{html.escape(prefix)}<b>Previous comment:</b><br><br>'{body_html}'")
-                        i = next_index
-                        body_keyword_matched = True
-
-        # Handle other body keywords (Issue body, Comment body, Review body)
-        if not body_keyword_matched:
-            for keyword in ["Issue body:", "Comment body:", "Review body:"]:
-                if keyword in line:
-                    # Case 1: label and body on the same line
-                    if "'" in line and line.strip().startswith(keyword):
-                        parts = line.split("'", 1)
-                        if len(parts) > 1:
-                            prefix = parts[0].replace('\t', ' ')
-                            body_content = parts[1]
-                            if body_content.endswith("'"):
-                                body_content = body_content.rstrip("'")
-                                body_html = markdown_to_html(body_content, convert_line_breaks=True, repo_url=repo_url)
-                                html_lines.append(f"{html.escape(prefix)}<b>{html.escape(keyword)}</b> '{body_html}'")
-                                i += 1
-                                body_keyword_matched = True
-                                break
 
-                    # Case 2: label on its own line, body in a following quoted block
-                    if line.strip().startswith(keyword):
-                        prefix = line.split(keyword)[0].replace('\t', ' ')
-                        i += 1
-
-                        # Skip blank lines
-                        while i < len(lines) and not lines[i].strip():
-                            i += 1
-
-                        # Look for the first line that starts the quoted body
-                        if i < len(lines) and "'" in lines[i]:
-                            first = lines[i]
-                            parts = first.split("'", 1)
-                            if len(parts) > 1:
-                                body_text, next_index = extract_quoted_message(i, parts[1])
-                                body_html = markdown_to_html(body_text, convert_line_breaks=True, repo_url=repo_url)
-                                html_lines.append(f"{html.escape(prefix)}<b>{html.escape(keyword)}</b><br><br>'{body_html}'")
-                                i = next_index
-                                body_keyword_matched = True
-                                break
+# Sends collected notifications as one digest email once DIGEST_INTERVAL has elapsed (or right away if force=True)
+def flush_digest(user, force=False):
+    global digest_last_sent
 
-        if body_keyword_matched:
-            continue
+    now = int(time.time())
+    with digest_lock:
+        if not digest_entries or (not force and DIGEST_INTERVAL and now - digest_last_sent < DIGEST_INTERVAL):
+            return
+        entries = digest_entries[:]
+        digest_entries.clear()
+    since_ts = digest_last_sent
+    digest_last_sent = now
+
+    subject, body, body_html = render_digest(user, entries, since_ts)
+    print(f"Sending digest email notification ({len(entries)} changes) to {RECEIVER_EMAIL}")
+    EmailSink().send(subject, body, body_html, SMTP_SSL)
+
+
+# Buffered CSV sink keeping the file open and appending rows in batches
+# Batches are written under an exclusive file lock (where available), so several monitored users can share one file
+class CSVWriter(object):
+    def __init__(self, filename, flush_rows=500, fsync=False):
+        self.filename = filename
+        self.flush_rows = max(1, int(flush_rows or 1))
+        self.fsync = fsync
+        self.file = open(filename, 'a', newline='', encoding="utf-8")
+        self.buffer = io.StringIO()
+        self.writer = csv.DictWriter(self.buffer, fieldnames=csvfieldnames, quoting=csv.QUOTE_NONNUMERIC)
+        self.pending = 0
+        self.lock = threading.Lock()
+
+    def write_header(self):
+        header = io.StringIO()
+        csv.DictWriter(header, fieldnames=csvfieldnames, quoting=csv.QUOTE_NONNUMERIC).writeheader()
+        with self.lock:
+            self._append(header.getvalue(), only_if_empty=True)
+
+    def writerow(self, row):
+        with self.lock:
+            self.writer.writerow(row)
+            self.pending += 1
+            if self.pending >= self.flush_rows:
+                self._flush()
 
-        line_no_tabs = line.replace('\t', ' ').strip()
+    def flush(self):
+        with self.lock:
+            self._flush()
 
-        if not line_no_tabs:
-            html_lines.append('')
-            i += 1
-            continue
+    def close(self):
+        with self.lock:
+            try:
+                self._flush()
+            finally:
+                self.file.close()
 
-        # Check for PR header BEFORE key-value pattern (PR headers match key-value pattern)
-        if line_no_tabs.startswith('===') and line_no_tabs.endswith('==='):
-            pr_match = re.match(r'^=== PR #(\d+): (.+?) ===$', line_no_tabs)
-            if pr_match:
-                pr_number = pr_match.group(1)
-                pr_title = pr_match.group(2)
-                # Convert markdown in PR title (e.g., **bold**, *italic*)
-                pr_title_html = markdown_to_html(pr_title, convert_line_breaks=False, repo_url=repo_url)
-                html_lines.append(f'=== PR #{pr_number}: <b>{pr_title_html}</b> ===')
-                i += 1
-                continue
+    def _flush(self):
+        if not self.pending:
+            return
+        self._append(self.buffer.getvalue())
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        self.pending = 0
+
+    def _append(self, data, only_if_empty=False):
+        fd = self.file.fileno()
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if only_if_empty and os.fstat(fd).st_size > 0:
+                return
+            self.file.write(data)
+            self.file.flush()
+            if self.fsync:
+                os.fsync(fd)
+        finally:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+# Returns the shared CSV sink for the file, opening it on first use
+def get_csv_writer(csv_file_name):
+    writer = csv_writers.get(csv_file_name)
+    if writer is None:
+        writer = CSVWriter(csv_file_name, flush_rows=CSV_FLUSH_ROWS, fsync=CSV_FSYNC)
+        csv_writers[csv_file_name] = writer
+    return writer
+
+
+# Writes all buffered CSV rows to disk (called at the end of every check cycle)
+def flush_csv_entries():
+    for writer in list(csv_writers.values()):
+        try:
+            writer.flush()
+        except Exception as e:
+            print(f"* Error: Failed to write to CSV file '{writer.filename}': {e}")
+
+
+# Flushes and closes all CSV sinks (registered with atexit, so it also runs on Ctrl+C / SIGTERM)
+def close_csv_writers():
+    while csv_writers:
+        _, writer = csv_writers.popitem()
+        try:
+            writer.close()
+        except Exception as e:
+            print(f"* Error: Failed to write to CSV file '{writer.filename}': {e}")
+
+
+atexit.register(close_csv_writers)
 
-        key_value_pattern = r'^(.+?):\s+(.+)$'
-        match = re.match(key_value_pattern, line_no_tabs)
 
-        if match:
-            label = match.group(1)
-            value = match.group(2)
-            label_html = f"<b>{html.escape(label)}:</b>"
+# Initializes the CSV file
+def init_csv_file(csv_file_name):
+    try:
+        get_csv_writer(csv_file_name).write_header()
+    except Exception as e:
+        raise RuntimeError(f"Could not initialize CSV file '{csv_file_name}': {e}")
+
 
-            # Remove apostrophes from Description field
-            if label.strip() == "Description" and value.startswith("'") and value.endswith("'"):
-                value = value[1:-1]  # Remove first and last character (apostrophes)
+# Writes CSV entry (buffered, see CSV_FLUSH_ROWS)
+def write_csv_entry(csv_file_name, timestamp, object_type, object_name, old, new):
+    try:
+        get_csv_writer(csv_file_name).writerow({'Date': timestamp, 'Type': object_type, 'Name': object_name, 'Old': old, 'New': new})
+    except Exception as e:
+        raise RuntimeError(f"Failed to write to CSV file '{csv_file_name}': {e}")
 
-            # Check if this is a date field that should be highlighted
-            date_labels = ['Event date', '- Commit date', 'Created at', 'Closed at', 'Merged at', 'Published at',
-                           'Issue date', 'Comment date', 'Review submitted at']
-            is_date_label = any(label.strip() == date_label or label.strip().endswith(date_label) for date_label in date_labels)
 
-            # Check if this is an identifier field that should not get markdown conversion
-            # These fields contain identifiers (repo names, file names, etc.) that should be escaped, not markdown-processed
-            identifier_labels = ['Repo name', 'Asset name', 'Branch name', 'Tag name', 'File name', 'Release tag name']
-            is_identifier_label = any(label.strip() == identifier_label or label.strip().endswith(identifier_label) for identifier_label in identifier_labels)
+# Buffered writer of the compressed, partitioned change history (see HISTORY_DIR and HISTORY_FORMAT)
+class HistoryWriter(object):
+    def __init__(self, history_dir, user, fmt="jsonl"):
+        self.history_dir = Path(history_dir)
+        self.user = user
+        self.fmt = fmt
+        self.records = []
+        self.lock = threading.Lock()
 
-            if value.startswith('http://') or value.startswith('https://'):
-                escaped_url = html.escape(value)
-                html_lines.append(f"{label_html} <a href=\"{escaped_url}\">{escaped_url}</a>")
+    def write(self, record):
+        with self.lock:
+            self.records.append(record)
+
+    def flush(self):
+        with self.lock:
+            records, self.records = self.records, []
+        if not records:
+            return
+
+        records_by_day = {}
+        for record in records:
+            records_by_day.setdefault(record["ts"].strftime("%Y-%m-%d"), []).append(record)
+
+        for day, day_records in records_by_day.items():
+            part_dir = self.history_dir / f"user={self.user}" / f"date={day}"
+            part_dir.mkdir(parents=True, exist_ok=True)
+            if self.fmt == "parquet":
+                self._write_parquet(part_dir, day_records)
             else:
-                # Apply date styling if applicable
-                if is_date_label:
-                    # Check if value contains " by " (e.g., "Merged at: ... by username")
-                    if ' by ' in value:
-                        date_part, by_part = value.split(' by ', 1)
-                        value_to_style = html.escape(date_part)
-                        suffix = html.escape(' by ' + by_part)
-                    else:
-                        value_to_style = html.escape(value)
-                        suffix = ''
-
-                    # Bold only the time duration part (e.g., "2 hours, 27 minutes"), not "after"
-                    value_html = re.sub(
-                        r'\(after\s+([^:]+):\s+([^)]+)\)',
-                        r'(after <b>\1</b>: \2)',
-                        value_to_style
-                    )
-
-                    date_message_style = (
-                        "background-color: #f0f0f0; padding: 2px 4px; border-radius: 3px; font-family: monospace; font-size: 1.00em;"
-                    )
-
-                    value_html = f'<span style="{date_message_style}">{value_html}</span>{suffix}'
-                elif is_identifier_label:
-                    value_html = html.escape(value)
-                else:
-                    # Non-date, non-identifier values get markdown + URL conversion
-                    value_html = markdown_to_html(value, convert_line_breaks=False, repo_url=repo_url)
-                    value_html = convert_urls_to_links(value_html)
+                self._write_jsonl(part_dir / f"{day}.jsonl.gz", day_records)
+
+    # Every flush appends a new gzip member, concatenated members form a valid gzip stream
+    def _write_jsonl(self, path, records):
+        lines = []
+        for record in records:
+            record = dict(record, ts=record["ts"].isoformat())
+            lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+        data = gzip.compress("".join(lines).encode("utf-8"))
+
+        with open(path, "ab") as f:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                f.write(data)
+            finally:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    # Parquet files cannot be appended to, so every flush writes a new part file
+    def _write_parquet(self, part_dir, records):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            ("ts", pa.timestamp("us", tz="UTC")),
+            ("user", pa.string()),
+            ("type", pa.string()),
+            ("name", pa.string()),
+            ("old", pa.string()),
+            ("new", pa.string()),
+            ("count_old", pa.int64()),
+            ("count_new", pa.int64()),
+            ("event_id", pa.string()),
+            ("repo_id", pa.int64()),
+            ("actor", pa.string()),
+        ])
+        table = pa.Table.from_pylist(records, schema=schema)
+        pq.write_table(table, part_dir / f"part-{int(time.time() * 1000)}-{os.getpid()}.parquet", compression="zstd")
+
+
+# Indexed SQLite change log; rows are buffered and inserted in one transaction per flush (WAL mode)
+class SQLiteWriter(object):
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS changes (
+        id INTEGER PRIMARY KEY,
+        ts TEXT NOT NULL,
+        user TEXT,
+        type TEXT NOT NULL,
+        name TEXT,
+        old TEXT,
+        new TEXT,
+        count_old INTEGER,
+        count_new INTEGER,
+        event_id TEXT,
+        repo_id INTEGER,
+        actor TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_changes_user_type_ts ON changes (user, type, ts);
+    CREATE INDEX IF NOT EXISTS idx_changes_type_name_ts ON changes (type, name, ts);
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.rows = []
+        self.lock = threading.Lock()
+        import sqlite3
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+
+    def write(self, record):
+        # Timestamps are stored in UTC ('YYYY-MM-DD HH:MM:SS'), so they compare correctly with SQLite's datetime()
+        ts = record["ts"].astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        with self.lock:
+            self.rows.append((ts, record["user"], record["type"], record["name"], record["old"], record["new"], record["count_old"], record["count_new"], record["event_id"], record["repo_id"], record["actor"]))
+
+    # Rows of a failed transaction (e.g. 'database is locked' with several tools sharing the database) are kept for the
+    # next flush
+    def flush(self):
+        with self.lock:
+            rows, self.rows = self.rows, []
+            if not rows:
+                return
+            try:
+                with self.conn:
+                    self.conn.executemany("INSERT INTO changes (ts, user, type, name, old, new, count_old, count_new, event_id, repo_id, actor) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            except Exception:
+                self.rows = rows + self.rows
+                raise
+
+
+# Searches the SQLite change log (--query); TYPE and optional NAME, e.g. 'Removed Stargazer' 'repo_x',
+# or a raw SQL query (SELECT / WITH, possibly after comments; the database is opened read-only)
+def github_query_changes(user, query_args, days):
+    load_pytz()
+    if not SQLITE_DB:
+        raise RuntimeError("SQLITE_DB (--sqlite-db) is not set")
+    if not os.path.isfile(SQLITE_DB):
+        raise RuntimeError(f"SQLite database '{SQLITE_DB}' does not exist")
+    if not query_args or len(query_args) > 2:
+        raise RuntimeError("--query expects TYPE [NAME] or a single SELECT / WITH statement")
+
+    import sqlite3
+    conn = sqlite3.connect(f"file:{SQLITE_DB}?mode=ro", uri=True)
+    started = time.perf_counter()
+
+    try:
+        if len(query_args) == 1 and re.match(r'\s*(?:(?:--[^\n]*(?:\n|$)|/\*.*?\*/)\s*)*(?:select|with)\b', query_args[0], re.IGNORECASE | re.DOTALL):
+            cursor = conn.execute(query_args[0])
+            columns = [c[0] for c in cursor.description]
+            rows = cursor.fetchall()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            print("\t".join(columns))
+            for row in rows:
+                print("\t".join("" if v is None else str(v) for v in row))
+            print(f"\n* {len(rows)} row{'s' if len(rows) != 1 else ''} in {elapsed_ms:.1f} ms")
+            return
+
+        sql = "SELECT ts, user, type, name, old, new, count_old, count_new, actor FROM changes WHERE type = ?"
+        params: list = [query_args[0]]
+        if len(query_args) == 2:
+            sql += " AND name = ?"
+            params.append(query_args[1])
+        if user:
+            sql += " AND user = ?"
+            params.append(user)
+        if days:
+            sql += " AND ts >= datetime('now', ?)"
+            params.append(f"-{int(days)} days")
+        sql += " ORDER BY ts"
+
+        rows = conn.execute(sql, params).fetchall()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    finally:
+        conn.close()
+
+    print(f"* '{query_args[0]}' changes" + (f" for '{query_args[1]}'" if len(query_args) == 2 else "") + (f" (user {user})" if user else "") + (f" in the last {days} days" if days else "") + "\n")
+
+    for ts, row_user, object_type, name, old, new, count_old, count_new, actor in rows:
+        ts_local = get_date_from_ts(pytz.utc.localize(datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")))
+        old_str = count_old if count_old is not None else (old or "")
+        new_str = count_new if count_new is not None else (new or "")
+        change_str = f"{old_str} -> {new_str}" if old_str != "" and new_str != "" else f"{old_str}{new_str}"
+        print(f"{ts_local}\t{row_user}\t{name}\t{change_str}" + (f"\t(actor: {actor})" if actor else ""))
+
+    print(f"\n* {len(rows)} row{'s' if len(rows) != 1 else ''} in {elapsed_ms:.1f} ms")
+
+
+# Enables the change history sinks for the monitored user (HISTORY_DIR, SQLITE_DB)
+def init_history(user):
+    global history_writer, sqlite_writer, history_user
+
+    history_user = user
+
+    if HISTORY_DIR and history_writer is None:
+        history_writer = HistoryWriter(HISTORY_DIR, user, HISTORY_FORMAT)
+
+    if SQLITE_DB and sqlite_writer is None:
+        try:
+            sqlite_writer = SQLiteWriter(SQLITE_DB)
+        except Exception as e:
+            print(f"* Error: Cannot open SQLite database '{SQLITE_DB}': {e}")
+
+
+# Writes all buffered history entries to disk
+def flush_history_entries():
+    if history_writer is not None:
+        try:
+            history_writer.flush()
+        except Exception as e:
+            print(f"* Error: Failed to write history to '{HISTORY_DIR}': {e}")
+
+    if sqlite_writer is not None:
+        try:
+            sqlite_writer.flush()
+        except Exception as e:
+            print(f"* Error: Failed to write changes to SQLite database '{SQLITE_DB}': {e}")
+
 
-                html_lines.append(f"{label_html} {value_html}")
-        else:
-            section_headers = [
-                'Changed files list:', 'Removed files:', 'Added files:', 'Modified files:',
-                'Closed issues:', 'Opened issues:', 'Reopened issues:',
-                'Closed pull requests:', 'Opened pull requests:',
-                'Created tags:', 'Deleted tags:', 'Created branches:', 'Deleted branches:',
-                'Assets:',
-            ]
-
-            # Check if this is a separator line (dots)
-            if line_no_tabs and all(c == '.' for c in line_no_tabs):
-                html_lines.append('<hr style="border: none; border-top: 1px dotted #ccc; margin: 5px 0;">')
-                i += 1
-                # Skip next line if it's empty (to avoid double line break)
-                if i < len(lines) and not lines[i].strip():
-                    i += 1
-                continue
-            # Check if this line starts with === (commit separator - PR headers already handled above)
-            elif line_no_tabs.startswith('===') and line_no_tabs.endswith('==='):
-                # Commit separator - bold entire line
-                html_lines.append(f'<b>{html.escape(line_no_tabs)}</b>')
-                i += 1
-                continue
-            else:
-                # Protect quoted text (file names, strings) from markdown conversion
-                quoted_strings = []
-                temp_line = line_no_tabs
-
-                import re as re_module
-                quote_pattern = r"'([^']+)'"
-                for match in re_module.finditer(quote_pattern, temp_line):
-                    quoted_strings.append(match.group(1))
-
-                for idx, quoted_str in enumerate(quoted_strings):
-                    temp_line = temp_line.replace(f"'{quoted_str}'", f"__QUOTED_{idx}__", 1)
-
-                line_html = markdown_to_html(temp_line, convert_line_breaks=False, repo_url=repo_url)
-                line_html = convert_urls_to_links(line_html)
-
-                for idx, quoted_str in enumerate(quoted_strings):
-                    escaped_quoted = html.escape(quoted_str)
-                    line_html = line_html.replace(f"__QUOTED_{idx}__", f"'<i>{escaped_quoted}</i>'")
-
-                for header in section_headers:
-                    if header in line_no_tabs:
-                        escaped_header = html.escape(header)
-                        line_html = line_html.replace(escaped_header, f'<b>{escaped_header}</b>')
-                        break
-
-                html_lines.append(line_html)
-
-        i += 1
-
-    # Join with <br>, then remove <br> between special elements (commit headers, <hr>)
-    result = '<br>'.join(html_lines)
-    # Remove <br> between commit header and <hr>
-    result = re.sub(r'</b><br><hr', r'</b><hr', result)
-    # Remove <br> between <hr> and commit header (for multiple commits)
-    result = re.sub(r'(<hr[^>]*>)<br><b>===', r'\1<b>===', result)
-    # Remove <br> between <hr> and next element (including commit message label)
-    result = re.sub(r'(<hr[^>]*>)<br>\s*(<b>|</b>|<span)', r'\1\2', result)
-    return result
+atexit.register(flush_history_entries)
 
 
-# Sends email notification
-def send_email(subject, body, body_html, use_ssl, smtp_timeout=15):
-    fqdn_re = re.compile(r'(?=^.{4,253}$)(^((?!-)[a-zA-Z0-9-]{1,63}(?<!-)\.)+[a-zA-Z]{2,63}\.?$)')
-    email_re = re.compile(r'[^@]+@[^@]+\.[^@]+')
+# Converts a value logged as old/new into a history count (int) or text field
+def history_value(value):
+    if value is None or value == "":
+        return None, None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return None, value
+    if isinstance(value, datetime):
+        return value.isoformat(), None
+    return str(value), None
 
-    try:
-        ipaddress.ip_address(str(SMTP_HOST))
-    except ValueError:
-        if not fqdn_re.search(str(SMTP_HOST)):
-            print("Error sending email - SMTP settings are incorrect (invalid IP address/FQDN in SMTP_HOST)")
-            return 1
 
-    try:
-        port = int(SMTP_PORT)
-        if not (1 <= port <= 65535):
-            raise ValueError
-    except ValueError:
-        print("Error sending email - SMTP settings are incorrect (invalid port number in SMTP_PORT)")
-        return 1
+# Builds a typed change history record
+def history_record(timestamp, object_type, object_name, old, new, event_id=None, repo_id=None, actor=None):
+    load_pytz()
+    if isinstance(timestamp, datetime):
+        ts = timestamp if timestamp.tzinfo else pytz.timezone(LOCAL_TIMEZONE).localize(timestamp)
+    else:
+        ts = datetime.now(pytz.timezone(LOCAL_TIMEZONE))
+
+    old_text, count_old = history_value(old)
+    new_text, count_new = history_value(new)
+
+    return {
+        "ts": ts,
+        "user": history_user,
+        "type": object_type,
+        "name": str(object_name) if object_name is not None else None,
+        "old": old_text,
+        "new": new_text,
+        "count_old": count_old,
+        "count_new": count_new,
+        "event_id": str(event_id) if event_id else None,
+        "repo_id": int(repo_id) if repo_id else None,
+        "actor": actor or None,
+    }
 
-    if not email_re.search(str(SENDER_EMAIL)) or not email_re.search(str(RECEIVER_EMAIL)):
-        print("Error sending email - SMTP settings are incorrect (invalid email in SENDER_EMAIL or RECEIVER_EMAIL)")
-        return 1
 
-    if not SMTP_USER or not isinstance(SMTP_USER, str) or SMTP_USER == "your_smtp_user" or not SMTP_PASSWORD or not isinstance(SMTP_PASSWORD, str) or SMTP_PASSWORD == "your_smtp_password":
-        print("Error sending email - SMTP settings are incorrect (check SMTP_USER & SMTP_PASSWORD variables)")
-        return 1
+# Records a detected change in all enabled sinks (CSV file, change history)
+def record_change(csv_file_name, timestamp, object_type, object_name, old, new, event_id=None, repo_id=None, actor=None):
+    if csv_file_name:
+        write_csv_entry(csv_file_name, timestamp, object_type, object_name, old, new)
 
-    if not subject or not isinstance(subject, str):
-        print("Error sending email - SMTP settings are incorrect (subject is not a string or is empty)")
-        return 1
+    if history_writer is not None or sqlite_writer is not None:
+        record = history_record(timestamp, object_type, object_name, old, new, event_id, repo_id, actor)
+        if history_writer is not None:
+            history_writer.write(record)
+        if sqlite_writer is not None:
+            sqlite_writer.write(record)
 
-    if not body and not body_html:
-        print("Error sending email - SMTP settings are incorrect (body and body_html cannot be empty at the same time)")
-        return 1
 
-    try:
-        if use_ssl:
-            ssl_context = ssl.create_default_context()
-            smtpObj = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=smtp_timeout)
-            smtpObj.starttls(context=ssl_context)
-        else:
-            smtpObj = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=smtp_timeout)
-        smtpObj.login(SMTP_USER, SMTP_PASSWORD)
-        email_msg = MIMEMultipart('alternative')
-        email_msg["From"] = SENDER_EMAIL
-        email_msg["To"] = RECEIVER_EMAIL
-        email_msg["Subject"] = str(Header(subject, 'utf-8'))
+# Writes all buffered change records (CSV rows, history entries) to disk; called at the end of every check cycle
+def flush_change_entries():
+    flush_csv_entries()
+    flush_history_entries()
 
-        if body:
-            part1 = MIMEText(body, 'plain')
-            part1 = MIMEText(body.encode('utf-8'), 'plain', _charset='utf-8')
-            email_msg.attach(part1)
 
-        if body_html:
-            part2 = MIMEText(body_html, 'html')
-            part2 = MIMEText(body_html.encode('utf-8'), 'html', _charset='utf-8')
-            email_msg.attach(part2)
+# Reads change history records for the user (or all users), skipping day partitions older than since
+def read_history(history_dir, user=None, since: Optional[dt.date] = None):
+    user_glob = f"user={user}" if user else "user=*"
+    for day_dir in sorted(Path(history_dir).glob(f"{user_glob}/date=*")):
+        day = day_dir.name.split("=", 1)[1]
+        if since and day < since.isoformat():
+            continue
+        for path in sorted(day_dir.iterdir()):
+            if path.name.endswith(".jsonl.gz"):
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            yield json.loads(line)
+            elif path.suffix == ".parquet":
+                import pyarrow.parquet as pq
+                for record in pq.read_table(path).to_pylist():
+                    record["ts"] = record["ts"].isoformat() if record.get("ts") else None
+                    yield record
+
+
+# Prints a summary of the change history recorded for the user over the last N days (--history-stats)
+def github_print_history_stats(user, days):
+    if not HISTORY_DIR:
+        raise RuntimeError("HISTORY_DIR (--history-dir) is not set")
+    if HISTORY_FORMAT == "parquet" or any(Path(HISTORY_DIR).glob("user=*/date=*/*.parquet")):
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise RuntimeError("Reading Parquet history files requires the pyarrow library (pip3 install pyarrow)")
 
-        smtpObj.sendmail(SENDER_EMAIL, RECEIVER_EMAIL, email_msg.as_string())
-        smtpObj.quit()
-    except Exception as e:
-        print(f"Error sending email: {e}")
-        return 1
-    return 0
+    since = today_local() - dt.timedelta(days=max(1, days) - 1)
 
+    type_counts = {}
+    day_counts = {}
+    name_counts = {}
+    total = 0
 
-# Initializes the CSV file
-def init_csv_file(csv_file_name):
-    try:
-        if not os.path.isfile(csv_file_name) or os.path.getsize(csv_file_name) == 0:
-            with open(csv_file_name, 'a', newline='', buffering=1, encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=csvfieldnames, quoting=csv.QUOTE_NONNUMERIC)
-                writer.writeheader()
-    except Exception as e:
-        raise RuntimeError(f"Could not initialize CSV file '{csv_file_name}': {e}")
+    for record in read_history(HISTORY_DIR, user, since):
+        object_type = record.get("type") or "?"
+        total += 1
+        type_counts[object_type] = type_counts.get(object_type, 0) + 1
+        day = (record.get("ts") or "")[:10]
+        day_counts[day] = day_counts.get(day, 0) + 1
+        names = name_counts.setdefault(object_type, {})
+        name = record.get("new") or record.get("old") or record.get("name") or "-"
+        names[name] = names.get(name, 0) + 1
 
+    print(f"* Change history for {'user ' + user if user else 'all users'} since {since.isoformat()} ({HISTORY_DIR})\n")
+    print(f"Total changes:\t\t\t{total}")
 
-# Writes CSV entry
-def write_csv_entry(csv_file_name, timestamp, object_type, object_name, old, new):
-    try:
+    if not total:
+        return
 
-        with open(csv_file_name, 'a', newline='', buffering=1, encoding="utf-8") as csv_file:
-            csvwriter = csv.DictWriter(csv_file, fieldnames=csvfieldnames, quoting=csv.QUOTE_NONNUMERIC)
-            csvwriter.writerow({'Date': timestamp, 'Type': object_type, 'Name': object_name, 'Old': old, 'New': new})
+    print("\nChanges by type:\n")
+    for object_type, count in sorted(type_counts.items(), key=lambda item: (-item[1], item[0])):
+        top_names = sorted(name_counts[object_type].items(), key=lambda item: (-item[1], item[0]))[:3]
+        top_str = ", ".join(f"{name} ({name_count})" for name, name_count in top_names)
+        print(f"- {object_type}: {count}\t[ {top_str} ]")
 
-    except Exception as e:
-        raise RuntimeError(f"Failed to write to CSV file '{csv_file_name}': {e}")
+    print("\nChanges by day:\n")
+    for day, count in sorted(day_counts.items()):
+        print(f"- {day}: {count}")
 
 
 # Converts a datetime to local timezone and removes timezone info (naive)
 def convert_to_local_naive(dt: datetime | None = None):
+    load_pytz()
     tz = pytz.timezone(LOCAL_TIMEZONE)
 
     if dt is not None:
@@ -1763,6 +2812,7 @@ def convert_to_local_naive(dt: datetime | None = None):
 
 # Returns current local time without timezone info (naive)
 def now_local_naive():
+    load_pytz()
     return datetime.now(pytz.timezone(LOCAL_TIMEZONE)).replace(microsecond=0, tzinfo=None)
 
 
@@ -1784,9 +2834,11 @@ def print_cur_ts(ts_str=""):
 
 # Returns the timestamp/datetime object in human readable format (long version); eg. Sun 21 Apr 2024, 15:08:45
 def get_date_from_ts(ts):
+    load_pytz()
     tz = pytz.timezone(LOCAL_TIMEZONE)
 
     if isinstance(ts, str):
+        from dateutil.parser import isoparse
         try:
             ts = isoparse(ts)
         except Exception:
@@ -1818,11 +2870,13 @@ def get_date_from_ts(ts):
 # Sun 21 Apr 15:08:32 (if show_seconds == True)
 # 21 Apr 15:08 (if show_weekday == False)
 def get_short_date_from_ts(ts, show_year=False, show_hour=True, show_weekday=True, show_seconds=False, always_show_year=False):
+    load_pytz()
     tz = pytz.timezone(LOCAL_TIMEZONE)
     if always_show_year:
         show_year = True
 
     if isinstance(ts, str):
+        from dateutil.parser import isoparse
         try:
             ts = isoparse(ts)
         except Exception:
@@ -1864,9 +2918,11 @@ def get_short_date_from_ts(ts, show_year=False, show_hour=True, show_weekday=Tru
 
 # Returns the timestamp/datetime object in human readable format (only hour, minutes and optionally seconds): eg. 15:08:12
 def get_hour_min_from_ts(ts, show_seconds=False):
+    load_pytz()
     tz = pytz.timezone(LOCAL_TIMEZONE)
 
     if isinstance(ts, str):
+        from dateutil.parser import isoparse
         try:
             ts = isoparse(ts)
         except Exception:
@@ -1893,6 +2949,7 @@ def get_hour_min_from_ts(ts, show_seconds=False):
 
 # Returns the range between two timestamps/datetime objects; eg. Sun 21 Apr 14:09 - 14:15
 def get_range_of_dates_from_tss(ts1, ts2, between_sep=" - ", short=False):
+    load_pytz()
     tz = pytz.timezone(LOCAL_TIMEZONE)
 
     if isinstance(ts1, datetime):
@@ -1930,11 +2987,6 @@ def get_range_of_dates_from_tss(ts1, ts2, between_sep=" - ", short=False):
     return str(out_str)
 
 
-# Checks if the timezone name is correct
-def is_valid_timezone(tz_name):
-    return tz_name in pytz.all_timezones
-
-
 # Prints and returns the printed text with new line
 def print_v(text=""):
     print(text)
@@ -2012,6 +3064,31 @@ def decrease_check_signal_handler(sig, frame):
     print_cur_ts("Timestamp:\t\t\t")
 
 
+# Signal handler for SIGTTIN dumping JSON statistics of the last check cycle (time and API calls per phase, top repos and endpoints)
+# and the request trace report if TRACE_REQUESTS is enabled
+def dump_cycle_stats_signal_handler(sig, frame):
+    sig_name = signal.Signals(sig).name
+    print(f"* Signal {sig_name} received")
+    stats = metrics.last_cycle
+    if stats is None:
+        print("* No check cycle finished yet")
+    else:
+        stats_json = json.dumps(stats, indent=2)
+        if CYCLE_STATS_FILE:
+            try:
+                with open(os.path.expanduser(CYCLE_STATS_FILE), "w", encoding="utf-8") as f:
+                    f.write(stats_json + "\n")
+                print(f"* Cycle stats written to {CYCLE_STATS_FILE}")
+            except OSError as e:
+                print(f"* Error: Cannot write cycle stats to {CYCLE_STATS_FILE}: {e}")
+        else:
+            print(stats_json)
+    if request_tracer.enabled:
+        print()
+        request_tracer.print_report(CYCLE_STATS_TOP_N)
+    print_cur_ts("Timestamp:\t\t\t")
+
+
 # Signal handler for SIGHUP allowing to reload secrets from .env
 def reload_secrets_signal_handler(sig, frame):
     sig_name = signal.Signals(sig).name
@@ -2043,6 +3120,9 @@ def reload_secrets_signal_handler(sig, frame):
             if val is not None and val != old_val:
                 globals()[secret] = val
                 print(f"* Reloaded {secret} from {env_path}")
+                if secret == "SMTP_PASSWORD":
+                    validate_smtp_settings()
+                    smtp_session.close()
 
     print_cur_ts("Timestamp:\t\t\t")
 
@@ -2054,6 +3134,466 @@ class EmptyPaginatedList(list):
         self.totalCount = 0
 
 
+# Help texts and types of the exported metrics, in output order
+METRICS_HELP = {
+    "github_monitor_cycles_total": ("counter", "Completed check cycles"),
+    "github_monitor_cycle_errors_total": ("counter", "Check cycles aborted because the user could not be fetched"),
+    "github_monitor_cycle_duration_seconds_total": ("counter", "Total time spent in check cycles"),
+    "github_monitor_cycle_last_duration_seconds": ("gauge", "Duration of the last check cycle"),
+    "github_monitor_cycle_last_timestamp_seconds": ("gauge", "Unix time the last check cycle finished"),
+    "github_monitor_phase_duration_seconds_total": ("counter", "Total time spent per check cycle phase"),
+    "github_monitor_phase_last_duration_seconds": ("gauge", "Duration of each phase in the last check cycle"),
+    "github_monitor_api_requests_total": ("counter", "GitHub API requests by method, endpoint and status"),
+    "github_monitor_api_request_duration_seconds_total": ("counter", "Time spent in GitHub API requests by method and endpoint"),
+    "github_monitor_api_response_bytes_total": ("counter", "Bytes of GitHub API response bodies by endpoint, as transferred (wire, possibly compressed) and decoded"),
+    "github_monitor_api_retries_total": ("counter", "GitHub API calls retried by gh_call(), by reason"),
+    "github_monitor_api_lazy_completions_total": ("counter", "PyGithub objects completed with an extra request on attribute access, by object type"),
+    "github_monitor_api_rate_limit_remaining": ("gauge", "Remaining GitHub API requests in the current rate limit window"),
+    "github_monitor_api_rate_limit_limit": ("gauge", "GitHub API requests allowed per rate limit window"),
+    "github_monitor_api_rate_limit_reset_timestamp_seconds": ("gauge", "Unix time the GitHub API rate limit window resets"),
+    "github_monitor_emails_sent_total": ("counter", "Email notifications sent"),
+    "github_monitor_emails_failed_total": ("counter", "Failed email notification attempts"),
+    "github_monitor_notifications_dead_lettered_total": ("counter", "Notifications given up on by the notification queue"),
+    "github_monitor_notification_queue_depth": ("gauge", "Notifications waiting in the notification queue"),
+    "github_monitor_log_queue_depth": ("gauge", "Messages waiting for the background log writer"),
+    "github_monitor_digest_pending": ("gauge", "Notifications collected for the next digest email"),
+    "github_monitor_change_rows_buffered": ("gauge", "Change rows buffered for the CSV file, history and SQLite change log"),
+    "process_resident_memory_bytes": ("gauge", "Resident memory size (peak size where the current one is unavailable)"),
+}
+
+api_path_id_re = re.compile(r'^(?:\d+|[0-9a-fA-F]{7,40})$')
+
+
+# Counters and gauges exported by the metrics endpoint (see METRICS_LISTEN), also used to time check cycle phases
+class Metrics(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.phases = {}
+        self.phase = None
+        self.phase_started = 0.0
+        self.cycle_started = None
+        # Per cycle accounting: API calls and response bytes (decoded, wire) so far, [seconds, calls] per phase and repo,
+        # [seconds, calls, bytes, wire bytes] per endpoint
+        self.calls = 0
+        self.bytes = 0
+        self.wire_bytes = 0
+        self.phase_calls = 0
+        self.endpoints = {}
+        self.repos = {}
+        self.repo = None
+        self.repo_started = 0.0
+        self.repo_calls = 0
+        self.completions = {}
+        self.last_cycle = None
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self.lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    # Returns the current value of a gauge, None if not set yet
+    def value(self, name, **labels):
+        with self.lock:
+            return self.gauges.get((name, tuple(sorted(labels.items()))))
+
+    def start_cycle(self):
+        with self.lock:
+            self.calls = 0
+            self.bytes = 0
+            self.wire_bytes = 0
+            self.endpoints = {}
+            self.completions = {}
+        self.phases = {}
+        self.phase = None
+        self.phase_calls = 0
+        self.repos = {}
+        self.repo = None
+        self.cycle_started = time.perf_counter()
+
+    # Accounts a GitHub API call of the current cycle to its endpoint (e.g. 'GET /users/{user}'), with the size of its
+    # response body decoded and as transferred
+    def add_call(self, endpoint, seconds, size=0, wire_size=0):
+        with self.lock:
+            self.calls += 1
+            self.bytes += size
+            self.wire_bytes += wire_size
+            stats = self.endpoints.setdefault(endpoint, [0.0, 0, 0, 0])
+            stats[0] += seconds
+            stats[1] += 1
+            stats[2] += size
+            stats[3] += wire_size
+
+    # Accounts a lazy completion of a PyGithub object of the given type (e.g. 'Repository') in the current cycle
+    def add_completion(self, kind):
+        self.inc("github_monitor_api_lazy_completions_total", object=kind)
+        with self.lock:
+            self.completions[kind] = self.completions.get(kind, 0) + 1
+
+    # Ends the current phase of the check cycle and starts the given one; time and calls of repeated phases add up
+    def begin_phase(self, name):
+        now = time.perf_counter()
+        calls = self.calls
+        if self.phase:
+            stats = self.phases.setdefault(self.phase, [0.0, 0])
+            stats[0] += now - self.phase_started
+            stats[1] += calls - self.phase_calls
+        self.phase = name
+        self.phase_started = now
+        self.phase_calls = calls
+
+    # Ends the time accounted to the current repo and starts accounting to the given one (None to stop)
+    def begin_repo(self, name):
+        now = time.perf_counter()
+        calls = self.calls
+        if self.repo:
+            stats = self.repos.setdefault(self.repo, [0.0, 0])
+            stats[0] += now - self.repo_started
+            stats[1] += calls - self.repo_calls
+        self.repo = name
+        self.repo_started = now
+        self.repo_calls = calls
+
+    # Ends the check cycle, publishes its total and per phase durations and returns its statistics (also kept in last_cycle)
+    def end_cycle(self, top_n=10):
+        if self.cycle_started is None:
+            return None
+        self.begin_repo(None)
+        self.begin_phase(None)
+        total = time.perf_counter() - self.cycle_started
+        for phase, (seconds, _) in self.phases.items():
+            self.inc("github_monitor_phase_duration_seconds_total", seconds, phase=phase)
+            self.set("github_monitor_phase_last_duration_seconds", seconds, phase=phase)
+        self.inc("github_monitor_cycles_total")
+        self.inc("github_monitor_cycle_duration_seconds_total", total)
+        self.set("github_monitor_cycle_last_duration_seconds", total)
+        self.set("github_monitor_cycle_last_timestamp_seconds", time.time())
+        self.cycle_started = None
+
+        with self.lock:
+            calls = self.calls
+            size = self.bytes
+            wire_size = self.wire_bytes
+            endpoints = dict(self.endpoints)
+            completions = dict(self.completions)
+
+        def top(stats, key):
+            entries = []
+            for name, values in sorted(stats.items(), key=lambda item: item[1], reverse=True)[:top_n]:
+                entry = {key: name, "seconds": round(values[0], 3), "api_calls": values[1]}
+                if len(values) > 2:
+                    entry.update({"bytes": values[2], "wire_bytes": values[3]})
+                entries.append(entry)
+            return entries
+
+        # Replaced as a whole, so the TTIN signal handler can read it without taking the lock
+        self.last_cycle = {
+            "finished": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "seconds": round(total, 3),
+            "api_calls": calls,
+            "bytes": size,
+            "wire_bytes": wire_size,
+            "phases": {phase: {"seconds": round(seconds, 3), "api_calls": count} for phase, (seconds, count) in self.phases.items()},
+            "top_repos": top(self.repos, "repo"),
+            "top_endpoints": top(endpoints, "endpoint"),
+            "lazy_completions": completions,
+        }
+        return self.last_cycle
+
+    # Returns the metrics in Prometheus text format (or OpenMetrics if requested)
+    def render(self, openmetrics=False):
+        with self.lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+        for name, value in metrics_scrape_gauges().items():
+            gauges[(name, ())] = value
+
+        lines = []
+        for name, (kind, help_text) in METRICS_HELP.items():
+            source = counters if kind == "counter" else gauges
+            samples = sorted((labels, value) for (sample_name, labels), value in source.items() if sample_name == name)
+            family = name[:-len("_total")] if openmetrics and kind == "counter" else name
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            for labels, value in samples:
+                label_str = ",".join(f'{key}="{metrics_escape(str(val))}"' for key, val in labels)
+                lines.append(f"{name}{{{label_str}}} {value}" if label_str else f"{name} {value}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+# Functions of the API hooks themselves, skipped when looking for the caller of a request
+API_HOOK_FRAMES = {"send", "complete_if_needed", "record_api_call", "api_caller", "record", "wrapped"}
+
+# Per thread state of the API hooks: type of the PyGithub object being lazily completed, if any
+api_context = threading.local()
+
+
+# Returns 'function:line' of the innermost github_monitor.py frame (outside of the API hooks) of the current thread
+def api_caller():
+    frame = sys._getframe(1)
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename == __file__ and code.co_name not in API_HOOK_FRAMES:
+            return f"{getattr(code, 'co_qualname', code.co_name)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "?"
+
+
+# Opt-in tracer of GitHub API requests (see TRACE_REQUESTS), aggregated per caller, endpoint and lazy completion type
+class RequestTracer(object):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.enabled = False
+        self.started = time.time()
+        self.stats = {}
+        self.rate_limits = {}
+
+    def enable(self):
+        self.enabled = True
+        self.started = time.time()
+
+    # Rate limit cost is the drop of the remaining quota of the request's resource, 1 point per request (0 for 304s)
+    # when it cannot be told
+    def record(self, endpoint, status, seconds, size, headers):
+        caller = api_caller()
+        lazy = getattr(api_context, "completing", None) or ""
+        cost = 0 if status == "304" else 1
+        remaining = headers.get("X-RateLimit-Remaining", "") if headers is not None else ""
+        with self.lock:
+            if remaining.isdigit():
+                resource = headers.get("X-RateLimit-Resource", "core")
+                reset = headers.get("X-RateLimit-Reset", "")
+                previous = self.rate_limits.get(resource)
+                if previous and previous[1] == reset and previous[0] >= int(remaining):
+                    cost = previous[0] - int(remaining)
+                self.rate_limits[resource] = (int(remaining), reset)
+            stats = self.stats.setdefault((caller, endpoint, lazy), [0, 0, 0.0, 0])
+            stats[0] += 1
+            stats[1] += cost
+            stats[2] += seconds
+            stats[3] += size
+
+    # Returns the report of the top_n callers and endpoints with the highest rate limit cost (then request count)
+    def report(self, top_n=10):
+        with self.lock:
+            stats = dict(self.stats)
+        requests = sum(value[0] for value in stats.values())
+        cost = sum(value[1] for value in stats.values())
+        seconds = sum(value[2] for value in stats.values())
+        size = sum(value[3] for value in stats.values())
+        lazy = sum(value[0] for (_, _, kind), value in stats.items() if kind)
+
+        lines = [f"Request trace:\t\t\t{requests} requests, {cost} rate limit points, {seconds:.1f}s, {human_readable_size(size)}, {lazy} lazy completions (since {get_date_from_ts(int(self.started))})"]
+        top = sorted(stats.items(), key=lambda item: (item[1][1], item[1][0]), reverse=True)[:top_n]
+        if top:
+            lines.append(f"{'Requests':>10}{'Cost':>8}{'Time':>10}{'Size':>12}  Caller / endpoint")
+            for (caller, endpoint, kind), (count, points, secs, nbytes) in top:
+                lazy_str = f" [lazy {kind}]" if kind else ""
+                lines.append(f"{count:>10}{points:>8}{secs:>9.2f}s{human_readable_size(nbytes):>12}  {caller}  {endpoint}{lazy_str}")
+        return "\n".join(lines)
+
+    def print_report(self, top_n=10):
+        print(self.report(top_n))
+
+
+request_tracer = RequestTracer()
+
+
+# Escapes a metric label value
+def metrics_escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# Returns the gauges computed when metrics are scraped (queue depths, buffered rows, memory)
+def metrics_scrape_gauges():
+    gauges = {}
+
+    gauges["github_monitor_notification_queue_depth"] = notification_queue.queue.qsize() if notification_queue is not None else 0
+    gauges["github_monitor_log_queue_depth"] = sys.stdout.queue.qsize() if isinstance(sys.stdout, Logger) else 0
+    gauges["github_monitor_digest_pending"] = len(digest_entries)
+
+    buffered = sum(writer.pending for writer in list(csv_writers.values()))
+    if history_writer is not None:
+        buffered += len(history_writer.records)
+    if sqlite_writer is not None:
+        buffered += len(sqlite_writer.rows)
+    gauges["github_monitor_change_rows_buffered"] = buffered
+
+    rss = process_memory_bytes()
+    if rss is not None:
+        gauges["process_resident_memory_bytes"] = rss
+
+    return gauges
+
+
+# Returns resident memory of the process in bytes (peak value on systems without /proc), None if unknown
+def process_memory_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+# Returns the API path with user, repo and ID segments replaced by placeholders, e.g. /repos/{owner}/{repo}/pulls/{id}
+def api_endpoint(path):
+    parts = path.strip("/").split("/")
+    for i, part in enumerate(parts):
+        if i == 1 and parts[0] in ("users", "orgs"):
+            parts[i] = "{user}"
+        elif i in (1, 2) and parts[0] == "repos":
+            parts[i] = "{owner}" if i == 1 else "{repo}"
+        elif i > 0 and parts[i - 1] == "compare":
+            parts[i] = "{basehead}"
+        elif api_path_id_re.match(part):
+            parts[i] = "{id}"
+    return "/" + "/".join(parts)
+
+
+# Accounts a finished GitHub API request which took the given number of seconds and returned a body of size bytes
+# (wire_size bytes as transferred, i.e. before decompression); response is None if it failed without one
+def record_api_call(request, response, seconds=0.0, size=0, wire_size=0):
+    api_base = GITHUB_API_URL.rstrip("/")
+    url = request.url or ""
+    if not url.startswith(api_base):
+        return
+
+    path = url[len(api_base):].split("?", 1)[0]
+    endpoint = api_endpoint(path)
+    status = str(response.status_code) if response is not None else "error"
+    metrics.inc("github_monitor_api_requests_total", method=request.method, endpoint=endpoint, status=status)
+    metrics.inc("github_monitor_api_request_duration_seconds_total", seconds, method=request.method, endpoint=endpoint)
+    metrics.add_call(f"{request.method} {endpoint}", seconds, size, wire_size)
+    if response is not None:
+        metrics.inc("github_monitor_api_response_bytes_total", size, endpoint=endpoint, body="decoded")
+        metrics.inc("github_monitor_api_response_bytes_total", wire_size, endpoint=endpoint, body="wire")
+    if request_tracer.enabled:
+        request_tracer.record(f"{request.method} {endpoint}", status, seconds, size, response.headers if response is not None else None)
+
+    if response is None:
+        return
+    headers = response.headers
+    remaining = headers.get("X-RateLimit-Remaining")
+    if remaining is not None and remaining.isdigit():
+        resource = headers.get("X-RateLimit-Resource", "core")
+        metrics.set("github_monitor_api_rate_limit_remaining", int(remaining), resource=resource)
+        limit = headers.get("X-RateLimit-Limit", "")
+        if limit.isdigit():
+            metrics.set("github_monitor_api_rate_limit_limit", int(limit), resource=resource)
+        reset = headers.get("X-RateLimit-Reset", "")
+        if reset.isdigit():
+            metrics.set("github_monitor_api_rate_limit_reset_timestamp_seconds", int(reset), resource=resource)
+
+
+# Hooks requests' HTTPAdapter.send, used by PyGithub and direct API calls alike, to account every GitHub API request
+# Also counts lazy completions of PyGithub objects, i.e. hidden extra requests made when reading attributes missing
+# from list payloads (see Metrics.add_completion())
+def install_api_hooks():
+    from github.GithubObject import CompletableGithubObject
+
+    if not getattr(CompletableGithubObject._completeIfNeeded, "api_hook", False):
+        original_complete = CompletableGithubObject._completeIfNeeded
+
+        # Objects fetched on purpose (g.get_user(), g.get_repo()) start from their URL only and are not counted
+        # The completed property is only there since PyGithub 2.6.0, older versions keep just the private flag
+        def complete_if_needed(self):
+            completed = getattr(self, "completed", None)
+            if completed is None:
+                completed = self._CompletableGithubObject__completed
+            if completed or not set(getattr(self, "_rawData", None) or ()) - {"url"}:
+                original_complete(self)
+                return
+            kind = type(self).__name__
+            metrics.add_completion(kind)
+            api_context.completing = kind
+            try:
+                original_complete(self)
+            finally:
+                api_context.completing = None
+
+        complete_if_needed.api_hook = True
+        CompletableGithubObject._completeIfNeeded = complete_if_needed
+
+    adapter_cls = req.adapters.HTTPAdapter
+    if getattr(adapter_cls.send, "api_hook", False):
+        return
+
+    original_send = adapter_cls.send
+
+    def send(self, request, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = original_send(self, request, *args, **kwargs)
+            # Read the body here (requests would do it right after) so the timing covers its download too
+            # urllib3 counts the bytes read from the connection, i.e. before any gzip decoding
+            if kwargs.get("stream"):
+                size = wire_size = int(response.headers.get("Content-Length") or 0)
+            else:
+                size = len(response.content)
+                tell = getattr(response.raw, "tell", None)
+                wire_size = tell() if tell else int(response.headers.get("Content-Length") or size)
+        except Exception:
+            record_api_call(request, None, time.perf_counter() - started)
+            raise
+        record_api_call(request, response, time.perf_counter() - started, size, wire_size)
+        return response
+
+    send.api_hook = True
+    adapter_cls.send = send
+
+
+# Serves metrics at /metrics on the given host:port from a background thread and returns the endpoint URL
+def start_metrics_server(listen):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    host, _, port = listen.rpartition(":")
+    host = host.strip("[]") or "127.0.0.1"
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+            body = metrics.render(openmetrics).encode("utf-8")
+            self.send_response(200)
+            if openmetrics:
+                self.send_header("Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8")
+            else:
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        # Keep scrapes out of the console and log file
+        def log_message(self, format, *args):
+            pass
+
+    class MetricsServer(ThreadingHTTPServer):
+        address_family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        daemon_threads = True
+
+    server = MetricsServer((host, int(port)), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return f"http://{f'[{host}]' if ':' in host else host}:{server.server_address[1]}/metrics"
+
+
 # Wraps GitHub API call with retry and linear back-off, returning a specified default on failure
 def gh_call(fn: Callable[..., Any], retries=NET_MAX_RETRIES, backoff=NET_BASE_BACKOFF_SEC, default: Any = None,) -> Callable[..., Any]:
     def wrapped(*args: Any, **kwargs: Any) -> Any:
@@ -2085,11 +3625,13 @@ def gh_call(fn: Callable[..., Any], retries=NET_MAX_RETRIES, backoff=NET_BASE_BA
                         sleep_for = int(backoff * i)
 
                 print(f"* {fn.__name__} rate limited, sleeping {sleep_for}s (retry {i}/{retries})")
+                metrics.inc("github_monitor_api_retries_total", reason="rate_limit")
                 time.sleep(sleep_for)
                 continue
 
             except NET_ERRORS as e:
                 print(f"* {fn.__name__} error: {e} (retry {i}/{retries})")
+                metrics.inc("github_monitor_api_retries_total", reason="error")
                 time.sleep(backoff * i)
         return default
     return wrapped
@@ -2101,14 +3643,12 @@ def github_print_followers_and_followings(user):
     user_url = "-"
     followers_count = 0
     followings_count = 0
-    followers_list = []
-    followings_list = []
 
     print(f"* Getting followers & followings for user '{user}' ...")
 
     try:
         auth = Auth.Token(GITHUB_TOKEN)
-        g = Github(base_url=GITHUB_API_URL, auth=auth)
+        g = Github(base_url=GITHUB_API_URL, auth=auth, per_page=GITHUB_PER_PAGE)
 
         g_user = g.get_user(user)
         user_login = g_user.login
@@ -2118,9 +3658,6 @@ def github_print_followers_and_followings(user):
         followers_count = g_user.followers
         followings_count = g_user.following
 
-        followers_list = g_user.get_followers()
-        followings_list = g_user.get_following()
-
         user_name_str = user_login
         if user_name:
             user_name_str += f" ({user_name})"
@@ -2133,36 +3670,133 @@ def github_print_followers_and_followings(user):
     print(f"Local timezone:\t\t{LOCAL_TIMEZONE}")
 
     print(f"\nFollowers:\t\t{followers_count}")
+    if followers_count:
+        github_print_user_list(g_user, "followers")
+
+    print(f"\nFollowings:\t\t{followings_count}")
+    if followings_count:
+        github_print_user_list(g_user, "following")
+
+    g.close()
 
+
+# Yields (login, name, URL) of the user's followers or followings (field), fetched in bulk via GraphQL page by page
+def get_user_connection(user, field, page_size=100):
+    url = GITHUB_API_URL.rstrip("/") + "/graphql"
+    headers = {"Authorization": f"Bearer {GITHUB_TOKEN}"}
+    query = f"""
+    query($login: String!, $first: Int!, $after: String) {{
+      user(login: $login) {{
+        {field}(first: $first, after: $after) {{
+          pageInfo {{
+            hasNextPage
+            endCursor
+          }}
+          nodes {{
+            login
+            name
+            url
+          }}
+        }}
+      }}
+    }}"""
+
+    after = None
+    while True:
+        variables = {"login": user, "first": page_size, "after": after}
+        r = req.post(url, json={"query": query, "variables": variables}, headers=headers, timeout=30)
+        r.raise_for_status()
+        data = json_loads(r.content)
+
+        if "errors" in data:
+            raise RuntimeError(f"GraphQL API errors: {data['errors']}")
+
+        connection = ((data.get("data") or {}).get("user") or {}).get(field)
+        if connection is None:
+            raise ValueError(f"User '{user}' not found")
+
+        for node in connection.get("nodes") or []:
+            if node:
+                yield node.get("login"), node.get("name"), node.get("url")
+
+        page_info = connection.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            break
+        after = page_info.get("endCursor")
+
+
+# Prints the user's followers or followings (field) as they are fetched; login, name and URL come in pages of 100
+# from GraphQL, with a fallback to the REST API (without names, which would cost an extra request per user)
+def github_print_user_list(g_user, field):
+    label = "followers" if field == "followers" else "followings"
+
+    def print_entry(login, name, url):
+        entry_str = f"\n- {login}"
+        if name:
+            entry_str += f" ({name})"
+        if url:
+            entry_str += f"\n[ {url}/ ]"
+        print(entry_str)
+
+    printed = 0
     try:
-        if followers_list:
-
-            for follower in followers_list:
-                follower_str = f"\n- {follower.login}"
-                if follower.name:
-                    follower_str += f" ({follower.name})"
-                if follower.html_url:
-                    follower_str += f"\n[ {follower.html_url}/ ]"
-                print(follower_str)
+        for login, name, url in get_user_connection(g_user.login, field):
+            print_entry(login, name, url)
+            printed += 1
+        return
     except Exception as e:
-        print(f"* Cannot fetch user's followers list: {e}")
-
-    print(f"\nFollowings:\t\t{followings_count}")
+        if printed:
+            print(f"* Cannot fetch user's {label} list: {e}")
+            return
+        print(f"* Cannot fetch user's {label} list via GraphQL, listing without names: {e}")
 
     try:
-        if followings_list:
-
-            for following in followings_list:
-                following_str = f"\n- {following.login}"
-                if following.name:
-                    following_str += f" ({following.name})"
-                if following.html_url:
-                    following_str += f"\n[ {following.html_url}/ ]"
-                print(following_str)
+        for item in (g_user.get_followers() if field == "followers" else g_user.get_following()):
+            print_entry(item.login, None, item.html_url)
     except Exception as e:
-        print(f"* Cannot fetch user's followings list: {e}")
+        print(f"* Cannot fetch user's {label} list: {e}")
+
+
+# Returns {full_name: watchers count} for the repos, fetched via GraphQL in batches of aliased repository queries
+# The REST repo lists lack subscribers_count, so reading it would cost an extra request per repo
+def get_repos_watchers_counts(repos, batch_size=50):
+    url = GITHUB_API_URL.rstrip("/") + "/graphql"
+    headers = {"Authorization": f"Bearer {GITHUB_TOKEN}"}
+    counts = {}
+
+    for start in range(0, len(repos), batch_size):
+        batch = repos[start:start + batch_size]
+        params = []
+        fields = []
+        variables = {}
+        for i, repo in enumerate(batch):
+            owner, name = repo.full_name.split("/", 1)
+            params.append(f"$o{i}: String!, $n{i}: String!")
+            fields.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ watchers {{ totalCount }} }}")
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+        query = f"query({', '.join(params)}) {{\n  " + "\n  ".join(fields) + "\n}"
+
+        r = req.post(url, json={"query": query, "variables": variables}, headers=headers, timeout=30)
+        r.raise_for_status()
+        data = json_loads(r.content).get("data") or {}
 
-    g.close()
+        # Repos missing from a partial answer (e.g. blocked ones) are left out
+        for i, repo in enumerate(batch):
+            node = data.get(f"r{i}")
+            if node and node.get("watchers"):
+                counts[repo.full_name] = node["watchers"]["totalCount"]
+
+    return counts
+
+
+# Returns watchers counts of the repos (see get_repos_watchers_counts()) or an empty dict if GraphQL is unavailable
+def get_repos_watchers_counts_safe(repos):
+    try:
+        return get_repos_watchers_counts(repos)
+    except Exception as e:
+        print(f"* Cannot fetch repos watchers counts in bulk, fetching them per repo: {e}")
+        return {}
 
 
 # Displays a progress bar with percentage and current repo name
@@ -2243,8 +3877,7 @@ def _display_progress(current, total, repo_name: str = "", bar_length: int = 40,
         terminal_out.flush()
 
         if stdout_bck is not None and isinstance(sys.stdout, Logger):
-            sys.stdout.logfile.write(progress_str + "\n")
-            sys.stdout.logfile.flush()
+            sys.stdout.write_log(progress_str + "\n")
     else:
         terminal_out.write("\r\033[K" + progress_str)
         terminal_out.flush()
@@ -2265,12 +3898,15 @@ def github_process_repos(repos_list, show_progress=True, fetch_identity_lists=Tr
         # Convert to list if it's a generator/iterator to get total count
         repos_list = list(repos_list)
         total_repos = len(repos_list)
+        watchers_counts = get_repos_watchers_counts_safe(repos_list)
 
         for idx, repo in enumerate(repos_list, 1):
             stargazers_list = None
             subscribers_list = None
             forked_repos = []
 
+            metrics.begin_repo(repo.full_name)
+
             # Update progress bar at start
             if show_progress:
                 _display_progress(idx, total_repos, repo.name)
@@ -2284,14 +3920,14 @@ def github_process_repos(repos_list, show_progress=True, fetch_identity_lists=Tr
 
                 try:
                     if fetch_identity_lists:
-                        stargazers_list = [star.login for star in repo.get_stargazers()]
+                        stargazers_list = get_list_values(repo, "stargazers", "login", repo.stargazers_count)
                         if show_progress:
                             _display_progress(idx, total_repos, repo.name)  # Refresh after stargazers
-                        subscribers_list = [subscriber.login for subscriber in repo.get_subscribers()]
+                        subscribers_list = get_list_values(repo, "subscribers", "login", watchers_counts.get(repo.full_name))
                         identity_lists_fetched += 1
                         if show_progress:
                             _display_progress(idx, total_repos, repo.name)  # Refresh after subscribers
-                    forked_repos = [fork.full_name for fork in repo.get_forks()]
+                    forked_repos = fork_index.sync(repo)
                     if show_progress:
                         _display_progress(idx, total_repos, repo.name)  # Refresh after forks
                 except GithubException as e:
@@ -2306,21 +3942,14 @@ def github_process_repos(repos_list, show_progress=True, fetch_identity_lists=Tr
                 finally:
                     github_logger.setLevel(original_level)
 
-                issues = list(repo.get_issues(state='open'))
+                issues_list, pr_list = issue_index.sync(repo)
                 if show_progress:
-                    _display_progress(idx, total_repos, repo.name)  # Refresh after issues
-                pulls = list(repo.get_pulls(state='open'))
-                if show_progress:
-                    _display_progress(idx, total_repos, repo.name)  # Refresh after pulls
-
-                real_issues = [i for i in issues if not i.pull_request]
-                issue_count = len(real_issues)
-                pr_count = len(pulls)
+                    _display_progress(idx, total_repos, repo.name)  # Refresh after issues and pulls
 
-                issues_list = [f"#{i.number} {i.title} ({i.user.login}) [ {i.html_url} ]" for i in real_issues]
-                pr_list = [f"#{pr.number} {pr.title} ({pr.user.login}) [ {pr.html_url} ]" for pr in pulls]
+                issue_count = len(issues_list)
+                pr_count = len(pr_list)
 
-                list_of_repos.append({"name": repo.name, "descr": repo.description, "is_fork": repo.fork, "forks": repo.forks_count, "stars": repo.stargazers_count, "subscribers": repo.subscribers_count, "url": repo.html_url, "language": repo.language, "date": repo_created_date, "update_date": repo_updated_date, "stargazers_list": stargazers_list, "forked_repos": forked_repos, "subscribers_list": subscribers_list, "issues": issue_count, "pulls": pr_count, "issues_list": issues_list, "pulls_list": pr_list})
+                list_of_repos.append({"name": repo.name, "id": repo.id, "descr": repo.description, "is_fork": repo.fork, "forks": repo.forks_count, "stars": repo.stargazers_count, "subscribers": watchers_counts[repo.full_name] if repo.full_name in watchers_counts else repo.subscribers_count, "url": repo.html_url, "language": repo.language, "date": repo_created_date, "update_date": repo_updated_date, "stargazers_list": stargazers_list, "forked_repos": forked_repos, "subscribers_list": subscribers_list, "issues": issue_count, "pulls": pr_count, "issues_list": issues_list, "pulls_list": pr_list})
                 if show_progress:
                     _display_progress(idx, total_repos, repo.name, is_final=(idx == total_repos))  # Final refresh after successful processing
 
@@ -2346,6 +3975,8 @@ def github_process_repos(repos_list, show_progress=True, fetch_identity_lists=Tr
                     _display_progress(idx, total_repos, repo.name, is_final=(idx == total_repos))
                 continue
 
+        metrics.begin_repo(None)
+
         # Clear progress bar and move to next line (only if progress was shown)
         if show_progress and total_repos > 0:
             # Write newline to terminal
@@ -2354,8 +3985,7 @@ def github_process_repos(repos_list, show_progress=True, fetch_identity_lists=Tr
             terminal_out.flush()
             # Also write to log file if logging is enabled
             if stdout_bck is not None and isinstance(sys.stdout, Logger):
-                sys.stdout.logfile.write("\n")
-                sys.stdout.logfile.flush()
+                sys.stdout.write_log("\n")
 
             print()
             if fetch_identity_lists:
@@ -2367,6 +3997,131 @@ def github_process_repos(repos_list, show_progress=True, fetch_identity_lists=Tr
     return list_of_repos
 
 
+# Checks if the item listed by the issues endpoint is a PR; issues listed without a pull_request key would be completed
+# one by one when reading it, the URL (.../pull/<number>) tells PRs apart for free
+def is_pull_request(issue):
+    return issue.html_url.rsplit("/", 2)[-2] == "pull"
+
+
+# Returns the items of a paginated list, fetch_page(n) returning page n (from 0) of GITHUB_PER_PAGE items and whether
+# a next page exists (rel="next" in its Link header)
+# When the list is expected to hold count items, its pages are fetched concurrently (up to PAGE_FETCH_WORKERS at
+# a time) and assembled in order; pages past the expected ones (if the list has grown) are fetched one by one, as are
+# lists of unknown length, of a single page or with less than PAGE_FETCH_RATE_RESERVE rate limit left afterwards
+def fetch_pages(fetch_page, count):
+    pages = max(1, -(-(count or 0) // GITHUB_PER_PAGE))
+    remaining = metrics.value("github_monitor_api_rate_limit_remaining", resource="core")
+    if pages == 1 or PAGE_FETCH_WORKERS <= 1 or (remaining is not None and remaining - pages < PAGE_FETCH_RATE_RESERVE):
+        results = [fetch_page(0)]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(PAGE_FETCH_WORKERS, pages), thread_name_prefix="page-fetch") as pool:
+            results = list(pool.map(fetch_page, range(pages)))
+
+    while results[-1][1]:
+        results.append(fetch_page(len(results)))
+    return [item for items, _ in results for item in items]
+
+
+# Returns the field values (e.g. 'login') of the items of a REST list of a PyGithub object (e.g. 'followers' of a user)
+# Pages are requested through PyGithub's requester and only the field is kept from their JSON, with no PyGithub
+# objects built, which saves CPU time and memory on long lists
+def get_list_values(obj, name, field, count=None):
+    url = f"{obj.url}/{name}"
+    # The public requester property is only there since PyGithub 2.5.0
+    requester = getattr(obj, "requester", None) or obj._requester
+
+    def fetch_page(page):
+        headers, data = requester.requestJsonAndCheck("GET", url, parameters={"per_page": GITHUB_PER_PAGE, "page": page + 1})
+        return [item.get(field) for item in data or [] if item], 'rel="next"' in headers.get("link", "")
+
+    return fetch_pages(fetch_page, count)
+
+
+# Index of open issues and PRs per repo (by repo ID), kept across check cycles
+# The issues endpoint lists PRs too, so one listing covers both; after the first full listing only items updated since
+# the last check are listed (closed ones are dropped), and everything is listed again every ISSUES_RESYNC_INTERVAL
+# or when the index disagrees with the repo's open_issues_count (e.g. after an issue was deleted or transferred)
+class IssueIndex(object):
+    def __init__(self):
+        self.repos = {}
+        self.lock = threading.Lock()
+
+    # Returns (issues, PRs) of the repo as lists of '#number title (author) [ URL ]' entries, newest first
+    def sync(self, repo):
+        with self.lock:
+            state = self.repos.get(repo.id)
+        if state is not None and time.time() - state["full_sync"] < ISSUES_RESYNC_INTERVAL:
+            items, since = self.fetch(repo, dict(state["items"]), state["since"])
+            if len(items) == repo.open_issues_count:
+                state = {"items": items, "since": since, "full_sync": state["full_sync"]}
+            else:
+                state = None
+        else:
+            state = None
+        if state is None:
+            items, since = self.fetch(repo, {}, None)
+            state = {"items": items, "since": since, "full_sync": time.time()}
+        with self.lock:
+            self.repos[repo.id] = state
+
+        entries = sorted(state["items"].items(), reverse=True)
+        return [entry for _, (is_pr, entry) in entries if not is_pr], [entry for _, (is_pr, entry) in entries if is_pr]
+
+    # Lists all open items (since=None) or the items updated since the given time and applies them to the items dict;
+    # returns the items and the newest update time seen
+    def fetch(self, repo, items, since):
+        if since is None:
+            listing = repo.get_issues(state='open')
+        else:
+            listing = repo.get_issues(state='all', sort='updated', direction='desc', since=since)
+        for i in listing:
+            if since is None or i.updated_at > since:
+                since = i.updated_at
+            if i.state == 'open':
+                items[i.number] = (is_pull_request(i), f"#{i.number} {i.title} ({i.user.login}) [ {i.html_url} ]")
+            else:
+                items.pop(i.number, None)
+        return items, since
+
+
+issue_index = IssueIndex()
+
+
+# Index of forks per repo (by repo ID) as full names, newest first, kept across check cycles
+# The forks endpoint lists the newest forks first, so after the first full listing only the pages with forks not seen
+# yet are needed (usually a single page); a deleted fork only shows in a lower forks_count, which triggers a full
+# listing, as does the lapse of FORKS_RESYNC_INTERVAL
+class ForkIndex(object):
+    def __init__(self):
+        self.repos = {}
+        self.lock = threading.Lock()
+
+    def sync(self, repo):
+        forks_count = repo.forks_count
+        with self.lock:
+            state = self.repos.get(repo.id)
+        if state is None or forks_count < state["count"] or time.time() - state["full_sync"] >= FORKS_RESYNC_INTERVAL:
+            forks = [fork.full_name for fork in repo.get_forks()]
+            full_sync = time.time()
+        else:
+            known = set(state["forks"])
+            new_forks = []
+            for fork in repo.get_forks():
+                if fork.full_name in known:
+                    break
+                new_forks.append(fork.full_name)
+            forks = new_forks + state["forks"]
+            full_sync = state["full_sync"]
+        with self.lock:
+            self.repos[repo.id] = {"forks": forks, "count": forks_count, "full_sync": full_sync}
+        return list(forks)
+
+
+fork_index = ForkIndex()
+
+
 # Prints a list of public repositories for a GitHub user (-r)
 def github_print_repos(user):
     import logging
@@ -2379,7 +4134,7 @@ def github_print_repos(user):
 
     try:
         auth = Auth.Token(GITHUB_TOKEN)
-        g = Github(base_url=GITHUB_API_URL, auth=auth)
+        g = Github(base_url=GITHUB_API_URL, auth=auth, per_page=GITHUB_PER_PAGE)
 
         g_user = g.get_user(user)
         user_login = g_user.login
@@ -2408,6 +4163,8 @@ def github_print_repos(user):
     print(f"\nRepositories:\t\t{repos_count}\n")
 
     try:
+        repos_list = list(repos_list)
+        watchers_counts = get_repos_watchers_counts_safe(repos_list)
         if repos_list:
             print("─" * HORIZONTAL_LINE2)
             for repo in repos_list:
@@ -2430,7 +4187,7 @@ def github_print_repos(user):
 
                     print(f"\n - ⭐ Stars:\t\t{repo.stargazers_count}")
                     print(f" - 🍴 Forks:\t\t{repo.forks_count}")
-                    print(f" - 👓 Watchers:\t\t{repo.subscribers_count}")
+                    print(f" - 👓 Watchers:\t\t{watchers_counts[repo.full_name] if repo.full_name in watchers_counts else repo.subscribers_count}")
 
                     # print(f" - 🐞 Issues+PRs:\t{repo.open_issues_count}")
                     print(f" - 🐞 Issues:\t\t{issue_count}")
@@ -2472,7 +4229,7 @@ def github_print_starred_repos(user):
 
     try:
         auth = Auth.Token(GITHUB_TOKEN)
-        g = Github(base_url=GITHUB_API_URL, auth=auth)
+        g = Github(base_url=GITHUB_API_URL, auth=auth, per_page=GITHUB_PER_PAGE)
 
         g_user = g.get_user(user)
         user_login = g_user.login
@@ -2587,13 +4344,10 @@ def safe_truncate_text(text, max_length=MAX_EVENT_BODY_LENGTH):
     return result
 
 
-# Prints details about passed GitHub event
+# Prints details about passed GitHub event and returns them as EventRecord
 def github_print_event(event, g, time_passed=False, ts: datetime | None = None):
 
-    event_date: datetime | None = None
-    repo_name = ""
-    repo_url = ""
-    st = ""
+    rec = EventRecord(event)
     tp = ""
     repo = None
 
@@ -2606,9 +4360,9 @@ def github_print_event(event, g, time_passed=False, ts: datetime | None = None):
             tp = f" (after {calculate_timespan(event_date, ts, show_seconds=False, granularity=2)}: {get_short_date_from_ts(ts)})"
         else:
             tp = ""
-    st += print_v(f"Event date:\t\t\t{get_date_from_ts(event_date)}{tp}")
-    st += print_v(f"Event ID:\t\t\t{event.id}")
-    st += print_v(f"Event type:\t\t\t{event.type}")
+    rec.field("Event date", f"{get_date_from_ts(event_date)}{tp}", "date")
+    rec.field("Event ID", event.id)
+    rec.field("Event type", event.type)
 
     if event.repo.id:
         try:
@@ -2624,63 +4378,70 @@ def github_print_event(event, g, time_passed=False, ts: datetime | None = None):
                 except Exception:
                     pass
 
-            repo_name = getattr(repo, "full_name", event.repo.name)
+            rec.repo_name = getattr(repo, "full_name", event.repo.name)
 
             api_prefix = GITHUB_API_URL.rstrip("/") + "/repos/"
-            repo_url = getattr(repo, "html_url", event.repo.url.replace(api_prefix, github_web_base() + "/"))
+            rec.repo_url = getattr(repo, "html_url", event.repo.url.replace(api_prefix, github_web_base() + "/"))
 
-            st += print_v(f"\nRepo name:\t\t\t{repo_name}")
-            st += print_v(f"Repo URL:\t\t\t{repo_url}")
+            rec.blank()
+            rec.field("Repo name", rec.repo_name, "identifier")
+            rec.field("Repo URL", rec.repo_url)
 
             desc = (repo.description or "") if repo else ""
             cleaned = desc.replace('\n', ' ')
             short_desc = cleaned[:desc_len] + '...' if len(cleaned) > desc_len else cleaned
             if short_desc:
-                st += print_v(f"Repo description:\t\t{short_desc}")
+                rec.field("Repo description", short_desc)
 
         except UnknownObjectException:
             repo = None
-            st += print_v("\nRepository not found or has been removed")
+            rec.blank()
+            rec.note("Repository not found or has been removed")
         except GithubException as e:
             repo = None
-            st += print_v(f"\n* Error occurred while getting repo details: {e}")
+            rec.blank()
+            rec.note(f"* Error occurred while getting repo details: {e}")
 
     if hasattr(event.actor, 'login'):
         if event.actor.login:
-            st += print_v(f"\nEvent actor login:\t\t{event.actor.login}")
-    if hasattr(event.actor, 'name'):
-        if event.actor.name:
-            st += print_v(f"Event actor name:\t\t{event.actor.name}")
-    if hasattr(event.actor, 'html_url'):
-        if event.actor.html_url:
-            st += print_v(f"Event actor URL:\t\t{event.actor.html_url}")
+            rec.blank()
+            rec.field("Event actor login", event.actor.login)
+    actor_name, actor_url = actor_cache.get(event.actor)
+    if actor_name:
+        rec.field("Event actor name", actor_name)
+    if actor_url:
+        rec.field("Event actor URL", actor_url)
 
     if event.payload.get("ref"):
-        st += print_v(f"\nObject name:\t\t\t{event.payload.get('ref')}")
+        rec.blank()
+        rec.field("Object name", event.payload.get('ref'))
     if event.payload.get("ref_type"):
-        st += print_v(f"Object type:\t\t\t{event.payload.get('ref_type')}")
+        rec.field("Object type", event.payload.get('ref_type'))
     if event.payload.get("description"):
-        st += print_v(f"Description:\t\t\t{event.payload.get('description')}")
+        rec.field("Description", event.payload.get('description'))
 
     if event.payload.get("action"):
-        st += print_v(f"\nAction:\t\t\t\t{event.payload.get('action')}")
+        rec.blank()
+        rec.field("Action", event.payload.get('action'))
 
     # Prefer commits from payload when present (older API behavior)
     if event.payload.get("commits"):
         commits = event.payload["commits"]
         commits_total = len(commits)
-        st += print_v(f"\nNumber of commits:\t\t{commits_total}")
+        rec.blank()
+        rec.field("Number of commits", commits_total)
         for commit_count, commit in enumerate(commits, start=1):
-            st += print_v(f"\n=== Commit {commit_count}/{commits_total} ===")
-            st += print_v("." * HORIZONTAL_LINE1)
+            rec.blank()
+            rec.heading(f"=== Commit {commit_count}/{commits_total} ===")
+            rec.separator()
 
             commit_message = commit['message']
             is_multiline = '\n' in commit_message
             if is_multiline:
                 first_line = commit_message.split('\n', 1)[0]
-                st += print_v(f" - Commit message:\t\t'{first_line}...'")
+                rec.message(" - Commit message", f"{first_line}...")
             else:
-                st += print_v(f" - Commit message:\t\t'{commit_message}'")
+                rec.message(" - Commit message", commit_message)
 
             commit_details = None
             if repo:
@@ -2688,73 +4449,66 @@ def github_print_event(event, g, time_passed=False, ts: datetime | None = None):
 
             if commit_details:
                 commit_date = commit_details.commit.author.date
-                st += print_v(f" - Commit date:\t\t\t{get_date_from_ts(commit_date)}")
+                rec.field(" - Commit date", get_date_from_ts(commit_date), "date")
 
-            st += print_v(f" - Commit SHA:\t\t\t{commit['sha']}")
-            st += print_v(f" - Commit author:\t\t{commit['author']['name']}")
+            rec.field(" - Commit SHA", commit['sha'])
+            rec.field(" - Commit author", commit['author']['name'])
 
             if commit_details and commit_details.author:
-                st += print_v(f" - Commit author URL:\t\t{commit_details.author.html_url}")
+                rec.field(" - Commit author URL", commit_details.author.html_url)
 
             if commit_details:
-                st += print_v(f" - Commit URL:\t\t\t{commit_details.html_url}")
-                st += print_v(f" - Commit raw patch URL:\t{commit_details.html_url}.patch")
+                rec.field(" - Commit URL", commit_details.html_url)
+                rec.field(" - Commit raw patch URL", f"{commit_details.html_url}.patch")
 
             stats = getattr(commit_details, "stats", None)
             additions = stats.additions if stats else 0
             deletions = stats.deletions if stats else 0
             stats_total = stats.total if stats else 0
-            st += print_v(f"\n - Additions/Deletions:\t\t+{additions} / -{deletions} ({stats_total})")
+            rec.blank()
+            rec.field(" - Additions/Deletions", f"+{additions} / -{deletions} ({stats_total})")
 
             if commit_details:
                 try:
                     file_count = sum(1 for _ in commit_details.files)
                 except Exception:
                     file_count = "N/A"
-                st += print_v(f" - Files changed:\t\t{file_count}")
+                rec.field(" - Files changed", file_count)
                 if file_count:
-                    st += print_v(f" - Changed files list:")
+                    rec.note(" - Changed files list:")
                     for f in commit_details.files:
-                        st += print_v(f"     • '{f.filename}' - {f.status} (+{f.additions} / -{f.deletions})")
+                        rec.note(f"     • '{f.filename}' - {f.status} (+{f.additions} / -{f.deletions})")
 
             if is_multiline:
-                st += print_v(f"\n - Commit full message:")
-                st += print_v(f"\n'{commit_message}'")
-            else:
-                pass
-            st += print_v("." * HORIZONTAL_LINE1)
+                rec.blank()
+                rec.body(" - Commit full message", commit_message, style="commit")
+            rec.separator()
 
     # Fallback for new Events API where PushEvent no longer includes commit summaries
     elif event.type == "PushEvent" and repo:
         before_sha = event.payload.get("before")
         head_sha = event.payload.get("head") or event.payload.get("after")
-        size_hint = event.payload.get("size")
-
-        # Debug when payload has no commits
-        # st += print_v("\n[debug] PushEvent payload has no 'commits' array; using compare API")
-        # st += print_v(f"[debug] before:\t\t\t{before_sha}")
-        # st += print_v(f"[debug] head/after:\t\t{head_sha}")
-        # if size_hint is not None:
-        #     st += print_v(f"[debug] size (hint):\t\t{size_hint}")
 
         if before_sha and head_sha and before_sha != head_sha:
             try:
                 compare = gh_call(lambda: repo.compare(before_sha, head_sha))()
             except Exception as e:
                 compare = None
-                st += print_v(f"* Error using compare({before_sha[:12]}...{head_sha[:12]}): {e}")
+                rec.note(f"* Error using compare({before_sha[:12]}...{head_sha[:12]}): {e}")
 
             if compare:
                 commits = list(compare.commits)
                 commits_total = len(commits)
-                short_repo = getattr(repo, "full_name", repo_name)
+                short_repo = getattr(repo, "full_name", rec.repo_name)
                 compare_url = f"{github_web_base()}/{short_repo}/compare/{before_sha[:12]}...{head_sha[:12]}"
-                st += print_v(f"\nNumber of commits:\t\t{commits_total}")
-                st += print_v(f"Compare URL:\t\t\t{compare_url}")
+                rec.blank()
+                rec.field("Number of commits", commits_total)
+                rec.field("Compare URL", compare_url)
 
                 for commit_count, c in enumerate(commits, start=1):
-                    st += print_v(f"\n=== Commit {commit_count}/{commits_total} ===")
-                    st += print_v("." * HORIZONTAL_LINE1)
+                    rec.blank()
+                    rec.heading(f"=== Commit {commit_count}/{commits_total} ===")
+                    rec.separator()
 
                     commit_sha = getattr(c, "sha", None) or getattr(c, "id", None)
                     commit_details = gh_call(lambda: repo.get_commit(commit_sha))() if (repo and commit_sha) else None
@@ -2764,198 +4518,213 @@ def github_print_event(event, g, time_passed=False, ts: datetime | None = None):
                     if commit_message:
                         if is_multiline:
                             first_line = commit_message.split('\n', 1)[0]
-                            st += print_v(f" - Commit message:\t\t'{first_line}...'")
+                            rec.message(" - Commit message", f"{first_line}...")
                         else:
-                            st += print_v(f" - Commit message:\t\t'{commit_message}'")
+                            rec.message(" - Commit message", commit_message)
 
                     if commit_details:
                         commit_date = commit_details.commit.author.date
-                        st += print_v(f" - Commit date:\t\t\t{get_date_from_ts(commit_date)}")
+                        rec.field(" - Commit date", get_date_from_ts(commit_date), "date")
 
                     if commit_sha:
-                        st += print_v(f" - Commit SHA:\t\t\t{commit_sha}")
+                        rec.field(" - Commit SHA", commit_sha)
 
                     author_name = None
                     if commit_details and commit_details.commit and commit_details.commit.author:
                         author_name = commit_details.commit.author.name
-                    st += print_v(f" - Commit author:\t\t{author_name or 'N/A'}")
+                    rec.field(" - Commit author", author_name or 'N/A')
 
                     if commit_details and commit_details.author:
-                        st += print_v(f" - Commit author URL:\t\t{commit_details.author.html_url}")
+                        rec.field(" - Commit author URL", commit_details.author.html_url)
 
                     if commit_details:
-                        st += print_v(f" - Commit URL:\t\t\t{commit_details.html_url}")
-                        st += print_v(f" - Commit raw patch URL:\t{commit_details.html_url}.patch")
+                        rec.field(" - Commit URL", commit_details.html_url)
+                        rec.field(" - Commit raw patch URL", f"{commit_details.html_url}.patch")
 
                         stats = getattr(commit_details, "stats", None)
                         additions = stats.additions if stats else 0
                         deletions = stats.deletions if stats else 0
                         stats_total = stats.total if stats else 0
-                        st += print_v(f"\n - Additions/Deletions:\t\t+{additions} / -{deletions} ({stats_total})")
+                        rec.blank()
+                        rec.field(" - Additions/Deletions", f"+{additions} / -{deletions} ({stats_total})")
 
                         try:
                             file_count = sum(1 for _ in commit_details.files)
                         except Exception:
                             file_count = "N/A"
-                        st += print_v(f" - Files changed:\t\t{file_count}")
+                        rec.field(" - Files changed", file_count)
                         if file_count and file_count != "N/A":
-                            st += print_v(" - Changed files list:")
+                            rec.note(" - Changed files list:")
                             for f in commit_details.files:
-                                st += print_v(f"     • '{f.filename}' - {f.status} (+{f.additions} / -{f.deletions})")
+                                rec.note(f"     • '{f.filename}' - {f.status} (+{f.additions} / -{f.deletions})")
 
                         if is_multiline and commit_message:
-                            st += print_v(f"\n - Commit full message:")
-                            st += print_v(f"\n'{commit_message}'")
+                            rec.blank()
+                            rec.body(" - Commit full message", commit_message, style="commit")
 
-                        st += print_v("." * HORIZONTAL_LINE1)
+                        rec.separator()
         else:
-            st += print_v("\nNo compare range available (forced push, tag push, or identical before/after)")
+            rec.blank()
+            rec.note("No compare range available (forced push, tag push, or identical before/after)")
 
     if event.payload.get("commits") == []:
-        st += print_v("\nNo new commits (forced push, tag push, branch reset or other ref update)")
+        rec.blank()
+        rec.note("No new commits (forced push, tag push, branch reset or other ref update)")
 
     if event.payload.get("release"):
-        st += print_v(f"\nRelease name:\t\t\t{event.payload['release'].get('name')}")
-        st += print_v(f"Release tag name:\t\t{event.payload['release'].get('tag_name')}")
-        st += print_v(f"Release URL:\t\t\t{event.payload['release'].get('html_url')}")
-
-        st += print_v(f"\nPublished by:\t\t\t{event.payload['release']['author']['login']}")
-        if event.payload['release']['author'].get('html_url'):
-            st += print_v(f"Published by URL:\t\t{event.payload['release']['author']['html_url']}")
-        if event.payload['release'].get('published_at'):
-            pub_ts = event.payload['release']['published_at']
-            st += print_v(f"Published at:\t\t\t{get_date_from_ts(pub_ts)}")
-        st += print_v(f"Target commitish:\t\t{event.payload['release'].get('target_commitish')}")
-        st += print_v(f"Draft:\t\t\t\t{event.payload['release'].get('draft')}")
-        st += print_v(f"Prerelease:\t\t\t{event.payload['release'].get('prerelease')}")
-
-        if event.payload["release"].get("assets"):
+        release = event.payload["release"]
+        rec.blank()
+        rec.field("Release name", release.get('name'))
+        rec.field("Release tag name", release.get('tag_name'), "identifier")
+        rec.field("Release URL", release.get('html_url'))
+
+        rec.blank()
+        rec.field("Published by", release['author']['login'])
+        if release['author'].get('html_url'):
+            rec.field("Published by URL", release['author']['html_url'])
+        if release.get('published_at'):
+            rec.field("Published at", get_date_from_ts(release['published_at']), "date")
+        rec.field("Target commitish", release.get('target_commitish'))
+        rec.field("Draft", release.get('draft'))
+        rec.field("Prerelease", release.get('prerelease'))
+
+        if release.get("assets"):
             print()
-            st += print_v("\nAssets:\n")
-            assets = event.payload['release'].get('assets', [])
+            rec.blank()
+            rec.note("Assets:")
+            rec.blank()
+            assets = release.get('assets', [])
             for asset in assets:
                 size_bytes = asset.get("size", 0)
-                st += print_v(f" - Asset name:\t\t\t{asset.get('name')}")
-                st += print_v(f" - Asset size:\t\t\t{human_readable_size(size_bytes)}")
-                st += print_v(f" - Download URL:\t\t{asset.get('browser_download_url')}")
+                rec.field(" - Asset name", asset.get('name'), "identifier")
+                rec.field(" - Asset size", human_readable_size(size_bytes))
+                rec.field(" - Download URL", asset.get('browser_download_url'))
                 if asset != assets[-1]:
-                    st += print_v()
+                    rec.blank()
 
-        st += print_v(f"\nRelease notes:\n\n'{event.payload['release'].get('body')}'")
+        rec.blank()
+        if release.get('body'):
+            rec.body("Release notes", release['body'])
+        else:
+            rec.note("Release notes:")
+            rec.blank()
+            rec.note(f"'{release.get('body')}'")
 
     if repo and event.payload.get("pull_request"):
         pr_number = event.payload["pull_request"]["number"]
         pr = repo.get_pull(pr_number)
 
-        st += print_v(f"\n=== PR #{pr.number}: {pr.title} ===")
-        st += print_v("." * HORIZONTAL_LINE1)
+        rec.blank()
+        rec.pr_heading(pr.number, pr.title)
+        rec.separator()
 
-        st += print_v(f"Author:\t\t\t\t{pr.user.login}")
-        st += print_v(f"Author URL:\t\t\t{pr.user.html_url}")
-        st += print_v(f"State:\t\t\t\t{pr.state}")
-        st += print_v(f"Merged:\t\t\t\t{pr.merged}")
-        st += print_v(f"PR URL:\t\t\t\t{pr.html_url}")
+        rec.field("Author", pr.user.login)
+        rec.field("Author URL", pr.user.html_url)
+        rec.field("State", pr.state)
+        rec.field("Merged", pr.merged)
+        rec.field("PR URL", pr.html_url)
 
         if pr.created_at:
-            pr_created_date = get_date_from_ts(pr.created_at)
-            st += print_v(f"Created at:\t\t\t{pr_created_date}")
+            rec.field("Created at", get_date_from_ts(pr.created_at), "date")
         if pr.closed_at:
-            pr_closed_date = get_date_from_ts(pr.closed_at)
-            st += print_v(f"Closed at:\t\t\t{pr_closed_date}")
+            rec.field("Closed at", get_date_from_ts(pr.closed_at), "date")
         if pr.merged_at:
-            pr_merged_date = get_date_from_ts(pr.merged_at)
-            st += print_v(f"Merged at:\t\t\t{pr_merged_date} by {pr.merged_by.login}")
+            rec.field("Merged at", f"{get_date_from_ts(pr.merged_at)} by {pr.merged_by.login}", "date")
 
-        st += print_v(f"Head → Base:\t\t\t{pr.head.ref} → {pr.base.ref}")
-        st += print_v(f"Mergeable state:\t\t{pr.mergeable_state}")
+        rec.field("Head → Base", f"{pr.head.ref} → {pr.base.ref}")
+        rec.field("Mergeable state", pr.mergeable_state)
 
         if pr.labels:
-            st += print_v(f"Labels:\t\t\t\t{', '.join(label.name for label in pr.labels)}")
+            rec.field("Labels", ', '.join(label.name for label in pr.labels))
 
-        st += print_v(f"\nCommits:\t\t\t{pr.commits}")
-        st += print_v(f"Comments (issue/review):\t{pr.comments} / {pr.review_comments}")
+        rec.blank()
+        rec.field("Commits", pr.commits)
+        rec.field("Comments (issue/review)", f"{pr.comments} / {pr.review_comments}")
 
-        st += print_v(f"Additions/Deletions:\t\t+{pr.additions} / -{pr.deletions}")
-        st += print_v(f"Files changed:\t\t\t{pr.changed_files}")
+        rec.field("Additions/Deletions", f"+{pr.additions} / -{pr.deletions}")
+        rec.field("Files changed", pr.changed_files)
 
         if pr.body:
-            st += print_v(f"\nPR description:\n\n'{pr.body.strip()}'")
+            rec.blank()
+            rec.body("PR description", pr.body.strip())
 
         if pr.requested_reviewers:
             for reviewer in pr.requested_reviewers:
-                st += print_v(f"\n - Requested reviewer:\t{reviewer.login} ({reviewer.html_url})")
+                rec.blank()
+                rec.field(" - Requested reviewer", f"{reviewer.login} ({reviewer.html_url})")
 
         if pr.assignees:
             for assignee in pr.assignees:
-                st += print_v(f"\nAssignee:\t\t\t{assignee.login} ({assignee.html_url})")
+                rec.blank()
+                rec.field("Assignee", f"{assignee.login} ({assignee.html_url})")
 
-        st += print_v("." * HORIZONTAL_LINE1)
+        rec.separator()
 
     if event.payload.get("review"):
-        review_date = event.payload["review"].get("submitted_at")
-        st += print_v(f"\nReview submitted at:\t\t{get_date_from_ts(review_date)}")
-        st += print_v(f"Review URL:\t\t\t{event.payload['review'].get('html_url')}")
-
-        if event.payload["review"].get("author_association"):
-            st += print_v(f"Author association:\t\t{event.payload['review'].get('author_association')}")
-
-        if event.payload["review"].get("id"):
-            st += print_v(f"Review ID:\t\t\t{event.payload['review'].get('id')}")
-        if event.payload["review"].get("commit_id"):
-            st += print_v(f"Commit SHA reviewed:\t\t{event.payload['review'].get('commit_id')}")
-        if event.payload["review"].get("state"):
-            st += print_v(f"Review state:\t\t\t{event.payload['review'].get('state')}")
-        if event.payload["review"].get("body"):
-            review_body = event.payload['review'].get('body')
+        review = event.payload["review"]
+        rec.blank()
+        rec.field("Review submitted at", get_date_from_ts(review.get("submitted_at")), "date")
+        rec.field("Review URL", review.get('html_url'))
+
+        if review.get("author_association"):
+            rec.field("Author association", review.get('author_association'))
+
+        if review.get("id"):
+            rec.field("Review ID", review.get('id'))
+        if review.get("commit_id"):
+            rec.field("Commit SHA reviewed", review.get('commit_id'))
+        if review.get("state"):
+            rec.field("Review state", review.get('state'))
+        if review.get("body"):
+            review_body = review.get('body')
             if len(review_body) > MAX_EVENT_BODY_LENGTH:
                 review_body = safe_truncate_text(review_body)
-            st += print_v(f"Review body:")
-            st += print_v(format_body_block(review_body))
+            rec.body("Review body", review_body, indented=True)
 
         if repo:
             try:
                 pr_number = event.payload["pull_request"]["number"]
                 pr_obj = repo.get_pull(pr_number)
-                count = sum(1 for _ in pr_obj.get_single_review_comments(event.payload["review"].get("id")))
-                st += print_v(f"Comments in this review:\t{count}")
+                count = sum(1 for _ in pr_obj.get_single_review_comments(review.get("id")))
+                rec.field("Comments in this review", count)
             except Exception:
                 pass
 
     if event.payload.get("issue"):
-        st += print_v(f"\nIssue title:\t\t\t{event.payload['issue'].get('title')}")
-
-        issue_date = event.payload["issue"].get("created_at")
-        st += print_v(f"Issue date:\t\t\t{get_date_from_ts(issue_date)}")
+        issue = event.payload["issue"]
+        rec.blank()
+        rec.field("Issue title", issue.get('title'))
+        rec.field("Issue date", get_date_from_ts(issue.get("created_at")), "date")
 
-        issue_author = event.payload["issue"].get("user", {}).get("login")
+        issue_author = issue.get("user", {}).get("login")
         if issue_author:
-            st += print_v(f"Issue author:\t\t\t{issue_author}")
+            rec.field("Issue author", issue_author)
 
-        issue_author_url = event.payload["issue"].get("user", {}).get("html_url")
+        issue_author_url = issue.get("user", {}).get("html_url")
         if issue_author_url:
-            st += print_v(f"Issue author URL:\t\t{issue_author_url}")
+            rec.field("Issue author URL", issue_author_url)
 
-        st += print_v(f"Issue URL:\t\t\t{event.payload['issue'].get('html_url')}")
+        rec.field("Issue URL", issue.get('html_url'))
 
-        if event.payload["issue"].get("state"):
-            st += print_v(f"Issue state:\t\t\t{event.payload['issue'].get('state')}")
+        if issue.get("state"):
+            rec.field("Issue state", issue.get('state'))
 
-        st += print_v(f"Issue comments:\t\t\t{event.payload['issue'].get('comments', 0)}")
+        rec.field("Issue comments", issue.get('comments', 0))
 
-        labels = event.payload["issue"].get("labels", [])
+        labels = issue.get("labels", [])
         if labels:
             label_names = ", ".join(label.get("name") for label in labels if label.get("name"))
             if label_names:
-                st += print_v(f"Issue labels:\t\t\t{label_names}")
+                rec.field("Issue labels", label_names)
 
-        if event.payload["issue"].get("assignees"):
-            assignees = event.payload["issue"].get("assignees")
+        if issue.get("assignees"):
+            assignees = issue.get("assignees")
             for assignee in assignees:
-                st += print_v(f" - Assignee name:\t\t{assignee.get('name')}")
+                rec.field(" - Assignee name", assignee.get('name'))
                 if assignee != assignees[-1]:
-                    st += print_v()
+                    rec.blank()
 
-        reactions = event.payload["issue"].get("reactions", {})
+        reactions = issue.get("reactions", {})
 
         reaction_map = {
             "+1": "👍",
@@ -2975,38 +4744,38 @@ def github_print_event(event, g, time_passed=False, ts: datetime | None = None):
                 reaction_display.append(f"{emoji} {count}")
 
         if reaction_display:
-            st += print_v(f"Issue reactions:\t\t{' / '.join(reaction_display)}")
+            rec.field("Issue reactions", ' / '.join(reaction_display))
 
-        if event.payload["issue"].get("body"):
-            issue_body = event.payload['issue'].get('body')
+        if issue.get("body"):
+            issue_body = issue.get('body')
             issue_snippet = issue_body if len(issue_body) <= MAX_EVENT_BODY_LENGTH else safe_truncate_text(issue_body)
-            st += print_v(f"\nIssue body:")
-            st += print_v(format_body_block(issue_snippet))
+            rec.blank()
+            rec.body("Issue body", issue_snippet, indented=True)
 
     if event.payload.get("comment"):
         comment = event.payload["comment"]
 
-        comment_date = comment.get("created_at")
-        st += print_v(f"\nComment date:\t\t\t{get_date_from_ts(comment_date)}")
+        rec.blank()
+        rec.field("Comment date", get_date_from_ts(comment.get("created_at")), "date")
 
         comment_author = comment.get("user", {}).get("login")
         if comment_author:
-            st += print_v(f"Comment author:\t\t\t{comment_author}")
+            rec.field("Comment author", comment_author)
 
         comment_author_url = comment.get("user", {}).get("html_url")
         if comment_author_url:
-            st += print_v(f"Comment author URL:\t\t{comment_author_url}")
+            rec.field("Comment author URL", comment_author_url)
 
-        st += print_v(f"Comment URL:\t\t\t{comment.get('html_url')}")
+        rec.field("Comment URL", comment.get('html_url'))
         if comment.get("path"):
-            st += print_v(f"Comment path:\t\t\t{comment.get('path')}")
+            rec.field("Comment path", comment.get('path'))
 
         comment_body = comment.get("body")
         if comment_body:
             if len(comment_body) > MAX_EVENT_BODY_LENGTH:
                 comment_body = safe_truncate_text(comment_body)
-            st += print_v(f"\nComment body:")
-            st += print_v(format_body_block(comment_body))
+            rec.blank()
+            rec.body("Comment body", comment_body, indented=True)
 
         if event.type == "PullRequestReviewCommentEvent":
             parent_id = comment.get("in_reply_to_id")
@@ -3018,18 +4787,20 @@ def github_print_event(event, g, time_passed=False, ts: datetime | None = None):
                     parent = pr.get_review_comment(parent_id)
                     parent_date = get_date_from_ts(parent.created_at)
 
-                    st += print_v(f"\nPrevious comment:\n\n↳ In reply to {parent.user.login} (@ {parent_date}):")
-
                     parent_body = parent.body
                     if len(parent_body) > MAX_EVENT_BODY_LENGTH:
                         parent_body = safe_truncate_text(parent_body)
-                    st += print_v(format_body_block(parent_body))
+                    rec.blank()
+                    rec.reply(f"↳ In reply to {parent.user.login} (@ {parent_date}):", parent_body)
 
-                    st += print_v(f"\nPrevious comment URL:\t\t{parent.html_url}")
+                    rec.blank()
+                    rec.field("Previous comment URL", parent.html_url)
                 except Exception as e:
-                    st += print_v(f"\n* Could not fetch parent comment (ID {parent_id}): {e}")
+                    rec.blank()
+                    rec.note(f"* Could not fetch parent comment (ID {parent_id}): {e}")
             else:
-                st += print_v("\n(This is the first comment in its thread)")
+                rec.blank()
+                rec.note("(This is the first comment in its thread)")
         elif event.type in ("IssueCommentEvent", "CommitCommentEvent"):
             if repo:
 
@@ -3072,16 +4843,18 @@ def github_print_event(event, g, time_passed=False, ts: datetime | None = None):
 
                     if previous:
                         prev_date = get_date_from_ts(previous["created_at"])
-                        st += print_v(f"\nPrevious comment:\n\n↳ In reply to {previous['user'].login} (@ {prev_date}):")
 
                         parent_body = previous["body"]
                         if len(parent_body) > MAX_EVENT_BODY_LENGTH:
                             parent_body = safe_truncate_text(parent_body)
-                        st += print_v(format_body_block(parent_body))
+                        rec.blank()
+                        rec.reply(f"↳ In reply to {previous['user'].login} (@ {prev_date}):", parent_body)
 
-                        st += print_v(f"\nPrevious comment URL:\t\t{previous['html_url']}")
+                        rec.blank()
+                        rec.field("Previous comment URL", previous['html_url'])
                     else:
-                        st += print_v("\n(This is the first comment in this thread)")
+                        rec.blank()
+                        rec.note("(This is the first comment in this thread)")
 
                 elif event.type == "CommitCommentEvent":
                     commit_sha = comment["commit_id"]
@@ -3097,58 +4870,65 @@ def github_print_event(event, g, time_passed=False, ts: datetime | None = None):
 
                     if previous:
                         prev_date = get_date_from_ts(previous.created_at)
-                        st += print_v(f"\nPrevious comment:\n\n↳ In reply to {previous.user.login} (@ {prev_date}):")
 
                         parent_body = previous.body
                         if len(parent_body) > MAX_EVENT_BODY_LENGTH:
                             parent_body = safe_truncate_text(parent_body)
-                        st += print_v(format_body_block(parent_body))
+                        rec.blank()
+                        rec.reply(f"↳ In reply to {previous.user.login} (@ {prev_date}):", parent_body)
 
-                        st += print_v(f"\nPrevious comment URL:\t\t{previous.html_url}")
+                        rec.blank()
+                        rec.field("Previous comment URL", previous.html_url)
                     else:
-                        st += print_v("\n(This is the first comment in this thread)")
+                        rec.blank()
+                        rec.note("(This is the first comment in this thread)")
 
     if event.payload.get("forkee"):
-        st += print_v(f"\nForked to repo:\t\t\t{event.payload['forkee'].get('full_name')}")
-        st += print_v(f"Forked to repo (URL):\t\t{event.payload['forkee'].get('html_url')}")
+        rec.blank()
+        rec.field("Forked to repo", event.payload['forkee'].get('full_name'))
+        rec.field("Forked to repo (URL)", event.payload['forkee'].get('html_url'))
 
     if event.type == "MemberEvent":
         member_login = event.payload.get("member", {}).get("login")
         member_role = event.payload.get("membership", {}).get("role")
         if member_login:
-            st += print_v(f"\nMember added:\t\t\t{member_login}")
+            rec.blank()
+            rec.field("Member added", member_login)
             member_url = event.payload.get("member", {}).get("html_url")
             if member_url:
-                st += print_v(f"Member added URL:\t\t{member_url}")
+                rec.field("Member added URL", member_url)
         if member_role:
-            st += print_v(f"Permission level:\t\t{member_role}")
+            rec.field("Permission level", member_role)
 
     if event.type == "PublicEvent":
-        st += print_v("\nRepository is now public")
+        rec.blank()
+        rec.note("Repository is now public")
 
     if event.type == "DiscussionEvent":
         discussion_title = event.payload.get("discussion", {}).get("title")
         discussion_url = event.payload.get("discussion", {}).get("html_url")
         discussion_category = event.payload.get("discussion", {}).get("category", {}).get("name")
         if discussion_title:
-            st += print_v(f"\nDiscussion title:\t\t{discussion_title}")
+            rec.blank()
+            rec.field("Discussion title", discussion_title)
         if discussion_url:
-            st += print_v(f"Discussion URL:\t\t\t{discussion_url}")
+            rec.field("Discussion URL", discussion_url)
         if discussion_category:
-            st += print_v(f"Discussion category:\t\t{discussion_category}")
+            rec.field("Discussion category", discussion_category)
 
     if event.type == "DiscussionCommentEvent":
         comment_author = event.payload.get("comment", {}).get("user", {}).get("login")
         comment_body = event.payload.get("comment", {}).get("body")
         if comment_author:
-            st += print_v(f"\nDiscussion comment by:\t\t{comment_author}")
+            rec.blank()
+            rec.field("Discussion comment by", comment_author)
         if comment_body:
             if len(comment_body) > MAX_EVENT_BODY_LENGTH:
                 comment_body = safe_truncate_text(comment_body)
-            st += print_v(f"\nComment body:")
-            st += print_v(format_body_block(comment_body))
+            rec.blank()
+            rec.body("Comment body", comment_body, indented=True)
 
-    return event_date, repo_name, repo_url, st
+    return rec
 
 
 # Lists recent events for the user (-l) and potentially dumps the entries to CSV file (if -b is used)
@@ -3162,13 +4942,15 @@ def github_list_events(user, number, csv_file_name):
     except Exception as e:
         print(f"* Error: {e}")
 
+    init_history(user)
+
     list_operation = "* Listing & saving" if csv_file_name else "* Listing"
 
     print(f"{list_operation} {number} recent events for '{user}' ...\n")
 
     try:
         auth = Auth.Token(GITHUB_TOKEN)
-        g = Github(base_url=GITHUB_API_URL, auth=auth)
+        g = Github(base_url=GITHUB_API_URL, auth=auth, per_page=GITHUB_PER_PAGE)
 
         g_user = g.get_user(user)
         all_events = list(g_user.get_events())
@@ -3179,6 +4961,7 @@ def github_list_events(user, number, csv_file_name):
         user_login = g_user.login
         user_name = g_user.name
         user_url = g_user.html_url
+        actor_cache.put(g_user)
 
         user_name_str = user_login
         if user_name:
@@ -3208,26 +4991,28 @@ def github_list_events(user, number, csv_file_name):
                     event_number = event_number_map[id(event)]
                     print(f"Event number:\t\t\t#{event_number}")
                     try:
-                        event_date, repo_name, repo_url, event_text = github_print_event(event, g)
+                        event_record = github_print_event(event, g)
                     except Exception as e:
                         print(f"\n* Warning, cannot fetch all event details, skipping: {e}")
                         print_cur_ts("\nTimestamp:\t\t\t")
                         continue
                     try:
-                        if csv_file_name:
-                            write_csv_entry(csv_file_name, convert_to_local_naive(event_date), str(event.type), str(repo_name), "", "")
+                        event_record.record(csv_file_name)
                     except Exception as e:
                         print(f"* Error: {e}")
                     print_cur_ts("\nTimestamp:\t\t\t")
         except Exception as e:
             print(f"* Cannot fetch events: {e}")
 
+    flush_change_entries()
+
 
 # Detects and reports changes in a user's profile-level entities (followers, followings, public repos, starred repos)
-def handle_profile_change(label, count_old, count_new, list_old, raw_list, user, csv_file_name, field):
+# raw_list holds PyGithub objects whose field is compared, or the values themselves if field is None
+def handle_profile_change(label, count_old, count_new, list_old, raw_list, user, csv_file_name, field=None):
     try:
         list_new = []
-        list_new = [getattr(item, field) for item in raw_list]
+        list_new = [getattr(item, field) for item in raw_list] if field else list(raw_list)
         if not list_new and count_new > 0:
             return list_old, count_old
     except Exception as e:
@@ -3252,8 +5037,7 @@ def handle_profile_change(label, count_old, count_new, list_old, raw_list, user,
     else:
         print(f"* {label} number changed {label_context} user {user} from {old_count} to {new_count} ({diff_str})\n")
         try:
-            if csv_file_name:
-                write_csv_entry(csv_file_name, now_local_naive(), f"{label} Count", user, old_count, new_count)
+            record_change(csv_file_name, now_local_naive(), f"{label} Count", user, old_count, new_count)
         except Exception as e:
             print(f"* Error: {e}")
 
@@ -3283,8 +5067,7 @@ def handle_profile_change(label, count_old, count_new, list_old, raw_list, user,
             removed_list_str += f"- {item} [ {item_url} ]\n"
             removed_list_str_html += f"- <a href=\"{html.escape(item_url)}\">{html.escape(item)}</a><br>"
             try:
-                if csv_file_name:
-                    write_csv_entry(csv_file_name, now_local_naive(), f"Removed {label[:-1]}", user, item, "")
+                record_change(csv_file_name, now_local_naive(), f"Removed {label[:-1]}", user, item, "")
             except Exception as e:
                 print(f"* Error: {e}")
         print()
@@ -3301,8 +5084,7 @@ def handle_profile_change(label, count_old, count_new, list_old, raw_list, user,
             added_list_str += f"- {item} [ {item_url} ]\n"
             added_list_str_html += f"- <a href=\"{html.escape(item_url)}\">{html.escape(item)}</a><br>"
             try:
-                if csv_file_name:
-                    write_csv_entry(csv_file_name, now_local_naive(), f"Added {label[:-1]}", user, "", item)
+                record_change(csv_file_name, now_local_naive(), f"Added {label[:-1]}", user, "", item)
             except Exception as e:
                 print(f"* Error: {e}")
         print()
@@ -3335,8 +5117,7 @@ def handle_profile_change(label, count_old, count_new, list_old, raw_list, user,
         )
 
     if PROFILE_NOTIFICATION:
-        print(f"Sending email notification to {RECEIVER_EMAIL}")
-        send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+        notify(m_subject, m_body, m_body_html, SMTP_SSL, "profile")
 
     print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
     print_cur_ts("Timestamp:\t\t\t")
@@ -3344,7 +5125,7 @@ def handle_profile_change(label, count_old, count_new, list_old, raw_list, user,
 
 
 # Detects and reports changes in repository-level entities (like stargazers, watchers, forks, issues, pull requests)
-def check_repo_list_changes(count_old, count_new, list_old, list_new, label, repo_name, repo_url, user, csv_file_name):
+def check_repo_list_changes(count_old, count_new, list_old, list_new, label, repo_name, repo_url, user, csv_file_name, repo_id=None):
     if list_old is None or list_new is None:
         if count_old == count_new:
             return
@@ -3353,8 +5134,7 @@ def check_repo_list_changes(count_old, count_new, list_old, list_new, label, rep
         diff_str = f"{'+' if diff > 0 else ''}{diff}"
         print(f"* Repo '{repo_name}': number of {label.lower()} changed from {count_old} to {count_new} ({diff_str})\n* Repo URL: {repo_url}")
         try:
-            if csv_file_name:
-                write_csv_entry(csv_file_name, now_local_naive(), f"Repo {label} Count", repo_name, count_old, count_new)
+            record_change(csv_file_name, now_local_naive(), f"Repo {label} Count", repo_name, count_old, count_new, repo_id=repo_id)
         except Exception as e:
             print(f"* Error: {e}")
 
@@ -3371,8 +5151,7 @@ def check_repo_list_changes(count_old, count_new, list_old, list_new, label, rep
         )
 
         if REPO_NOTIFICATION:
-            print(f"Sending email notification to {RECEIVER_EMAIL}")
-            send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+            notify(m_subject, m_body, m_body_html, SMTP_SSL, "repo")
         print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
         print_cur_ts("Timestamp:\t\t\t")
         return
@@ -3395,8 +5174,7 @@ def check_repo_list_changes(count_old, count_new, list_old, list_new, label, rep
     else:
         print(f"* Repo '{repo_name}': number of {label.lower()} changed from {old_count} to {new_count} ({diff_str})\n* Repo URL: {repo_url}")
         try:
-            if csv_file_name:
-                write_csv_entry(csv_file_name, now_local_naive(), f"Repo {label} Count", repo_name, old_count, new_count)
+            record_change(csv_file_name, now_local_naive(), f"Repo {label} Count", repo_name, old_count, new_count, repo_id=repo_id)
         except Exception as e:
             print(f"* Error: {e}")
 
@@ -3445,9 +5223,8 @@ def check_repo_list_changes(count_old, count_new, list_old, list_new, label, rep
                     removed_list_str_html += f"- {html.escape(item)}<br>"
 
                 try:
-                    if csv_file_name:
-                        value = item.rsplit("(", 1)[0].strip() if label in ["Issues", "Pull Requests"] else item
-                        write_csv_entry(csv_file_name, now_local_naive(), f"{removal_text} {label[:-1]}", repo_name, value, "")
+                    value = item.rsplit("(", 1)[0].strip() if label in ["Issues", "Pull Requests"] else item
+                    record_change(csv_file_name, now_local_naive(), f"{removal_text} {label[:-1]}", repo_name, value, "", repo_id=repo_id)
                 except Exception as e:
                     print(f"* Error: {e}")
             print()
@@ -3475,9 +5252,8 @@ def check_repo_list_changes(count_old, count_new, list_old, list_new, label, rep
                     added_list_str_html += f"- {html.escape(item)}<br>"
 
                 try:
-                    if csv_file_name:
-                        value = item.rsplit("(", 1)[0].strip() if label in ["Issues", "Pull Requests"] else item
-                        write_csv_entry(csv_file_name, now_local_naive(), f"Added {label[:-1]}", repo_name, "", value)
+                    value = item.rsplit("(", 1)[0].strip() if label in ["Issues", "Pull Requests"] else item
+                    record_change(csv_file_name, now_local_naive(), f"Added {label[:-1]}", repo_name, "", value, repo_id=repo_id)
                 except Exception as e:
                     print(f"* Error: {e}")
             print()
@@ -3512,8 +5288,7 @@ def check_repo_list_changes(count_old, count_new, list_old, list_new, label, rep
         )
 
     if REPO_NOTIFICATION:
-        print(f"Sending email notification to {RECEIVER_EMAIL}")
-        send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+        notify(m_subject, m_body, m_body_html, SMTP_SSL, "repo")
     print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
     print_cur_ts("Timestamp:\t\t\t")
 
@@ -3568,7 +5343,7 @@ def is_blocked_by(user):
         response = req.get(f"{GITHUB_API_URL}/user", headers=headers, timeout=15)
         if response.status_code != 200:
             return False
-        me_login = response.json().get("login", "").lower()
+        me_login = json_loads(response.content).get("login", "").lower()
         if user.lower() == me_login:
             return False
 
@@ -3589,7 +5364,7 @@ def is_blocked_by(user):
         if not response_graphql.ok:
             return False
 
-        data = response_graphql.json()
+        data = json_loads(response_graphql.content)
         can_follow = (data.get("data", {}).get("user", {}).get("viewerCanFollow", True))
         return not bool(can_follow)
 
@@ -3622,7 +5397,7 @@ def get_starred_count(user):
         if not response.ok:
             return 0
 
-        data = response.json()
+        data = json_loads(response.content)
 
         return (data.get("data", {}).get("user", {}).get("starredRepositories", {}).get("totalCount", 0))
 
@@ -3641,7 +5416,7 @@ def has_private_banner(user):
 
 
 # Returns True if the user's GitHub profile is public
-def is_profile_public(g: Github, user, new_account_days=30):
+def is_profile_public(g: "Github", user, new_account_days=30):
 
     if has_private_banner(user):
         return False
@@ -3672,6 +5447,7 @@ def is_profile_public(g: Github, user, new_account_days=30):
 # Returns a dict mapping 'YYYY-MM-DD' -> int contribution count for the range
 # Handles long date ranges by splitting into year-long chunks
 def get_daily_contributions(username: str, start: Optional[dt.date] = None, end: Optional[dt.date] = None, token: Optional[str] = None) -> dict:
+    load_pytz()
     if token is None:
         raise ValueError("GitHub token is required")
 
@@ -3690,6 +5466,7 @@ def get_daily_contributions(username: str, start: Optional[dt.date] = None, end:
     while current_start <= end:
         # Calculate end date for this chunk (1 year from start, or the requested end date, whichever is earlier)
         # Use relativedelta to handle leap years correctly (e.g., Feb 29, 2024 -> Feb 28, 2025)
+        from dateutil import relativedelta
         next_year_date = current_start + relativedelta.relativedelta(years=1)
         chunk_end = min(
             next_year_date - dt.timedelta(days=1),
@@ -3725,9 +5502,9 @@ def get_daily_contributions(username: str, start: Optional[dt.date] = None, end:
         }"""
 
         variables = {"login": username, "from": start_iso, "to": end_iso}
-        r = requests.post(url, json={"query": query, "variables": variables}, headers=headers, timeout=30)
+        r = req.post(url, json={"query": query, "variables": variables}, headers=headers, timeout=30)
         r.raise_for_status()
-        data = r.json()
+        data = json_loads(r.content)
 
         # Check for errors in the response
         if "errors" in data:
@@ -3825,6 +5602,8 @@ def github_monitor_user(user, csv_file_name):
     except Exception as e:
         print(f"* Error: {e}")
 
+    init_history(user)
+
     followers_count = 0
     followings_count = 0
     repos_count = 0
@@ -3842,7 +5621,7 @@ def github_monitor_user(user, csv_file_name):
 
     try:
         auth = Auth.Token(GITHUB_TOKEN)
-        g = Github(base_url=GITHUB_API_URL, auth=auth)
+        g = Github(base_url=GITHUB_API_URL, auth=auth, per_page=GITHUB_PER_PAGE)
         g_user_myself = g.get_user()
         user_myself_login = g_user_myself.login
         user_myself_name = g_user_myself.name
@@ -3852,6 +5631,7 @@ def github_monitor_user(user, csv_file_name):
         user_login = g_user.login
         user_name = g_user.name
         user_url = g_user.html_url
+        actor_cache.put(g_user)
         location = g_user.location
         bio = g_user.bio
         company = g_user.company
@@ -3863,8 +5643,8 @@ def github_monitor_user(user, csv_file_name):
         followers_count = g_user.followers
         followings_count = g_user.following
 
-        followers_list = g_user.get_followers()
-        followings_list = g_user.get_following()
+        followers_list = get_list_values(g_user, "followers", "login", followers_count)
+        followings_list = get_list_values(g_user, "following", "login", followings_count)
 
         if GET_ALL_REPOS:
             repos_list = g_user.get_repos()
@@ -3873,8 +5653,8 @@ def github_monitor_user(user, csv_file_name):
             repos_list = [repo for repo in g_user.get_repos(type='owner') if not repo.fork and repo.owner.login == user_login]
             repos_count = len(repos_list)
 
-        starred_list = g_user.get_starred()
-        starred_count = starred_list.totalCount
+        starred_count = g_user.get_starred().totalCount
+        starred_list = get_list_values(g_user, "starred", "full_name", starred_count)
 
         public = is_profile_public(g, user)
         blocked = is_blocked_by(user) if public else None
@@ -4029,20 +5809,24 @@ def github_monitor_user(user, csv_file_name):
     starred_old = []
 
     try:
-        followers_old = [follower.login for follower in followers_list]
-        followings_old = [following.login for following in followings_list]
+        followers_old = list(followers_list)
+        followings_old = list(followings_list)
         repos_old = [repo.name for repo in repos_list]
-        starred_old = [star.full_name for star in starred_list]
+        starred_old = list(starred_list)
     except Exception as e:
         print(f"* Error: {e}")
         sys.exit(1)
 
+    flush_change_entries()
+
     time.sleep(GITHUB_CHECK_INTERVAL)
     alive_counter = 0
     email_sent = False
 
     # Primary loop
     while True:
+        metrics.start_cycle()
+        metrics.begin_phase("profile")
 
         try:
             g_user = g.get_user(user)
@@ -4074,18 +5858,20 @@ def github_monitor_user(user, csv_file_name):
                     f"{html.escape(str(e))}{get_cur_ts('<br><br>Timestamp: ')}"
                     f"</body></html>"
                 )
-                print(f"Sending email notification to {RECEIVER_EMAIL}")
-                send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                notify(m_subject, m_body, m_body_html, SMTP_SSL, "error")
                 email_sent = True
 
+            metrics.inc("github_monitor_cycle_errors_total")
             print_cur_ts("Timestamp:\t\t\t")
             time.sleep(GITHUB_CHECK_INTERVAL)
             continue
 
+        metrics.begin_phase("lists")
+
         # Changed followings
         try:
-            followings_raw = list(gh_call(g_user.get_following)())
             followings_count = gh_call(lambda: g_user.following)()
+            followings_raw = get_list_values(g_user, "following", "login", followings_count)
         except NET_ERRORS as e:
             print(f"* Error while fetching followings: {e}")
             print_cur_ts("Timestamp:\t\t\t")
@@ -4093,12 +5879,12 @@ def github_monitor_user(user, csv_file_name):
             followings_count = None
 
         if followings_raw is not None and followings_count is not None:
-            followings_old, followings_old_count = handle_profile_change("Followings", followings_old_count, followings_count, followings_old, followings_raw, user, csv_file_name, field="login")
+            followings_old, followings_old_count = handle_profile_change("Followings", followings_old_count, followings_count, followings_old, followings_raw, user, csv_file_name)
 
         # Changed followers
         try:
-            followers_raw = list(gh_call(g_user.get_followers)())
             followers_count = gh_call(lambda: g_user.followers)()
+            followers_raw = get_list_values(g_user, "followers", "login", followers_count)
         except NET_ERRORS as e:
             print(f"* Error while fetching followers: {e}")
             print_cur_ts("Timestamp:\t\t\t")
@@ -4106,7 +5892,7 @@ def github_monitor_user(user, csv_file_name):
             followers_count = None
 
         if followers_raw is not None and followers_count is not None:
-            followers_old, followers_old_count = handle_profile_change("Followers", followers_old_count, followers_count, followers_old, followers_raw, user, csv_file_name, field="login")
+            followers_old, followers_old_count = handle_profile_change("Followers", followers_old_count, followers_count, followers_old, followers_raw, user, csv_file_name)
 
         # Changed public repositories
         try:
@@ -4129,8 +5915,8 @@ def github_monitor_user(user, csv_file_name):
         try:
             starred_raw = gh_call(g_user.get_starred)()
             if starred_raw is not None:
-                starred_list = list(starred_raw)
                 starred_count = starred_raw.totalCount
+                starred_list = get_list_values(g_user, "starred", "full_name", starred_count)
             else:
                 starred_list = None
                 starred_count = None
@@ -4141,7 +5927,9 @@ def github_monitor_user(user, csv_file_name):
             starred_count = None
 
         if starred_list is not None and starred_count is not None:
-            starred_old, starred_old_count = handle_profile_change("Starred Repos", starred_old_count, starred_count, starred_old, starred_list, user, csv_file_name, field="full_name")
+            starred_old, starred_old_count = handle_profile_change("Starred Repos", starred_old_count, starred_count, starred_old, starred_list, user, csv_file_name)
+
+        metrics.begin_phase("contributions")
 
         # Changed contributions in a day
         if TRACK_CONTRIB_CHANGES:
@@ -4157,15 +5945,14 @@ def github_monitor_user(user, csv_file_name):
                     f"{get_cur_ts('<br>Timestamp: ')}"
                     f"</body></html>"
                 )
-                send_email(f"GitHub monitor errors for {user}", err_msg + get_cur_ts(nl_ch + "Timestamp: "), err_msg_html, SMTP_SSL)
+                notify(f"GitHub monitor errors for {user}", err_msg + get_cur_ts(nl_ch + "Timestamp: "), err_msg_html, SMTP_SSL, "error")
 
             if contrib_notify:
                 contrib_old = contrib_state.get("prev_count")
                 print(f"* Daily contributions changed for user {user} on {get_short_date_from_ts(contrib_state['day'], show_hour=False)} from {contrib_old} to {contrib_curr}!\n")
 
                 try:
-                    if csv_file_name:
-                        write_csv_entry(csv_file_name, now_local_naive(), "Daily Contribs", user, contrib_old, contrib_curr)
+                    record_change(csv_file_name, now_local_naive(), "Daily Contribs", user, contrib_old, contrib_curr)
                 except Exception as e:
                     print(f"* Error: {e}")
 
@@ -4179,12 +5966,13 @@ def github_monitor_user(user, csv_file_name):
                 )
 
                 if CONTRIB_NOTIFICATION:
-                    print(f"Sending email notification to {RECEIVER_EMAIL}")
-                    send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                    notify(m_subject, m_body, m_body_html, SMTP_SSL, "contrib")
 
                 print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
                 print_cur_ts("Timestamp:\t\t\t")
 
+        metrics.begin_phase("profile")
+
         # Changed bio
         bio = gh_call(lambda: g_user.bio)()
         if bio is not None and bio != bio_old:
@@ -4193,8 +5981,7 @@ def github_monitor_user(user, csv_file_name):
             print(f"New bio:\n\n{bio}\n")
 
             try:
-                if csv_file_name:
-                    write_csv_entry(csv_file_name, now_local_naive(), "Bio", user, bio_old, bio)
+                record_change(csv_file_name, now_local_naive(), "Bio", user, bio_old, bio)
             except Exception as e:
                 print(f"* Error: {e}")
 
@@ -4212,8 +5999,7 @@ def github_monitor_user(user, csv_file_name):
             )
 
             if PROFILE_NOTIFICATION:
-                print(f"Sending email notification to {RECEIVER_EMAIL}")
-                send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                notify(m_subject, m_body, m_body_html, SMTP_SSL, "profile")
 
             bio_old = bio
             print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
@@ -4227,8 +6013,7 @@ def github_monitor_user(user, csv_file_name):
             print(f"New location:\t\t\t{location}\n")
 
             try:
-                if csv_file_name:
-                    write_csv_entry(csv_file_name, now_local_naive(), "Location", user, location_old, location)
+                record_change(csv_file_name, now_local_naive(), "Location", user, location_old, location)
             except Exception as e:
                 print(f"* Error: {e}")
 
@@ -4244,8 +6029,7 @@ def github_monitor_user(user, csv_file_name):
             )
 
             if PROFILE_NOTIFICATION:
-                print(f"Sending email notification to {RECEIVER_EMAIL}")
-                send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                notify(m_subject, m_body, m_body_html, SMTP_SSL, "profile")
 
             location_old = location
             print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
@@ -4253,14 +6037,14 @@ def github_monitor_user(user, csv_file_name):
 
         # Changed user name
         user_name = gh_call(lambda: g_user.name)()
+        actor_cache.put(g_user)
         if user_name is not None and user_name != user_name_old:
             print(f"* User name has changed for user {user} !\n")
             print(f"Old user name:\t\t\t{user_name_old}\n")
             print(f"New user name:\t\t\t{user_name}\n")
 
             try:
-                if csv_file_name:
-                    write_csv_entry(csv_file_name, now_local_naive(), "User Name", user, user_name_old, user_name)
+                record_change(csv_file_name, now_local_naive(), "User Name", user, user_name_old, user_name)
             except Exception as e:
                 print(f"* Error: {e}")
 
@@ -4276,8 +6060,7 @@ def github_monitor_user(user, csv_file_name):
             )
 
             if PROFILE_NOTIFICATION:
-                print(f"Sending email notification to {RECEIVER_EMAIL}")
-                send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                notify(m_subject, m_body, m_body_html, SMTP_SSL, "profile")
 
             user_name_old = user_name
             print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
@@ -4291,8 +6074,7 @@ def github_monitor_user(user, csv_file_name):
             print(f"New company:\t\t\t{company}\n")
 
             try:
-                if csv_file_name:
-                    write_csv_entry(csv_file_name, now_local_naive(), "Company", user, company_old, company)
+                record_change(csv_file_name, now_local_naive(), "Company", user, company_old, company)
             except Exception as e:
                 print(f"* Error: {e}")
 
@@ -4308,8 +6090,7 @@ def github_monitor_user(user, csv_file_name):
             )
 
             if PROFILE_NOTIFICATION:
-                print(f"Sending email notification to {RECEIVER_EMAIL}")
-                send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                notify(m_subject, m_body, m_body_html, SMTP_SSL, "profile")
 
             company_old = company
             print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
@@ -4323,8 +6104,7 @@ def github_monitor_user(user, csv_file_name):
             print(f"New email:\t\t\t{email}\n")
 
             try:
-                if csv_file_name:
-                    write_csv_entry(csv_file_name, now_local_naive(), "Email", user, email_old, email)
+                record_change(csv_file_name, now_local_naive(), "Email", user, email_old, email)
             except Exception as e:
                 print(f"* Error: {e}")
 
@@ -4340,8 +6120,7 @@ def github_monitor_user(user, csv_file_name):
             )
 
             if PROFILE_NOTIFICATION:
-                print(f"Sending email notification to {RECEIVER_EMAIL}")
-                send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                notify(m_subject, m_body, m_body_html, SMTP_SSL, "profile")
 
             email_old = email
             print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
@@ -4355,8 +6134,7 @@ def github_monitor_user(user, csv_file_name):
             print(f"New blog URL:\t\t\t{blog}\n")
 
             try:
-                if csv_file_name:
-                    write_csv_entry(csv_file_name, now_local_naive(), "Blog URL", user, blog_old, blog)
+                record_change(csv_file_name, now_local_naive(), "Blog URL", user, blog_old, blog)
             except Exception as e:
                 print(f"* Error: {e}")
 
@@ -4364,8 +6142,7 @@ def github_monitor_user(user, csv_file_name):
             m_body = f"GitHub user {user} blog URL has changed\n\nOld blog URL: {blog_old}\n\nNew blog URL: {blog}\n\nCheck interval: {display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
 
             if PROFILE_NOTIFICATION:
-                print(f"Sending email notification to {RECEIVER_EMAIL}")
-                send_email(m_subject, m_body, "", SMTP_SSL)
+                notify(m_subject, m_body, "", SMTP_SSL, "profile")
 
             blog_old = blog
             print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
@@ -4379,8 +6156,7 @@ def github_monitor_user(user, csv_file_name):
             print(f"New account update date:\t{get_date_from_ts(account_updated_date)}\n")
 
             try:
-                if csv_file_name:
-                    write_csv_entry(csv_file_name, convert_to_local_naive(account_updated_date), "Account Update Date", user, convert_to_local_naive(account_updated_date_old), convert_to_local_naive(account_updated_date))
+                record_change(csv_file_name, convert_to_local_naive(account_updated_date), "Account Update Date", user, convert_to_local_naive(account_updated_date_old), convert_to_local_naive(account_updated_date))
             except Exception as e:
                 print(f"* Error: {e}")
 
@@ -4388,8 +6164,7 @@ def github_monitor_user(user, csv_file_name):
             m_body = f"GitHub user {user} account has been updated (after {calculate_timespan(account_updated_date, account_updated_date_old, show_seconds=False, granularity=2)})\n\nOld account update date: {get_date_from_ts(account_updated_date_old)}\n\nNew account update date: {get_date_from_ts(account_updated_date)}\n\nCheck interval: {display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
 
             if PROFILE_NOTIFICATION:
-                print(f"Sending email notification to {RECEIVER_EMAIL}")
-                send_email(m_subject, m_body, "", SMTP_SSL)
+                notify(m_subject, m_body, "", SMTP_SSL, "profile")
 
             account_updated_date_old = account_updated_date
             print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
@@ -4405,8 +6180,7 @@ def github_monitor_user(user, csv_file_name):
             print(f"* User {user} has changed profile visibility to '{_get_profile_status(public)}' !\n")
 
             try:
-                if csv_file_name:
-                    write_csv_entry(csv_file_name, now_local_naive(), "Profile Visibility", user, _get_profile_status(public_old), _get_profile_status(public))
+                record_change(csv_file_name, now_local_naive(), "Profile Visibility", user, _get_profile_status(public_old), _get_profile_status(public))
             except Exception as e:
                 print(f"* Error: {e}")
 
@@ -4414,8 +6188,7 @@ def github_monitor_user(user, csv_file_name):
             m_body = f"GitHub user {user} has changed profile visibility to '{_get_profile_status(public)}' !\n\nCheck interval: {display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
 
             if PROFILE_NOTIFICATION:
-                print(f"Sending email notification to {RECEIVER_EMAIL}")
-                send_email(m_subject, m_body, "", SMTP_SSL)
+                notify(m_subject, m_body, "", SMTP_SSL, "profile")
 
             public_old = public
             print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
@@ -4435,8 +6208,7 @@ def github_monitor_user(user, csv_file_name):
             print(f"* User {user} has {'blocked' if blocked else 'unblocked'} you!\n")
 
             try:
-                if csv_file_name:
-                    write_csv_entry(csv_file_name, now_local_naive(), "Block Status", user, _get_blocked_status(blocked_old, public), _get_blocked_status(blocked, public))
+                record_change(csv_file_name, now_local_naive(), "Block Status", user, _get_blocked_status(blocked_old, public), _get_blocked_status(blocked, public))
             except Exception as e:
                 print(f"* Error: {e}")
 
@@ -4444,13 +6216,14 @@ def github_monitor_user(user, csv_file_name):
             m_body = f"GitHub user {user} has {'blocked' if blocked else 'unblocked'} you!\n\nCheck interval: {display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
 
             if PROFILE_NOTIFICATION:
-                print(f"Sending email notification to {RECEIVER_EMAIL}")
-                send_email(m_subject, m_body, "", SMTP_SSL)
+                notify(m_subject, m_body, "", SMTP_SSL, "profile")
 
             blocked_old = blocked
             print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
             print_cur_ts("Timestamp:\t\t\t")
 
+        metrics.begin_phase("repos")
+
         list_of_repos = []
 
         # Changed repos details
@@ -4496,6 +6269,7 @@ def github_monitor_user(user, csv_file_name):
 
                     for repo in list_of_repos:
                         r_name = repo.get("name")
+                        r_id = repo.get("id")
                         r_descr = repo.get("descr", "")
                         r_forks = repo.get("forks", 0)
                         r_stars = repo.get("stars", 0)
@@ -4532,8 +6306,7 @@ def github_monitor_user(user, csv_file_name):
                                     r_message = f"* Repo '{r_name}' update date changed (after {calculate_timespan(r_update, r_update_old, show_seconds=False, granularity=2)})\n* Repo URL: {r_url}\n\nOld repo update date:\t{get_date_from_ts(r_update_old)}\n\nNew repo update date:\t{get_date_from_ts(r_update)}\n"
                                     print(r_message)
                                     try:
-                                        if csv_file_name:
-                                            write_csv_entry(csv_file_name, now_local_naive(), "Repo Update Date", r_name, convert_to_local_naive(r_update_old), convert_to_local_naive(r_update))
+                                        record_change(csv_file_name, now_local_naive(), "Repo Update Date", r_name, convert_to_local_naive(r_update_old), convert_to_local_naive(r_update), repo_id=r_id)
                                     except Exception as e:
                                         print(f"* Error: {e}")
                                     m_subject = f"GitHub user {user} repo '{r_name}' update date has changed ! (after {calculate_timespan(r_update, r_update_old, show_seconds=False, granularity=2)})"
@@ -4549,33 +6322,31 @@ def github_monitor_user(user, csv_file_name):
                                         f"</body></html>"
                                     )
                                     if REPO_UPDATE_DATE_NOTIFICATION:
-                                        print(f"Sending email notification to {RECEIVER_EMAIL}")
-                                        send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                                        notify(m_subject, m_body, m_body_html, SMTP_SSL, "repo_update_date")
                                     print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
                                     print_cur_ts("Timestamp:\t\t\t")
 
                                 # Number of stars for repo changed
-                                check_repo_list_changes(r_stars_old, r_stars, r_stargazers_list_old, r_stargazers_list, "Stargazers", r_name, r_url, user, csv_file_name)
+                                check_repo_list_changes(r_stars_old, r_stars, r_stargazers_list_old, r_stargazers_list, "Stargazers", r_name, r_url, user, csv_file_name, repo_id=r_id)
 
                                 # Number of watchers/subscribers for repo changed
-                                check_repo_list_changes(r_subscribers_old, r_subscribers, r_subscribers_list_old, r_subscribers_list, "Watchers", r_name, r_url, user, csv_file_name)
+                                check_repo_list_changes(r_subscribers_old, r_subscribers, r_subscribers_list_old, r_subscribers_list, "Watchers", r_name, r_url, user, csv_file_name, repo_id=r_id)
 
                                 # Number of forks for repo changed
-                                check_repo_list_changes(r_forks_old, r_forks, r_forked_repos_old, r_forked_repos, "Forks", r_name, r_url, user, csv_file_name)
+                                check_repo_list_changes(r_forks_old, r_forks, r_forked_repos_old, r_forked_repos, "Forks", r_name, r_url, user, csv_file_name, repo_id=r_id)
 
                                 # Number of issues for repo changed
-                                check_repo_list_changes(r_issues_old, r_issues, r_issues_list_old, r_issues_list, "Issues", r_name, r_url, user, csv_file_name)
+                                check_repo_list_changes(r_issues_old, r_issues, r_issues_list_old, r_issues_list, "Issues", r_name, r_url, user, csv_file_name, repo_id=r_id)
 
                                 # Number of PRs for repo changed
-                                check_repo_list_changes(r_pulls_old, r_pulls, r_pulls_list_old, r_pulls_list, "Pull Requests", r_name, r_url, user, csv_file_name)
+                                check_repo_list_changes(r_pulls_old, r_pulls, r_pulls_list_old, r_pulls_list, "Pull Requests", r_name, r_url, user, csv_file_name, repo_id=r_id)
 
                                 # Repo description changed
                                 if r_descr != r_descr_old:
                                     r_message = f"* Repo '{r_name}' description changed from:\n\n'{r_descr_old}'\n\nto:\n\n'{r_descr}'\n\n* Repo URL: {r_url}\n"
                                     print(r_message)
                                     try:
-                                        if csv_file_name:
-                                            write_csv_entry(csv_file_name, now_local_naive(), "Repo Description", r_name, r_descr_old, r_descr)
+                                        record_change(csv_file_name, now_local_naive(), "Repo Description", r_name, r_descr_old, r_descr, repo_id=r_id)
                                     except Exception as e:
                                         print(f"* Error: {e}")
                                     m_subject = f"GitHub user {user} repo '{r_name}' description has changed !"
@@ -4593,13 +6364,14 @@ def github_monitor_user(user, csv_file_name):
                                         f"</body></html>"
                                     )
                                     if REPO_NOTIFICATION:
-                                        print(f"Sending email notification to {RECEIVER_EMAIL}")
-                                        send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                                        notify(m_subject, m_body, m_body_html, SMTP_SSL, "repo")
                                     print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
                                     print_cur_ts("Timestamp:\t\t\t")
 
                     list_of_repos_old = list_of_repos
 
+        metrics.begin_phase("events")
+
         # New GitHub events
         if not DO_NOT_MONITOR_GITHUB_EVENTS:
             events = list(gh_call(lambda: list(islice(g_user.get_events(), EVENTS_NUMBER)))())
@@ -4635,35 +6407,27 @@ def github_monitor_user(user, csv_file_name):
 
                         if event.type in EVENTS_TO_MONITOR or 'ALL' in EVENTS_TO_MONITOR:
 
-                            event_date = None
-                            repo_name = ""
-                            repo_url = ""
-                            event_text = ""
+                            event_record = None
 
+                            metrics.begin_repo(event.repo.name if event.repo else None)
                             try:
-                                event_date, repo_name, repo_url, event_text = github_print_event(event, g, first_new, last_event_ts_old)
+                                event_record = github_print_event(event, g, first_new, last_event_ts_old)
                             except Exception as e:
                                 print(f"\n* Warning, cannot fetch all event details: {e}")
+                            metrics.begin_repo(None)
 
                             first_new = False
 
-                            if event_date and repo_name and event_text:
+                            if event_record and event_record.event_date and event_record.repo_name:
 
                                 try:
-                                    if csv_file_name:
-                                        write_csv_entry(csv_file_name, convert_to_local_naive(event_date), str(event.type), str(repo_name), "", "")
+                                    event_record.record(csv_file_name)
                                 except Exception as e:
                                     print(f"* Error: {e}")
 
-                                m_subject = f"GitHub user {user} has new {event.type} (repo: {repo_name})"
-                                m_body = f"GitHub user {user} has new {event.type} event\n\n{event_text}\nCheck interval: {display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
-                                event_payload = None
-                                try:
-                                    if hasattr(event, 'payload'):
-                                        event_payload = event.payload
-                                except Exception:
-                                    pass
-                                event_text_html = event_text_to_html(event_text, event.type, event_payload)
+                                m_subject = f"GitHub user {user} has new {event.type} (repo: {event_record.repo_name})"
+                                m_body = f"GitHub user {user} has new {event.type} event\n\n{event_record.text}\nCheck interval: {display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)}){get_cur_ts(nl_ch + 'Timestamp: ')}"
+                                event_text_html = event_record.to_html()
                                 m_body_html = (
                                     f"<html><head></head><body>"
                                     f"GitHub user <b>{html.escape(user)}</b> has new <b>{html.escape(event.type)}</b> event<br><br>"
@@ -4673,8 +6437,7 @@ def github_monitor_user(user, csv_file_name):
                                 )
 
                                 if EVENT_NOTIFICATION:
-                                    print(f"\nSending email notification to {RECEIVER_EMAIL}")
-                                    send_email(m_subject, m_body, m_body_html, SMTP_SSL)
+                                    notify(m_subject, m_body, m_body_html, SMTP_SSL, "event")
 
                             print(f"Check interval:\t\t\t{display_time(GITHUB_CHECK_INTERVAL)} ({get_range_of_dates_from_tss(int(time.time()) - GITHUB_CHECK_INTERVAL, int(time.time()), short=True)})")
                             print_cur_ts("Timestamp:\t\t\t")
@@ -4683,17 +6446,35 @@ def github_monitor_user(user, csv_file_name):
                     last_event_ts_old = last_event_ts
                     events_list_of_ids_old = events_list_of_ids.copy()
 
+        metrics.begin_phase("flush")
+
         alive_counter += 1
 
         if LIVENESS_CHECK_COUNTER and alive_counter >= LIVENESS_CHECK_COUNTER:
+            print(f"Render cache:\t\t\t{render_cache.stats()}")
+            print(f"Actor cache:\t\t\t{actor_cache.stats()}")
             print_cur_ts("Liveness check, timestamp:\t")
             alive_counter = 0
 
+        flush_change_entries()
+        flush_notification_sinks()
+        smtp_session.close_idle(SMTP_IDLE_TIMEOUT, expected_idle=GITHUB_CHECK_INTERVAL)
+
+        cycle_stats = metrics.end_cycle(CYCLE_STATS_TOP_N)
+
+        if CYCLE_SUMMARY and cycle_stats:
+            phases = ", ".join(f"{phase} {stats['seconds']:.1f}s/{stats['api_calls']}" for phase, stats in cycle_stats["phases"].items())
+            print(f"Cycle summary:\t\t\t{cycle_stats['seconds']:.1f}s, {cycle_stats['api_calls']} API calls, {human_readable_size(cycle_stats['wire_bytes'])} transferred ({human_readable_size(cycle_stats['bytes'])} decoded) ({phases})")
+            if cycle_stats["lazy_completions"]:
+                completions = ", ".join(f"{kind} {count}" for kind, count in sorted(cycle_stats["lazy_completions"].items()))
+                print(f"Lazy completions:\t\t{sum(cycle_stats['lazy_completions'].values())} ({completions})")
+            print_cur_ts("Timestamp:\t\t\t")
+
         time.sleep(GITHUB_CHECK_INTERVAL)
 
 
 def main():
-    global CLI_CONFIG_PATH, DOTENV_FILE, LOCAL_TIMEZONE, LIVENESS_CHECK_COUNTER, GITHUB_TOKEN, GITHUB_API_URL, CSV_FILE, DISABLE_LOGGING, GITHUB_LOGFILE, PROFILE_NOTIFICATION, EVENT_NOTIFICATION, REPO_NOTIFICATION, REPO_UPDATE_DATE_NOTIFICATION, ERROR_NOTIFICATION, GITHUB_CHECK_INTERVAL, SMTP_PASSWORD, stdout_bck, DO_NOT_MONITOR_GITHUB_EVENTS, TRACK_REPOS_CHANGES, REPOS_TO_MONITOR, GET_ALL_REPOS, CONTRIB_NOTIFICATION, TRACK_CONTRIB_CHANGES
+    global CLI_CONFIG_PATH, DOTENV_FILE, LOCAL_TIMEZONE, LIVENESS_CHECK_COUNTER, GITHUB_TOKEN, GITHUB_API_URL, CSV_FILE, DISABLE_LOGGING, GITHUB_LOGFILE, PROFILE_NOTIFICATION, EVENT_NOTIFICATION, REPO_NOTIFICATION, REPO_UPDATE_DATE_NOTIFICATION, ERROR_NOTIFICATION, GITHUB_CHECK_INTERVAL, SMTP_PASSWORD, stdout_bck, DO_NOT_MONITOR_GITHUB_EVENTS, TRACK_REPOS_CHANGES, REPOS_TO_MONITOR, GET_ALL_REPOS, CONTRIB_NOTIFICATION, TRACK_CONTRIB_CHANGES, HISTORY_DIR, SQLITE_DB, NOTIFY_DEAD_LETTER_FILE, DIGEST_MODE, WEBHOOK_URL, NOTIFY_JSONL_TARGET, notification_queue, METRICS_LISTEN, CYCLE_SUMMARY, TRACE_REQUESTS
 
     if "--generate-config" in sys.argv:
         config_content = CONFIG_BLOCK.strip("\n") + "\n"
@@ -4832,6 +6613,27 @@ def main():
         default=None,
         help="Disable email on errors"
     )
+    notify.add_argument(
+        "--digest",
+        dest="digest",
+        action="store_true",
+        default=None,
+        help="Combine all notifications from a check cycle (or DIGEST_INTERVAL) into a single digest email"
+    )
+    notify.add_argument(
+        "--webhook-url",
+        dest="webhook_url",
+        metavar="URL",
+        type=str,
+        help="Send notifications as JSON to this HTTP webhook (in batches)"
+    )
+    notify.add_argument(
+        "--notify-jsonl",
+        dest="notify_jsonl",
+        metavar="TARGET",
+        type=str,
+        help="Write notifications as JSON lines to TARGET: 'unix:/path' (Unix socket) or a file / named pipe"
+    )
     notify.add_argument(
         "--send-test-email",
         dest="send_test_email",
@@ -4879,6 +6681,30 @@ def main():
         default=None,
         help="List user's recent GitHub events"
     )
+    listing.add_argument(
+        "--history-stats",
+        dest="history_stats",
+        nargs="?",
+        const=30,
+        type=int,
+        metavar="DAYS",
+        help="Summarize changes recorded in the history directory over the last DAYS days (default: 30)"
+    )
+    listing.add_argument(
+        "--query",
+        dest="query",
+        nargs="+",
+        metavar="ARG",
+        help="Search the SQLite change log: TYPE [NAME] (e.g. \"Removed Stargazer\" repo_name) or a SELECT / WITH statement"
+    )
+    listing.add_argument(
+        "--query-days",
+        dest="query_days",
+        metavar="DAYS",
+        type=int,
+        default=30,
+        help="Limit --query TYPE [NAME] to changes from the last DAYS days (default: 30, 0 = no limit)"
+    )
     listing.add_argument(
         "-n", "--recent-events-count",
         dest="recent_events_count",
@@ -4917,6 +6743,41 @@ def main():
         type=str,
         help="Write new events & profile changes to CSV"
     )
+    opts.add_argument(
+        "--history-dir",
+        dest="history_dir",
+        metavar="HISTORY_DIR",
+        type=str,
+        help="Write compressed change history (JSONL or Parquet, see HISTORY_FORMAT) to this directory"
+    )
+    opts.add_argument(
+        "--sqlite-db",
+        dest="sqlite_db",
+        metavar="DB_FILE",
+        type=str,
+        help="Write all detected changes to an indexed SQLite database (see --query)"
+    )
+    opts.add_argument(
+        "--metrics-listen",
+        dest="metrics_listen",
+        metavar="HOST:PORT",
+        type=str,
+        help="Serve Prometheus / OpenMetrics metrics at http://HOST:PORT/metrics while monitoring"
+    )
+    opts.add_argument(
+        "--cycle-summary",
+        dest="cycle_summary",
+        action="store_true",
+        default=None,
+        help="Print time and GitHub API calls per phase after each check cycle"
+    )
+    opts.add_argument(
+        "--trace-requests",
+        dest="trace_requests",
+        action="store_true",
+        default=None,
+        help="Trace GitHub API requests by caller and report the most expensive ones on exit and on the TTIN signal"
+    )
     opts.add_argument(
         "-d", "--disable-logging",
         dest="disable_logging",
@@ -4997,24 +6858,69 @@ def main():
 
     local_tz = None
     if LOCAL_TIMEZONE == "Auto":
-        if get_localzone is not None:
-            try:
-                local_tz = get_localzone()
-            except Exception:
-                pass
+        try:
+            from tzlocal import get_localzone
+            local_tz = get_localzone()
+        except Exception:
+            pass
         if local_tz:
             LOCAL_TIMEZONE = str(local_tz)
         else:
             print("* Error: Cannot detect local timezone, consider setting LOCAL_TIMEZONE to your local timezone manually !")
             sys.exit(1)
-    else:
-        if not is_valid_timezone(LOCAL_TIMEZONE):
-            print(f"* Error: Configured LOCAL_TIMEZONE '{LOCAL_TIMEZONE}' is not valid. Please use a valid pytz timezone name.")
+
+    if args.history_dir:
+        HISTORY_DIR = os.path.expanduser(args.history_dir)
+    elif HISTORY_DIR:
+        HISTORY_DIR = os.path.expanduser(HISTORY_DIR)
+
+    if HISTORY_FORMAT not in ("jsonl", "parquet"):
+        print(f"* Error: HISTORY_FORMAT '{HISTORY_FORMAT}' is not valid, use 'jsonl' or 'parquet'")
+        sys.exit(1)
+
+    if HISTORY_DIR and HISTORY_FORMAT == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("* Error: HISTORY_FORMAT 'parquet' requires the pyarrow library !\n\nTo install it, run:\n    pip3 install pyarrow\n\nOnce installed, re-run this tool")
+            sys.exit(1)
+
+    if args.sqlite_db:
+        SQLITE_DB = os.path.expanduser(args.sqlite_db)
+    elif SQLITE_DB:
+        SQLITE_DB = os.path.expanduser(SQLITE_DB)
+
+    if args.query:
+        try:
+            github_query_changes(args.username, args.query, args.query_days)
+        except Exception as e:
+            print(f"* Error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+
+    if args.history_stats is not None:
+        try:
+            github_print_history_stats(args.username, args.history_stats)
+        except Exception as e:
+            print(f"* Error: {e}")
             sys.exit(1)
+        sys.exit(0)
+
+    load_github()
+
+    if args.trace_requests is True:
+        TRACE_REQUESTS = True
+
+    if TRACE_REQUESTS:
+        request_tracer.enable()
+        # Registered here to cover -r / -l / -f too; the log file is closed after it anyway (see close_log_writers())
+        atexit.register(request_tracer.print_report, CYCLE_STATS_TOP_N)
 
     if not check_internet():
         sys.exit(1)
 
+    validate_smtp_settings()
+
     if args.send_test_email:
         print("* Sending test email notification ...\n")
         if send_email("github_monitor: test email", "This is test email - your SMTP settings seems to be correct !", "", SMTP_SSL, smtp_timeout=5) == 0:
@@ -5111,7 +7017,7 @@ def main():
                 log_path = Path(f"{log_path.name}_{args.username}.log")
         log_path.parent.mkdir(parents=True, exist_ok=True)
         FINAL_LOG_PATH = str(log_path)
-        sys.stdout = Logger(FINAL_LOG_PATH)
+        sys.stdout = Logger(FINAL_LOG_PATH, flush_interval=LOG_FLUSH_INTERVAL, rotate_size=LOG_ROTATE_SIZE, rotate_interval=LOG_ROTATE_INTERVAL, backups=LOG_ROTATE_BACKUPS, compress=LOG_ROTATE_COMPRESS)
     else:
         FINAL_LOG_PATH = None
 
@@ -5133,6 +7039,21 @@ def main():
     if args.notify_errors is False:
         ERROR_NOTIFICATION = False
 
+    if args.digest is True:
+        DIGEST_MODE = True
+
+    if args.webhook_url:
+        WEBHOOK_URL = args.webhook_url
+
+    if args.notify_jsonl:
+        NOTIFY_JSONL_TARGET = args.notify_jsonl
+
+    if args.metrics_listen:
+        METRICS_LISTEN = args.metrics_listen
+
+    if args.cycle_summary is True:
+        CYCLE_SUMMARY = True
+
     if args.track_repos_changes is True:
         TRACK_REPOS_CHANGES = True
 
@@ -5159,23 +7080,50 @@ def main():
     if DO_NOT_MONITOR_GITHUB_EVENTS:
         EVENT_NOTIFICATION = False
 
-    if SMTP_HOST.startswith("your_smtp_server_"):
+    try:
+        active_sinks = init_notification_sinks(not SMTP_HOST.startswith("your_smtp_server_"))
+    except RuntimeError as e:
+        print(f"* Error: {e}")
+        sys.exit(1)
+
+    if not active_sinks:
         EVENT_NOTIFICATION = False
         PROFILE_NOTIFICATION = False
         REPO_NOTIFICATION = False
         REPO_UPDATE_DATE_NOTIFICATION = False
         CONTRIB_NOTIFICATION = False
         ERROR_NOTIFICATION = False
+    else:
+        if NOTIFY_QUEUE:
+            if NOTIFY_DEAD_LETTER_FILE:
+                NOTIFY_DEAD_LETTER_FILE = os.path.expanduser(NOTIFY_DEAD_LETTER_FILE)
+            notification_queue = NotificationQueue(NOTIFY_QUEUE_SIZE, NOTIFY_RETRIES, NOTIFY_RETRY_BACKOFF, NOTIFY_DEAD_LETTER_FILE)
+            atexit.register(notification_queue.close)
+        atexit.register(flush_notification_sinks, True)
+
+    metrics_url = None
+    if METRICS_LISTEN:
+        try:
+            metrics_url = start_metrics_server(METRICS_LISTEN)
+        except (OSError, ValueError) as e:
+            print(f"* Error: Cannot start metrics endpoint on '{METRICS_LISTEN}': {e}")
+            sys.exit(1)
 
     print(f"* GitHub polling interval:\t[ {display_time(GITHUB_CHECK_INTERVAL)} ]")
     print(f"* Email notifications:\t\t[profile changes = {PROFILE_NOTIFICATION}] [new events = {EVENT_NOTIFICATION}]\n*\t\t\t\t[repos changes = {REPO_NOTIFICATION}] [repos update date = {REPO_UPDATE_DATE_NOTIFICATION}]\n*\t\t\t\t[contrib changes = {CONTRIB_NOTIFICATION}] [errors = {ERROR_NOTIFICATION}]")
+    print(f"* Digest mode:\t\t\t{DIGEST_MODE}" + (f" (every {display_time(DIGEST_INTERVAL)})" if DIGEST_MODE and DIGEST_INTERVAL else ""))
+    print(f"* Notification sinks:\t\t{', '.join(active_sinks) or 'None'}")
+    print(f"* Notification queue:\t\t{notification_queue is not None}" + (f" (max {NOTIFY_QUEUE_SIZE} pending, {NOTIFY_RETRIES} attempts, undelivered: {NOTIFY_DEAD_LETTER_FILE or 'discarded'})" if notification_queue is not None else ""))
     print(f"* GitHub API URL:\t\t{GITHUB_API_URL}")
+    print(f"* Metrics endpoint:\t\t{metrics_url or 'None'}")
     print(f"* Track repos changes:\t\t{TRACK_REPOS_CHANGES}")
     print(f"* Track contrib changes:\t{TRACK_CONTRIB_CHANGES}")
     print(f"* Monitor GitHub events:\t{not DO_NOT_MONITOR_GITHUB_EVENTS}")
     print(f"* Get owned repos only:\t\t{not GET_ALL_REPOS}")
     print(f"* Liveness check:\t\t{bool(LIVENESS_CHECK_INTERVAL)}" + (f" ({display_time(LIVENESS_CHECK_INTERVAL)})" if LIVENESS_CHECK_INTERVAL else ""))
     print(f"* CSV logging enabled:\t\t{bool(CSV_FILE)}" + (f" ({CSV_FILE})" if CSV_FILE else ""))
+    print(f"* Change history enabled:\t{bool(HISTORY_DIR)}" + (f" ({HISTORY_DIR}, {HISTORY_FORMAT})" if HISTORY_DIR else ""))
+    print(f"* SQLite change log enabled:\t{bool(SQLITE_DB)}" + (f" ({SQLITE_DB})" if SQLITE_DB else ""))
     print(f"* Output logging enabled:\t{not DISABLE_LOGGING}" + (f" ({FINAL_LOG_PATH})" if not DISABLE_LOGGING else ""))
     print(f"* Configuration file:\t\t{cfg_path}")
     print(f"* Dotenv file:\t\t\t{env_path or 'None'}")
@@ -5187,6 +7135,7 @@ def main():
     print("─" * HORIZONTAL_LINE1)
 
     # We define signal handlers only for Linux, Unix & MacOS since Windows has limited number of signals supported
+    import platform
     if platform.system() != 'Windows':
         signal.signal(signal.SIGUSR1, toggle_profile_changes_notifications_signal_handler)
         signal.signal(signal.SIGUSR2, toggle_new_events_notifications_signal_handler)
@@ -5195,6 +7144,7 @@ def main():
         signal.signal(signal.SIGURG, toggle_contrib_changes_notifications_signal_handler)
         signal.signal(signal.SIGTRAP, increase_check_signal_handler)
         signal.signal(signal.SIGABRT, decrease_check_signal_handler)
+        signal.signal(signal.SIGTTIN, dump_cycle_stats_signal_handler)
         signal.signal(signal.SIGHUP, reload_secrets_signal_handler)
 
     github_monitor_user(args.username, CSV_FILE)